@@ -0,0 +1,68 @@
+"""Measures the cold import time of the game engine against its budget.
+
+Each measure imports the engine in a fresh interpreter, so that nothing is
+already loaded. Exits with status 1 when the best measure exceeds the budget.
+
+Usage: python -m benchmarks.import_time [--repeat N] [--budget SECONDS]
+"""
+import subprocess  # noqa: S404
+import sys
+from typing import List
+from typing import Tuple
+
+import click
+
+
+MODULE = "tic_tac_toe_game.engine"
+
+# Budget of `import tic_tac_toe_game.engine`, in seconds: the engine, the
+# bitboards and the registry, but none of the strategies or their dependencies.
+BUDGET = 0.15
+
+# Modules which must stay out of a bare engine import.
+HEAVY_MODULES = (
+    "numpy",
+    "redis",
+    "structlog",
+    "tic_tac_toe_game.AI.mcts",
+    "tic_tac_toe_game.AI.negamax",
+    "tic_tac_toe_game.AI.oracle",
+)
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(module: str = MODULE) -> Tuple[float, List[str]]:
+    """Returns the import time of `module` and the heavy modules it loaded."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split("\n")
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+
+@click.command()
+@click.option("--repeat", default=5, show_default=True)
+@click.option("--budget", default=BUDGET, show_default=True)
+def main(repeat: int, budget: float) -> None:
+    """Prints the best import time of the engine and checks it against `budget`."""
+    measures = [measure() for _ in range(repeat)]
+    best = min(elapsed for elapsed, _ in measures)
+    click.echo(f"import {MODULE}: {best * 1000:.1f} ms (budget {budget * 1000:.0f} ms)")
+    heavy = sorted({name for _, loaded in measures for name in loaded})
+    if heavy:
+        click.echo(f"heavy modules loaded: {', '.join(heavy)}")
+    if best > budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
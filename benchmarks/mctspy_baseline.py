@@ -0,0 +1,89 @@
+"""MCTS through mctspy, as played before the in-house engine.
+
+Kept as the reference point of the MCTS throughput benchmark.
+"""
+from typing import List
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+from mctspy.games.common import TwoPlayersAbstractGameState
+from mctspy.tree.nodes import TwoPlayersGameMonteCarloTreeSearchNode
+from mctspy.tree.search import MonteCarloTreeSearch
+
+from tic_tac_toe_game.typing import Grid
+
+
+class Move:
+    """Move class."""
+
+    def __init__(self, x_coordinate: int, y_coordinate: int, value: float) -> None:
+        """Inits."""
+        self.x_coordinate = x_coordinate
+        self.y_coordinate = y_coordinate
+        self.value = value
+
+
+class TicTacToeGameState(TwoPlayersAbstractGameState):  # type: ignore[misc]
+    """TicTacToeGameState class."""
+
+    x = 1
+    o = -1
+
+    def __init__(self, state: npt.NDArray[np.float64], next_to_move: float = 1) -> None:
+        """Inits."""
+        self.board = state
+        self.board_size: int = state.shape[0]
+        self.next_to_move = next_to_move
+
+    @property
+    def game_result(self) -> Optional[float]:
+        """Returns 1 or -1 for a win, 0 for a draw and None if the game goes on."""
+        rowsum = np.sum(self.board, 0)
+        colsum = np.sum(self.board, 1)
+        diag_sum_tl = self.board.trace()
+        diag_sum_tr = self.board[::-1].trace()
+
+        player_one_wins = any(rowsum == self.board_size)
+        player_one_wins += any(colsum == self.board_size)  # type: ignore[assignment]
+        player_one_wins += diag_sum_tl == self.board_size
+        player_one_wins += diag_sum_tr == self.board_size
+        if player_one_wins:
+            return self.x
+
+        player_two_wins = any(rowsum == -self.board_size)
+        player_two_wins += any(colsum == -self.board_size)  # type: ignore[assignment]
+        player_two_wins += diag_sum_tl == -self.board_size
+        player_two_wins += diag_sum_tr == -self.board_size
+        if player_two_wins:
+            return self.o
+
+        if np.all(self.board != 0):
+            return 0.0
+        return None
+
+    def is_game_over(self) -> bool:
+        """Returns boolean indicating if the game is over."""
+        return self.game_result is not None
+
+    def move(self, move: Move) -> "TicTacToeGameState":
+        """Consumes action and returns resulting state."""
+        new_board = np.copy(self.board)
+        new_board[move.x_coordinate, move.y_coordinate] = move.value
+        next_to_move = self.o if self.next_to_move == self.x else self.x
+        return TicTacToeGameState(new_board, next_to_move)
+
+    def get_legal_actions(self) -> List[Move]:
+        """Returns list of legal action at current game state."""
+        indices = np.where(self.board == 0)
+        return [
+            Move(x_coordinate, y_coordinate, self.next_to_move)
+            for x_coordinate, y_coordinate in zip(indices[0], indices[1], strict=True)
+        ]
+
+
+def mctspy_search(grid: Grid, mark: int, iterations: int) -> None:
+    """Runs `iterations` playouts with mctspy from `grid`."""
+    state = TicTacToeGameState(np.array(grid, dtype=float), float(mark))
+    root = TwoPlayersGameMonteCarloTreeSearchNode(state=state)
+    MonteCarloTreeSearch(root).best_action(iterations)
@@ -0,0 +1,218 @@
+"""Measures how often strategies keep the game-theoretic value, per budget.
+
+Every reachable non-terminal position is played by each strategy at several
+budgets, and a move is correct when the position keeps its value under
+perfect play, as given by the oracle table. For each strategy, the report
+gives the accuracy and the time per move of every budget, and the cheapest
+budget reaching the target accuracy.
+
+Positions are deduplicated by symmetry unless --all-positions is given. The
+move cache is disabled and no MCTS tree is reused, so every move is searched.
+The negamax transposition table is kept across the positions of a budget, as
+it is across the moves of a game.
+
+Usage: python -m benchmarks.search_quality [--curve NAME:PARAM=B1,B2,...]
+    [--target ACCURACY] [--all-positions] [--seed S] [--json PATH]
+"""
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+import click
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game import symmetry
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.AI import strategies
+from tic_tac_toe_game.typing import Grid
+
+
+DEFAULT_CURVES = (
+    "mcts_move:iterations=10,30,100,300,1000,3000",
+    "negamax_move:depth=1,2,3,4,5,6,7,8,9",
+)
+DEFAULT_TARGET = 0.99
+
+# Fixed parameters of the strategies, on top of the budget.
+_FIXED_PARAMS: Dict[str, Dict[str, Any]] = {"mcts_move": {"reuse_tree": False}}
+
+
+class Curve(NamedTuple):
+    """Budgets to try for the parameter `param` of the strategy `name`."""
+
+    name: str
+    param: str
+    budgets: Tuple[int, ...]
+
+
+class Point(NamedTuple):
+    """Accuracy and time per move of a strategy at a budget."""
+
+    name: str
+    param: str
+    budget: int
+    accuracy: float
+    ms_per_move: float
+
+
+def parse_curve(text: str) -> Curve:
+    """Parses a curve given as "name:param=budget,budget,..."."""
+    name, _, assignment = text.partition(":")
+    param, _, budgets = assignment.partition("=")
+    if not (name and param and budgets):
+        raise ValueError(f"Invalid curve {text!r}, expected NAME:PARAM=B1,B2,...")
+    return Curve(name, param, tuple(int(budget) for budget in budgets.split(",")))
+
+
+def positions(deduplicate: bool = True) -> List[Tuple[Grid, int]]:
+    """Returns every reachable non-terminal position and the mark to move.
+
+    Args:
+        deduplicate: bool, keeps a single position among symmetric ones.
+
+    Returns:
+        The positions, as grids and marks, in discovery order.
+    """
+    found: List[Tuple[Grid, int]] = []
+    seen: Set[int] = set()
+    stack = [(0, 0, 1)]
+    while stack:
+        x_bits, o_bits, mark = stack.pop()
+        key = (
+            symmetry.canonical_bits(x_bits, o_bits)[0]
+            if deduplicate
+            else x_bits | o_bits << 9
+        )
+        if key in seen:
+            continue
+        seen.add(key)
+        if bb.has_line(x_bits) or bb.has_line(o_bits):
+            continue
+        free = bb.free_cells(x_bits, o_bits)
+        if not free:
+            continue
+        found.append((bb.to_grid(x_bits, o_bits), mark))
+        for index in bb.iter_cells(free):
+            if mark == 1:
+                stack.append((x_bits | 1 << index, o_bits, -1))
+            else:
+                stack.append((x_bits, o_bits | 1 << index, 1))
+    return found
+
+
+def keeps_value(grid: Grid, mark: int, move: Tuple[int, int]) -> bool:
+    """Checks if playing `move` keeps the game-theoretic value of `grid`."""
+    after = [list(row) for row in grid]
+    after[move[0]][move[1]] = mark
+    x_bits, o_bits = bb.from_grid(after)
+    if bb.has_line(x_bits if mark == 1 else o_bits):
+        reached = 1
+    elif not bb.free_cells(x_bits, o_bits):
+        reached = 0
+    else:
+        reached = -oracle.position_value(after, -mark)
+    return reached == oracle.position_value(grid, mark)
+
+
+def measure(
+    curve: Curve, budget: int, played: Sequence[Tuple[Grid, int]], seed: int
+) -> Point:
+    """Plays every position of `played` at `budget` and scores the moves.
+
+    Searches start from scratch, not from the transpositions of other budgets.
+    """
+    negamax.clear_transpositions()
+    params = {**_FIXED_PARAMS.get(curve.name, {}), curve.param: budget}
+    strategy = strategies.Strategy(curve.name, **params)
+    rng = random.Random(seed)  # noqa: S311
+    correct = 0
+    start = time.perf_counter()
+    for grid, mark in played:
+        correct += keeps_value(grid, mark, strategy(grid, mark, rng))
+    elapsed = time.perf_counter() - start
+    return Point(
+        curve.name,
+        curve.param,
+        budget,
+        correct / len(played),
+        elapsed / len(played) * 1000,
+    )
+
+
+def cheapest(points: Sequence[Point], target: float) -> Optional[Point]:
+    """Returns the point of lowest budget reaching `target` accuracy, if any."""
+    reaching = [point for point in points if point.accuracy >= target]
+    if not reaching:
+        return None
+    return min(reaching, key=lambda point: point.budget)
+
+
+@click.command()
+@click.option(
+    "--curve",
+    "curves",
+    multiple=True,
+    default=DEFAULT_CURVES,
+    show_default=True,
+    help="Strategy, parameter and budgets, as NAME:PARAM=B1,B2,...",
+)
+@click.option("--target", default=DEFAULT_TARGET, show_default=True)
+@click.option("--all-positions", is_flag=True, help="Keep symmetric positions.")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--json", "json_path", type=click.Path(path_type=Path))
+def main(
+    curves: Tuple[str, ...],
+    target: float,
+    all_positions: bool,
+    seed: int,
+    json_path: Optional[Path],
+) -> None:
+    """Prints accuracy and time per move of each strategy and budget."""
+    try:
+        parsed = [parse_curve(curve) for curve in curves]
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--curve") from None
+    cache.configure(maxsize=0)
+    played = positions(deduplicate=not all_positions)
+    click.echo(f"{len(played)} positions, target accuracy {target:.2%}")
+    report: Dict[str, Any] = {"positions": len(played), "target": target}
+    report["curves"] = []
+    for curve in parsed:
+        points = [measure(curve, budget, played, seed) for budget in curve.budgets]
+        click.echo(f"\n{curve.name} ({curve.param})")
+        for point in points:
+            click.echo(
+                f"{point.budget:>8}: {point.accuracy:>8.2%}"
+                f"{point.ms_per_move:>10.3f} ms/move"
+            )
+        best = cheapest(points, target)
+        click.echo(
+            f"cheapest: {best.param}={best.budget}"
+            if best is not None
+            else "cheapest: none reaches the target"
+        )
+        report["curves"].append(
+            {
+                "name": curve.name,
+                "param": curve.param,
+                "points": [point._asdict() for point in points],
+                "cheapest": best.budget if best is not None else None,
+            }
+        )
+    if json_path is not None:
+        json_path.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
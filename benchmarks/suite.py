@@ -0,0 +1,412 @@
+"""Benchmark suite of the engine, its serialization, the AI and the routes.
+
+Every benchmark times a single operation, repeated in rounds: the number of
+calls per round is chosen so that a round lasts about `ROUND_TIME`, and the
+median time per call over the rounds is reported. Results are written as JSON
+and compared with a stored baseline, failing when a benchmark slows down by
+more than the regression threshold.
+
+Every run also times a fixed pure Python loop, the calibration, and timings
+are compared relative to the calibration of their run, so that a baseline
+recorded on a faster or slower machine still applies. Record a new baseline
+with --output when the interpreter changes.
+
+Usage: python -m benchmarks.suite [--rounds N] [--select SUBSTRING]
+    [--output PATH] [--compare BASELINE] [--threshold FRACTION]
+"""
+import contextlib
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+import click
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game import mnk
+from tic_tac_toe_game import state
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import strategies
+
+
+BASELINE_PATH = Path(__file__).resolve().parent.joinpath("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+ROUND_TIME = 0.05
+
+# X and O have played twice, X to move: no move is forced.
+MIDGAME_MOVES = ((1, 1, 1), (0, 0, -1), (2, 2, 1), (0, 2, -1))
+# O to move after X took a corner: no move is forced.
+OPENING_GRID = [[1, 0, 0], [0, 0, 0], [0, 0, 0]]
+# Search settings avoiding work carried over from a call to the next.
+_STRATEGY_PARAMS: Dict[str, Dict[str, Any]] = {
+    "mcts_move": {"iterations": 1000, "reuse_tree": False}
+}
+
+
+class Benchmark(NamedTuple):
+    """Operation to time, `setup` being called untimed before each call if set."""
+
+    run: Callable[[], Any]
+    setup: Optional[Callable[[], Any]] = None
+
+
+Factory = Callable[[], Iterator[Benchmark]]
+
+# Context managers setting up and tearing down each benchmark, by name.
+BENCHMARKS: Dict[str, Callable[[], ContextManager[Benchmark]]] = {}
+
+
+def benchmark(name: str) -> Callable[[Factory], Factory]:
+    """Registers a generator yielding a `Benchmark`, then cleaning up, as `name`."""
+
+    def decorator(factory: Factory) -> Factory:
+        BENCHMARKS[name] = contextlib.contextmanager(factory)
+        return factory
+
+    return decorator
+
+
+def _midgame(board_class: Type[engine.Board] = engine.Board) -> engine.Board:
+    """Returns a board after `MIDGAME_MOVES`."""
+    board = board_class()
+    for move in MIDGAME_MOVES:
+        board.make_move(engine.Move(*move))
+    return board
+
+
+def _register_board_benchmarks(board_class: type) -> None:
+    """Registers the benchmarks of the board methods of `board_class`."""
+    prefix = f"{board_class.__module__.rsplit('.', 1)[-1]}.{board_class.__name__}"
+    empty_cells = [(x, y) for x in range(3) for y in range(3)]
+
+    @benchmark(f"{prefix}.make_move")
+    def make_move() -> Iterator[Benchmark]:
+        boards: List[engine.Board] = []
+
+        def setup() -> None:
+            boards[:] = [board_class()]
+
+        def run() -> None:
+            board = boards[0]
+            for x, y in empty_cells:
+                board.make_move(engine.Move(x, y, 1))
+
+        yield Benchmark(run, setup)
+
+    @benchmark(f"{prefix}.winner")
+    def winner() -> Iterator[Benchmark]:
+        board = _midgame(board_class)
+
+        def run() -> None:
+            board._invalidate_winner()
+            board.winner()
+
+        yield Benchmark(run)
+
+    @benchmark(f"{prefix}.is_full")
+    def is_full() -> Iterator[Benchmark]:
+        yield Benchmark(_midgame(board_class).is_full)
+
+    @benchmark(f"{prefix}.is_winning_move")
+    def is_winning_move() -> Iterator[Benchmark]:
+        board = _midgame(board_class)
+        move = engine.Move(*MIDGAME_MOVES[-1])
+        yield Benchmark(lambda: board.is_winning_move(move))
+
+
+_register_board_benchmarks(engine.Board)
+_register_board_benchmarks(engine.BitBoard)
+_register_board_benchmarks(mnk.MNKBoard)
+
+
+@benchmark("mnk.MNKBoard.15x15_game")
+def gomoku_game() -> Iterator[Benchmark]:
+    """Plays 60 moves without a win on a 15*15 board, checking for a winner."""
+    rng = random.Random(0)  # noqa: S311
+    moves = []
+    for mark in (1, -1):
+        # Marks spread on every other row and column never make 5 in a row.
+        cells = [(x, y) for x in range(mark == -1, 15, 2) for y in range(0, 15, 2)]
+        moves.append([engine.Move(x, y, mark) for x, y in rng.sample(cells, 30)])
+    boards: List[engine.Board] = []
+
+    def setup() -> None:
+        boards[:] = [mnk.MNKBoard(rows=15, cols=15, k=5)]
+
+    def run() -> None:
+        board = boards[0]
+        for turn in range(30):
+            for mark_moves in moves:
+                board.make_move(mark_moves[turn])
+                board.winner()
+
+    yield Benchmark(run, setup)
+
+
+def _midgame_game() -> engine.TicTacToeGame:
+    """Returns a single player game after `MIDGAME_MOVES`."""
+    game = engine.build_game(difficulty="medium", seed=0)
+    game.board = _midgame()
+    return game
+
+
+@benchmark("serialization.round_trip")
+def round_trip() -> Iterator[Benchmark]:
+    """Converts a game to a dictionary and back."""
+    game = _midgame_game()
+    yield Benchmark(lambda: engine.TicTacToeGame.from_dict(game.to_dict()))
+
+
+@benchmark("state.set_state")
+def set_state() -> Iterator[Benchmark]:
+    """Saves a multi player game."""
+    game = _midgame_game()
+    try:
+        yield Benchmark(lambda: state.set_state("benchmark", game))
+    finally:
+        state.basedir.joinpath("benchmark.json").unlink(missing_ok=True)
+
+
+@benchmark("state.get_state")
+def get_state() -> Iterator[Benchmark]:
+    """Loads a multi player game."""
+    state.set_state("benchmark", _midgame_game())
+    try:
+        yield Benchmark(lambda: state.get_state("benchmark"))
+    finally:
+        state.basedir.joinpath("benchmark.json").unlink(missing_ok=True)
+
+
+def _register_strategy_benchmark(name: str) -> None:
+    """Registers the move latency benchmark of the strategy `name`."""
+
+    @benchmark(f"strategy.{name}")
+    def move() -> Iterator[Benchmark]:
+        strategy = strategies.Strategy(name, **_STRATEGY_PARAMS.get(name, {}))
+        rng = random.Random(0)  # noqa: S311
+        previous_size = cache.move_cache.maxsize
+        cache.configure(maxsize=0)
+        try:
+            # Transpositions are cleared untimed, so each call searches.
+            yield Benchmark(
+                lambda: strategy(OPENING_GRID, -1, rng), negamax.clear_transpositions
+            )
+        finally:
+            cache.configure(maxsize=previous_size)
+
+
+for _name in strategies.names():
+    _register_strategy_benchmark(_name)
+
+
+@benchmark("strategy.threat_move.15x15")
+def threat_move_15x15() -> Iterator[Benchmark]:
+    """Searches a 15*15 position with 20 marks and no threat to a fixed depth."""
+    rng = random.Random(0)  # noqa: S311
+    cells = rng.sample([(x, y) for x in range(3, 12) for y in range(3, 12)], 20)
+    grid = [[0] * 15 for _ in range(15)]
+    for turn, (x, y) in enumerate(cells):
+        grid[x][y] = 1 - 2 * (turn % 2)
+    strategy = strategies.Strategy("threat_move", time_budget=None, max_depth=3)
+    yield Benchmark(lambda: strategy(grid, 1))
+
+
+def _client() -> Any:
+    """Returns a test client of the web app, bot moves computed in requests.
+
+    The bot plays at random and debug logs are dropped, so that the routes and
+    not the AI or the console are timed.
+    """
+    import structlog
+
+    from app import create_app
+    from config import Config
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO)
+    )
+
+    class BenchmarkConfig(Config):
+        TESTING = True
+        BOT_WORKERS = 0
+        AI_DIFFICULTY = "beginner"
+
+    return create_app(BenchmarkConfig).test_client()
+
+
+@benchmark("routes./move")
+def move_route() -> Iterator[Benchmark]:
+    """Plays the first move of a new single player game, and the bot reply."""
+    client = _client()
+
+    def setup() -> None:
+        with client.session_transaction() as session:
+            session["game"] = engine.build_game(difficulty="beginner", seed=0)
+
+    yield Benchmark(lambda: client.post("/move", data={"move": "1 1"}), setup)
+
+
+@benchmark("routes./board")
+def board_route() -> Iterator[Benchmark]:
+    """Shows the board of a multi player game."""
+    game = engine.build_game(mode="multi")
+    game.board = _midgame()
+    state.set_state("benchmark", game)
+    try:
+        client = _client()
+        with client.session_transaction() as session:
+            session["room"] = "benchmark"
+            session["my_mark"] = "X"
+        yield Benchmark(lambda: client.get("/board"))
+    finally:
+        state.basedir.joinpath("benchmark.json").unlink(missing_ok=True)
+
+
+def measure(bench: Benchmark, rounds: int) -> Dict[str, float]:
+    """Returns the median and minimal time per call of `bench`, in seconds.
+
+    Args:
+        bench: Benchmark, the operation to time.
+        rounds: int, number of rounds.
+
+    Returns:
+        The "median" and "min" times per call over the rounds, and the
+        "number" of calls per round.
+    """
+
+    def time_round(number: int) -> float:
+        elapsed = 0.0
+        for _ in range(number):
+            if bench.setup is not None:
+                bench.setup()
+            start = time.perf_counter()
+            bench.run()
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    number = 1
+    while time_round(number) < ROUND_TIME and number < 1 << 20:
+        number *= 2
+    timings = [time_round(number) / number for _ in range(rounds)]
+    return dict(median=statistics.median(timings), min=min(timings), number=number)
+
+
+def _calibration_loop() -> int:
+    """Runs a fixed mix of arithmetic, indexing and calls, the calibration."""
+    values = list(range(64))
+    total = 0
+    for step in range(2000):
+        total += abs(values[step % 64] * step - total) % 7
+    return total
+
+
+def calibrate(rounds: int = 5) -> Dict[str, float]:
+    """Times the calibration loop, see `measure`."""
+    return measure(Benchmark(_calibration_loop), rounds)
+
+
+def run(rounds: int = 5, select: str = "") -> Dict[str, Dict[str, float]]:
+    """Runs the benchmarks whose name contains `select`."""
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if select in name:
+            with factory() as bench:
+                results[name] = measure(bench, rounds)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    scale: float = 1.0,
+) -> List[Tuple[str, float]]:
+    """Returns the benchmarks slower than their baseline by more than `threshold`.
+
+    Args:
+        results: dict, the current timings, see `run`.
+        baseline: dict, the timings to compare with.
+        threshold: float, tolerated slowdown, e.g. 0.25 for 25%.
+        scale: float, calibration of the current run over the calibration of
+            the baseline, by which baseline timings are multiplied.
+
+    Returns:
+        The names and relative slowdowns of the regressed benchmarks.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            change = _change(result, baseline[name], scale)
+            if change > threshold:
+                regressions.append((name, change))
+    return regressions
+
+
+def _change(result: Dict[str, float], base: Dict[str, float], scale: float) -> float:
+    """Returns the relative slowdown of `result` over the scaled `base`."""
+    return result["median"] / (base["median"] * scale) - 1
+
+
+@click.command()
+@click.option("--rounds", default=5, show_default=True)
+@click.option("--select", default="", help="Only run benchmarks containing this.")
+@click.option("--output", type=click.Path(path_type=Path), help="Write results.")
+@click.option(
+    "--compare",
+    "baseline_path",
+    type=click.Path(exists=True, path_type=Path),
+    help="Baseline to compare with, e.g. benchmarks/baseline.json.",
+)
+@click.option("--threshold", default=DEFAULT_THRESHOLD, show_default=True)
+def main(
+    rounds: int,
+    select: str,
+    output: Optional[Path],
+    baseline_path: Optional[Path],
+    threshold: float,
+) -> None:
+    """Times the benchmarks, exiting with 1 on regressions against the baseline."""
+    calibration = calibrate(rounds)
+    results = run(rounds, select)
+    report = json.loads(baseline_path.read_text()) if baseline_path else {}
+    baseline = report.get("benchmarks", {})
+    # Baselines recorded without a calibration are compared as they are.
+    scale = calibration["median"] / report.get("calibration", calibration)["median"]
+    click.echo(f"{'calibration':<36}{calibration['median'] * 1e6:>12.2f} us")
+    for name, result in results.items():
+        line = f"{name:<36}{result['median'] * 1e6:>12.2f} us"
+        if name in baseline:
+            line += f"{_change(result, baseline[name], scale):>+10.1%}"
+        click.echo(line)
+    if output is not None:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "calibration": calibration,
+            "benchmarks": results,
+        }
+        output.write_text(json.dumps(report, indent=2, sort_keys=True))
+    regressions = compare(results, baseline, threshold, scale)
+    for name, change in regressions:
+        click.echo(f"regression: {name} is {change:.1%} slower than the baseline")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -183,6 +183,20 @@ def coverage(session: Session) -> None:
     session.run("coverage", *args)
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Run the benchmark suite.
+
+    Comparing with the stored baseline is opt-in, since timings of shared or
+    busy machines vary beyond the regression threshold even once calibrated:
+    nox --session=benchmarks -- --compare=benchmarks/baseline.json
+    """
+    args = session.posargs
+    session.install(".")
+    # The web app is not part of the package.
+    session.run("python", "-m", "benchmarks.suite", *args, env={"PYTHONPATH": "src"})
+
+
 @session(python=python_versions[0])
 def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
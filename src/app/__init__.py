@@ -13,13 +13,18 @@ from flask_assets import Environment  # noqa: E402
 from flask_session import Session  # noqa: E402
 from flask_socketio import SocketIO  # noqa: E402
 
+from app.bot import BotMoveQueue  # noqa: E402
 from config import Config  # noqa: E402
+from tic_tac_toe_game.AI import cache  # noqa: E402
+from tic_tac_toe_game.AI import cooperative  # noqa: E402
+from tic_tac_toe_game.AI import mcts  # noqa: E402
 
 
 ASYNC_MODE = "eventlet"
 
 session = Session()
 socketio = SocketIO()
+bot_moves = BotMoveQueue()
 
 logger = structlog.get_logger()  # logger configured in logging_setup.py
 
@@ -28,9 +33,24 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
     """Creates the core application."""
     app: Flask = Flask(__name__)
     app.config.from_object(config_class)
+    mcts.configure(
+        app.config["MCTS_ITERATIONS"],
+        app.config["MCTS_TIME_BUDGET"],
+        app.config["MCTS_WORKERS"],
+        app.config["MCTS_ROLLOUTS_PER_LEAF"],
+    )
+    cache.configure(
+        app.config["AI_MOVE_CACHE_SIZE"],
+        app.config["AI_MOVE_CACHE_REDIS_URL"],
+        app.config["AI_MOVE_CACHE_TTL"],
+        app.config["AI_MOVE_CACHE_MAX_CONNECTIONS"],
+    )
+    # Let the other greenlets of the worker run while a bot is thinking.
+    cooperative.install_yield_hook(eventlet.sleep, app.config["AI_YIELD_EVERY"])
 
     session.init_app(app)
     socketio.init_app(app, async_mode=ASYNC_MODE, manage_session=False, logger=logger)
+    bot_moves.init_app(app, socketio)
 
     assets = Environment(app)
 
@@ -0,0 +1,189 @@
+"""Background computation of bot moves in single player mode."""
+import collections
+import copy
+import itertools
+import queue
+import random
+import time
+from typing import Any
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+
+import structlog
+from flask import Flask
+from flask_socketio import SocketIO
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.typing import Coordinates
+
+
+logger = structlog.get_logger()
+
+
+class BotJob(NamedTuple):
+    """Bot move to compute for the game identified by `token`."""
+
+    token: str
+    generation: int
+    game: engine.TicTacToeGame
+
+
+class BotResult(NamedTuple):
+    """Bot move computed for a game, waiting to be taken until `expires`."""
+
+    move: Coordinates
+    payload: Dict[str, Any]
+    rng: Optional[random.Random]
+    expires: float
+
+
+class BotMoveQueue:
+    """Bounded queue of bot moves computed by background workers.
+
+    Each game is identified by a token, which is also the Socket.IO room its
+    client joins. Once a move is computed, a `bot_move` event carrying the move
+    and the new board is emitted to that room, and the move is kept until the
+    next request of the player takes it. A game has at most one job in flight;
+    cancelling it, e.g. when the player starts a new game, makes the workers
+    drop the job or its result.
+
+    Results of games abandoned by their players are forgotten after
+    `result_ttl` seconds, or sooner when more than `max_results` are waiting,
+    oldest first, so that jobs and results never outnumber the queue size plus
+    `max_results`.
+    """
+
+    def __init__(self) -> None:
+        """Inits a queue without workers, see `init_app`."""
+        self.socketio: Optional[SocketIO] = None
+        self.workers = 0
+        self.result_ttl = 0.0
+        self.max_results = 0
+        self._jobs: "queue.Queue[BotJob]" = queue.Queue()
+        self._generations = itertools.count()
+        # Generation of the job in flight or waiting to be taken, by token.
+        self._pending: Dict[str, int] = {}
+        # Results waiting to be taken, by token, oldest first.
+        self._results: "collections.OrderedDict[str, BotResult]" = (
+            collections.OrderedDict()
+        )
+
+    def init_app(self, app: Flask, socketio: SocketIO) -> None:
+        """Sizes the queue from the app config and starts the workers."""
+        self.socketio = socketio
+        self.workers = app.config["BOT_WORKERS"]
+        self.result_ttl = app.config["BOT_RESULT_TTL"]
+        self.max_results = app.config["BOT_MAX_RESULTS"]
+        self._jobs = queue.Queue(maxsize=app.config["BOT_QUEUE_SIZE"])
+        for _ in range(self.workers):
+            socketio.start_background_task(self._work)
+
+    def submit(self, token: str, game: engine.TicTacToeGame) -> bool:
+        """Queues the computation of the next move of `game`.
+
+        The game is copied, so the caller keeps ownership of `game`. The copy
+        includes the random generators of the players, which `take` hands back,
+        so that a seeded bot plays the same moves as within the request.
+
+        Args:
+            token: str, identifies the game and the room to notify.
+            game: TicTacToeGame, game whose current player is an AI.
+
+        Returns:
+            bool: False if the move cannot be queued, because there are no
+            workers, the queue is full or a move is already in flight for `token`.
+        """
+        self._expire()
+        if not self.workers or token in self._pending:
+            return False
+        job = BotJob(token, next(self._generations), copy.deepcopy(game))
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            logger.warning("Bot move queue is full", token=token)
+            return False
+        self._pending[token] = job.generation
+        return True
+
+    def is_pending(self, token: str) -> bool:
+        """Checks if a move is in flight or waiting to be taken for `token`."""
+        return token in self._pending
+
+    def take(self, token: str, game: engine.TicTacToeGame) -> Optional[Coordinates]:
+        """Returns the computed move for `token` and forgets it, if ready.
+
+        Args:
+            token: str, identifies the game.
+            game: TicTacToeGame, game the move is played in, whose current
+                player takes over the random generator of the bot that
+                computed the move.
+
+        Returns:
+            The move, None if no move is ready.
+        """
+        self._expire()
+        if token not in self._results:
+            return None
+        del self._pending[token]
+        result = self._results.pop(token)
+        player = game.players_match.current()
+        if result.rng is not None and isinstance(player, engine.AIPlayer):
+            player.rng.setstate(result.rng.getstate())
+        return result.move
+
+    def event(self, token: str) -> Optional[Dict[str, Any]]:
+        """Returns the `bot_move` event payload for `token`, if ready."""
+        self._expire()
+        result = self._results.get(token)
+        return result.payload if result is not None else None
+
+    def cancel(self, token: str) -> None:
+        """Drops the move in flight for `token`, or its result."""
+        self._pending.pop(token, None)
+        self._results.pop(token, None)
+
+    def _expire(self) -> None:
+        """Forgets the results past their time to live or over the limit."""
+        now = time.monotonic()
+        while self._results:
+            token, result = next(iter(self._results.items()))
+            if result.expires > now and len(self._results) <= self.max_results:
+                break
+            logger.info("Bot move expired", token=token)
+            self.cancel(token)
+
+    def _is_current(self, job: BotJob) -> bool:
+        """Checks if `job` has not been cancelled."""
+        return self._pending.get(job.token) == job.generation
+
+    def _work(self) -> None:
+        """Computes queued moves forever."""
+        while True:
+            job = self._jobs.get()
+            if not self._is_current(job):
+                continue
+            try:
+                move = job.game.get_move()
+            except Exception:  # keep the worker alive
+                logger.exception("Bot move failed", token=job.token)
+                move = None
+            # The game may have been restarted while the bot was thinking.
+            if not self._is_current(job):
+                continue
+            if move is None:
+                self.cancel(job.token)
+            else:
+                self._finish(job, move)
+
+    def _finish(self, job: BotJob, move: Coordinates) -> None:
+        """Stores the result of `job` and notifies its room."""
+        player = job.game.players_match.current()
+        job.game.board.make_move(engine.Move(*move, player.get_mark()))
+        payload = {"move": list(move), "board": job.game.board.display()}
+        rng = player.rng if isinstance(player, engine.AIPlayer) else None
+        expires = time.monotonic() + self.result_ttl
+        self._results[job.token] = BotResult(move, payload, rng, expires)
+        self._expire()
+        if self.socketio is not None:
+            self.socketio.emit("bot_move", payload, to=job.token)
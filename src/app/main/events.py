@@ -1,9 +1,12 @@
 """Socket-IO events."""
+from typing import Dict
+
 import structlog
 from flask import session
 from flask_socketio import emit
 from flask_socketio import join_room
 
+from app import bot_moves
 from app import socketio
 from tic_tac_toe_game import engine
 from tic_tac_toe_game import state
@@ -21,6 +24,17 @@ def join(message):
     logger.info(f"Player joined room {room}", message=message)
 
 
+@socketio.event  # type: ignore[misc]
+def join_bot(message: Dict[str, str]) -> None:
+    """Subscribes the single player client to its bot moves."""
+    room = message["room"]
+    join_room(room)
+    # The bot may have played before the client joined.
+    payload = bot_moves.event(room)
+    if payload is not None:
+        emit("bot_move", payload)
+
+
 @socketio.event
 def move_received(data):
     """TODO."""
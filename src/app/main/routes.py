@@ -6,6 +6,7 @@ from typing import Tuple
 from typing import Union
 
 import structlog
+from flask import current_app
 from flask import flash
 from flask import redirect
 from flask import render_template
@@ -14,6 +15,7 @@ from flask import session
 from flask import url_for
 from werkzeug import Response
 
+from app import bot_moves
 from app.main import bp
 from app.main import forms
 from tic_tac_toe_game import engine
@@ -21,6 +23,8 @@ from tic_tac_toe_game import state
 from tic_tac_toe_game.AI import mcts
 from tic_tac_toe_game.AI import naive
 from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.AI import strategies
 
 
 logger = structlog.get_logger()
@@ -85,43 +89,104 @@ def tie() -> str:
 # ====================================================================================
 
 
-@bp.route("/game", methods=["GET", "POST"])
-def game() -> Union[str, Response]:
-    """Shows the current game."""
-    current_game: engine.TicTacToeGame = session["game"]
-    current_board = current_game.board
-    player = current_game.players_match.current()
-    chosen_cell: Optional[Union[Sequence[int], Sequence[str]]] = None
+def _bot_token() -> str:
+    """Returns the token identifying the bot moves of the session."""
+    if "bot_token" not in session:
+        session["bot_token"] = uuid.uuid4().hex
+    token: str = session["bot_token"]
+    return token
 
-    if "choice" in request.form:
-        chosen_cell = request.form["choice"].split()
-        player_move = engine.Move(*chosen_cell, player.get_mark())
-        current_board.make_move(player_move)
-        current_game.players_match.switch()
-
-        if not current_board.is_full() and not current_board.is_winning_move(
-            player_move
-        ):
-            player = current_game.players_match.current()
-            chosen_cell = current_game.get_move()
-            player_move = engine.Move(*chosen_cell, player.get_mark())
-            current_board.make_move(player_move)
-            current_game.players_match.switch()
 
+def _play_bot_move(
+    current_game: engine.TicTacToeGame, chosen_cell: Optional[Sequence[int]]
+) -> Optional[Response]:
+    """Plays the bot's move, returns a redirection if it ends the game."""
     if chosen_cell is None:
-        pass
-    elif current_board.is_winning_move(engine.Move(*chosen_cell, player.get_mark())):
+        return None
+    player = current_game.players_match.current()
+    player_move = engine.Move(*chosen_cell, player.get_mark())
+    current_game.board.make_move(player_move)
+    current_game.players_match.switch()
+
+    if current_game.board.is_winning_move(player_move):
         player.record_win()
         return redirect(url_for("main.win", mark=player.display_mark()))
-    elif current_board.is_full():
+    elif current_game.board.is_full():
         return redirect(url_for("main.tie"))
+    return None
+
+
+def _take_bot_move(current_game: engine.TicTacToeGame) -> Optional[Response]:
+    """Plays the bot's move computed in the background, if any is ready."""
+    return _play_bot_move(current_game, bot_moves.take(_bot_token(), current_game))
+
 
+def _ask_bot(current_game: engine.TicTacToeGame) -> Optional[Response]:
+    """Queues the bot's move, playing it within the request if it is refused."""
+    if bot_moves.submit(_bot_token(), current_game):
+        return None
+    return _play_bot_move(current_game, current_game.get_move())
+
+
+def _resume_bot(current_game: engine.TicTacToeGame) -> Optional[Response]:
+    """Asks the bot to move again if it is its turn and no move of it is coming.
+
+    This happens when the bot starts a game, or when its move expired or failed
+    in the background.
+    """
+    if current_game.board.is_over() or bot_moves.is_pending(_bot_token()):
+        return None
+    return _ask_bot(current_game)
+
+
+def _update_ai_algorithm(current_game: engine.TicTacToeGame) -> None:
+    """Switches the AI algorithm according to the submitted form."""
     if "AI_random" in request.form:
         current_game.players_match.update_ai_algorithm(naive.naive_move)
     elif "AI_mcts" in request.form:
         current_game.players_match.update_ai_algorithm(mcts.mcts_move)
     elif "AI_negamax" in request.form:
         current_game.players_match.update_ai_algorithm(negamax.negamax_move)
+    elif "AI_oracle" in request.form:
+        current_game.players_match.update_ai_algorithm(oracle.oracle_move)
+    elif request.form.get("difficulty") in strategies.PRESETS:
+        current_game.players_match.update_ai_algorithm(
+            strategies.preset(request.form["difficulty"])
+        )
+
+
+@bp.route("/game", methods=["GET", "POST"])
+def game() -> Union[str, Response]:
+    """Shows the current game."""
+    current_game: engine.TicTacToeGame = session["game"]
+    current_board = current_game.board
+    redirection = _take_bot_move(current_game)
+    if redirection is not None:
+        return redirection
+    player = current_game.players_match.current()
+
+    # Like on /move, the bot's reply is computed in the background and fetched
+    # by the page on its `bot_move` event, or within the request as a fallback.
+    # Choices made on the bot's turn are ignored.
+    if isinstance(player, engine.AIPlayer):
+        redirection = _resume_bot(current_game)
+        if redirection is not None:
+            return redirection
+    elif "choice" in request.form and not bot_moves.is_pending(_bot_token()):
+        player_move = engine.Move(*request.form["choice"].split(), player.get_mark())
+        current_board.make_move(player_move)
+        current_game.players_match.switch()
+
+        if current_board.is_winning_move(player_move):
+            player.record_win()
+            return redirect(url_for("main.win", mark=player.display_mark()))
+        elif current_board.is_full():
+            return redirect(url_for("main.tie"))
+        redirection = _ask_bot(current_game)
+        if redirection is not None:
+            return redirection
+
+    _update_ai_algorithm(current_game)
     logger.debug(
         f"game - game.players_match.players: {current_game.players_match.players}"
     )
@@ -129,18 +194,22 @@ def game() -> Union[str, Response]:
     return render_template(
         "game.html",
         board=current_board.display(),
-        turn=player.display_mark(),
+        turn=current_game.players_match.current().display_mark(),
         session=session,
         scores=current_game.get_scores(),
+        bot_token=_bot_token(),
+        difficulties=list(strategies.PRESETS),
     )
 
 
 @bp.route("/new_game")
 def new_game() -> Response:
     """Initializes a new game."""
+    bot_moves.cancel(_bot_token())
     if "game" not in session:
-        current_game = engine.build_game()
-        session["game"] = current_game
+        session["game"] = engine.build_game(
+            difficulty=current_app.config["AI_DIFFICULTY"]
+        )
     else:
         current_game: engine.TicTacToeGame = session["game"]
         current_game.board = engine.Board()
@@ -151,39 +220,42 @@ def new_game() -> Response:
 
 @bp.route("/move", methods=["POST"])
 def move() -> Union[str, Response]:
-    """Processes a player's move."""
+    """Processes a player's move.
+
+    The bot's reply is computed in the background and pushed to the client as a
+    `bot_move` Socket.IO event, falling back to computing it within the request
+    when the bot move queue is full or disabled.
+    """
     current_game: engine.TicTacToeGame = session["game"]
     current_board = current_game.board
+    token = _bot_token()
+    redirection = _take_bot_move(current_game)
+    if redirection is not None:
+        return redirection
     player = current_game.players_match.current()
 
-    chosen_cell: Optional[Union[Sequence[int], Sequence[str]]]
-
-    chosen_cell = request.form["move"].split()
-    player_move = engine.Move(*chosen_cell, player.get_mark())
-    current_board.make_move(player_move)
-    current_game.players_match.switch()
-
-    if not current_board.is_full() and not current_board.is_winning_move(player_move):
-        player = current_game.players_match.current()
-        chosen_cell = current_game.get_move()
+    # Moves played on the bot's turn are ignored.
+    if isinstance(player, engine.AIPlayer):
+        redirection = _resume_bot(current_game)
+        if redirection is not None:
+            return redirection
+    elif not bot_moves.is_pending(token):
+        chosen_cell = request.form["move"].split()
         player_move = engine.Move(*chosen_cell, player.get_mark())
         current_board.make_move(player_move)
         current_game.players_match.switch()
 
-    if chosen_cell is None:
-        pass
-    elif current_board.is_winning_move(engine.Move(*chosen_cell, player.get_mark())):
-        player.record_win()
-        return redirect(url_for("main.win", mark=player.display_mark()))
-    elif current_board.is_full():
-        return redirect(url_for("main.tie"))
+        if current_board.is_winning_move(player_move):
+            player.record_win()
+            return redirect(url_for("main.win", mark=player.display_mark()))
+        elif current_board.is_full():
+            return redirect(url_for("main.tie"))
 
-    if "AI_random" in request.form:
-        current_game.players_match.update_ai_algorithm(naive.naive_move)
-    elif "AI_mcts" in request.form:
-        current_game.players_match.update_ai_algorithm(mcts.mcts_move)
-    elif "AI_negamax" in request.form:
-        current_game.players_match.update_ai_algorithm(negamax.negamax_move)
+        redirection = _ask_bot(current_game)
+        if redirection is not None:
+            return redirection
+
+    _update_ai_algorithm(current_game)
     logger.debug(
         f"move - game.players_match.players: {current_game.players_match.players}"
     )
@@ -191,7 +263,23 @@ def move() -> Union[str, Response]:
     return render_template(
         "board.html",
         board=current_board.display(),
-        turn=player.display_mark(),
+        turn=current_game.players_match.current().display_mark(),
+        session=session,
+    )
+
+
+@bp.route("/bot_move")
+def bot_move() -> Union[str, Response]:
+    """Plays the bot's move announced by a `bot_move` Socket.IO event."""
+    current_game: engine.TicTacToeGame = session["game"]
+    redirection = _take_bot_move(current_game)
+    if redirection is not None:
+        return redirection
+
+    return render_template(
+        "board.html",
+        board=current_game.board.display(),
+        turn=current_game.players_match.current().display_mark(),
         session=session,
     )
 
@@ -288,12 +376,17 @@ def board() -> str:
 
     winner = current_game.winner()
     winner_mark = winner.display_mark() if winner is not None else None
+    is_over = current_board.is_over()
+    is_tie = current_board.is_tie()
+    logger.debug(
+        "board result evaluated", winner_cache_hits=current_board.winner_cache_hits
+    )
 
     return render_template(
         "board_multi.html",
         room=room,
-        is_over=current_game.board.is_over(),
-        is_tie=current_game.board.is_tie(),
+        is_over=is_over,
+        is_tie=is_tie,
         winner=winner_mark,
         board=current_board.display(),
         my_mark=session["my_mark"],
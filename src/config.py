@@ -25,3 +25,31 @@ class Config:
     SESSION_COOKIE_HTTPONLY = False
 
     STATIC_FOLDER = f"{os.getenv('APP_FOLDER')}/static/dist"
+
+    # AI search budgets, trading bot strength for move latency
+    MCTS_ITERATIONS = int(os.environ.get("MCTS_ITERATIONS") or 10000) or None
+    MCTS_TIME_BUDGET = float(os.environ.get("MCTS_TIME_BUDGET") or 0) or None
+    MCTS_WORKERS = int(os.environ.get("MCTS_WORKERS") or 1)
+    MCTS_ROLLOUTS_PER_LEAF = int(os.environ.get("MCTS_ROLLOUTS_PER_LEAF") or 1)
+    # Strategy preset of the bot in new single player games, see
+    # tic_tac_toe_game.AI.strategies.PRESETS
+    AI_DIFFICULTY = os.environ.get("AI_DIFFICULTY") or "medium"
+    # Number of AI moves cached across games, 0 disables the cache
+    AI_MOVE_CACHE_SIZE = int(os.environ.get("AI_MOVE_CACHE_SIZE", 4096))
+    # Share the cache between workers and nodes through Redis, e.g.
+    # redis://localhost:6379/0; moves expire after AI_MOVE_CACHE_TTL seconds
+    AI_MOVE_CACHE_REDIS_URL = os.environ.get("AI_MOVE_CACHE_REDIS_URL")
+    AI_MOVE_CACHE_TTL = int(os.environ.get("AI_MOVE_CACHE_TTL") or 0) or None
+    AI_MOVE_CACHE_MAX_CONNECTIONS = (
+        int(os.environ.get("AI_MOVE_CACHE_MAX_CONNECTIONS") or 0) or None
+    )
+    # AI searches yield to other greenlets every AI_YIELD_EVERY units of work
+    AI_YIELD_EVERY = int(os.environ.get("AI_YIELD_EVERY") or 128)
+    # Single player bot moves are computed by BOT_WORKERS background workers and
+    # pushed over Socket.IO, 0 computes them within the request
+    BOT_WORKERS = int(os.environ.get("BOT_WORKERS", 1))
+    BOT_QUEUE_SIZE = int(os.environ.get("BOT_QUEUE_SIZE") or 64)
+    # Computed bot moves not taken within BOT_RESULT_TTL seconds are forgotten,
+    # as are the oldest ones beyond BOT_MAX_RESULTS
+    BOT_RESULT_TTL = float(os.environ.get("BOT_RESULT_TTL") or 300)
+    BOT_MAX_RESULTS = int(os.environ.get("BOT_MAX_RESULTS") or 1024)
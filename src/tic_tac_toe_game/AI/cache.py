@@ -0,0 +1,238 @@
+"""Cache of AI moves shared by all games.
+
+Moves are stored for the canonical position (see `symmetry`), so that a move
+computed for a board also serves its 7 rotations and reflections. Entries are
+keyed by the canonical position, the mark to play, the strategy name and the
+strategy parameters, and evicted least recently used first.
+
+The cache lives in the process by default (`MoveCache`). Backed by Redis
+(`redis_cache.RedisMoveCache`), it is shared by every worker and node of the
+deployment, so that a search done once is never repeated elsewhere.
+"""
+import functools
+import inspect
+import random
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game import symmetry
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from tic_tac_toe_game.AI.redis_cache import RedisMoveCache
+
+
+DEFAULT_MAXSIZE = 4096
+
+# (canonical position, mark, strategy name, strategy parameters)
+CacheKey = Tuple[int, int, str, Hashable]
+
+Strategy = TypeVar("Strategy", bound=Callable[..., Coordinates])
+
+
+class MoveCache:
+    """LRU mapping of cache keys to move indexes on the canonical board."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        """Inits an empty cache holding up to `maxsize` moves, 0 to disable it."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._moves: "OrderedDict[CacheKey, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of cached moves."""
+        return len(self._moves)
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        """Returns the move cached for `key`, None if there is none."""
+        index = self._moves.get(key)
+        if index is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._moves.move_to_end(key)
+        return index
+
+    def put(self, key: CacheKey, index: int) -> None:
+        """Caches move `index` for `key`, evicting the least recently used move."""
+        if self.maxsize <= 0:
+            return
+        self._moves[key] = index
+        self._moves.move_to_end(key)
+        self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        """Sets the maximal number of moves, evicting moves in excess."""
+        self.maxsize = maxsize
+        self._evict()
+
+    def _evict(self) -> None:
+        """Evicts least recently used moves until the cache fits its size."""
+        while len(self._moves) > max(self.maxsize, 0):
+            self._moves.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forgets every move and resets the statistics."""
+        self._moves.clear()
+        self.hits = self.misses = 0
+
+
+move_cache: Union[MoveCache, "RedisMoveCache"] = MoveCache()
+
+# Strategies computing moves cheaper than a cache lookup, or playing at random.
+_uncached: Set[Callable[..., Coordinates]] = set()
+# Strategies wrapped by `cached_move`, which handle the cache themselves.
+_self_cached: Set[Callable[..., Coordinates]] = set()
+
+
+def configure(
+    maxsize: int = DEFAULT_MAXSIZE,
+    redis_url: Optional[str] = None,
+    ttl: Optional[int] = None,
+    max_connections: Optional[int] = None,
+) -> None:
+    """Sets up the move cache, in Redis if `redis_url` is given.
+
+    Args:
+        maxsize: int, maximal number of cached moves, 0 to disable the cache.
+        redis_url: str, URL of the Redis database, None for an in-process cache.
+        ttl: int, lifetime of a move in Redis in seconds, None for no expiry.
+        max_connections: int, size of the Redis connection pool, None for no limit.
+    """
+    global move_cache
+    if redis_url:
+        from tic_tac_toe_game.AI.redis_cache import RedisMoveCache
+
+        move_cache = RedisMoveCache.from_url(redis_url, maxsize, ttl, max_connections)
+    elif isinstance(move_cache, MoveCache):
+        move_cache.resize(maxsize)
+    else:
+        move_cache = MoveCache(maxsize)
+
+
+def uncached(strategy: Strategy) -> Strategy:
+    """Keeps `strategy` out of the move cache."""
+    _uncached.add(strategy)
+    return strategy
+
+
+def _no_settings() -> Hashable:
+    """Returns the parameters of a strategy which has no global settings."""
+    return ()
+
+
+def _lookup(
+    grid: Grid,
+    mark: int,
+    name: str,
+    params: Hashable,
+    compute: Callable[[], Coordinates],
+) -> Coordinates:
+    """Returns the cached move, calling `compute` on cache misses."""
+    position, transform = symmetry.canonical_grid(grid)
+    key = (position, mark, name, params)
+    index = move_cache.get(key)
+    if index is not None:
+        return symmetry.from_canonical(bb.cell_coordinates(index), transform)
+    move = compute()
+    move_cache.put(key, bb.cell_index(symmetry.to_canonical(move, transform)))
+    return move
+
+
+def cached_move(
+    settings: Callable[[], Hashable] = _no_settings
+) -> Callable[[Strategy], Strategy]:
+    """Puts the move cache in front of a strategy.
+
+    The strategy parameters are the arguments it is called with, defaults
+    included and the source of randomness `rng` excluded, completed by
+    `settings()` for strategies also reading global settings. Calls raising an
+    exception are not cached.
+
+    Args:
+        settings: callable, returns the global settings of the strategy.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(strategy: Strategy) -> Strategy:
+        signature = inspect.signature(strategy)
+
+        @functools.wraps(strategy)
+        def wrapper(grid: Grid, mark: int, *args: Any, **kwargs: Any) -> Coordinates:
+            if move_cache.maxsize <= 0:
+                return strategy(grid, mark, *args, **kwargs)
+            arguments = signature.bind(grid, mark, *args, **kwargs)
+            arguments.apply_defaults()
+            params = tuple(
+                value
+                for name, value in list(arguments.arguments.items())[2:]
+                if name != "rng"
+            )
+            return _lookup(
+                grid,
+                mark,
+                strategy.__name__,
+                (params, settings()),
+                lambda: strategy(grid, mark, *args, **kwargs),
+            )
+
+        _self_cached.add(wrapper)
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def accepts_rng(strategy: Callable[..., Coordinates]) -> bool:
+    """Checks if `strategy` takes its source of randomness as `rng` argument."""
+    return "rng" in inspect.signature(strategy).parameters
+
+
+def ask(
+    strategy: Callable[..., Coordinates],
+    grid: Grid,
+    mark: int,
+    rng: Optional[random.Random] = None,
+    **params: Any,
+) -> Coordinates:
+    """Returns the move of `strategy` on `grid` for `mark`, through the cache.
+
+    Strategies decorated by `cached_move` or `uncached` are simply called.
+    `rng` is passed on to strategies accepting it.
+
+    Args:
+        strategy: callable, the strategy to play.
+        grid: Grid, the position to play on.
+        mark: int, mark of the player to move.
+        rng: random.Random, source of randomness of the strategy.
+        **params: keyword arguments of the strategy, hashable.
+
+    Returns:
+        The coordinates of the move.
+    """
+    if rng is not None and accepts_rng(strategy):
+        params["rng"] = rng
+    if move_cache.maxsize <= 0 or strategy in _self_cached or strategy in _uncached:
+        return strategy(grid, mark, **params)
+    key_params = tuple(sorted((k, v) for k, v in params.items() if k != "rng"))
+    return _lookup(
+        grid,
+        mark,
+        strategy.__name__,
+        (key_params, _no_settings()),
+        lambda: strategy(grid, mark, **params),
+    )
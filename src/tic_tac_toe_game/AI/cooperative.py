@@ -0,0 +1,49 @@
+"""Cooperative checkpoints for long-running AI searches.
+
+Search loops call `checkpoint` once per unit of work (an MCTS iteration, a
+negamax node). Nothing happens unless a yield hook is installed, in which case
+the hook is called every `every` checkpoints. Under eventlet, installing
+`eventlet.sleep` lets other greenlets run while the bot is thinking.
+"""
+from typing import Callable
+from typing import Optional
+
+
+DEFAULT_EVERY = 128
+
+_hook: Optional[Callable[[], object]] = None
+_every = DEFAULT_EVERY
+_count = 0
+
+
+def install_yield_hook(hook: Callable[[], object], every: int = DEFAULT_EVERY) -> None:
+    """Calls `hook` every `every` checkpoints from now on.
+
+    Args:
+        hook: callable, gives control back to the scheduler, e.g. `eventlet.sleep`.
+        every: int, number of checkpoints between two calls of `hook`.
+
+    Raises:
+        ValueError: if `every` is not positive.
+    """
+    global _hook, _every, _count
+    if every < 1:
+        raise ValueError("`every` must be a positive number of checkpoints")
+    _hook, _every, _count = hook, every, 0
+
+
+def uninstall_yield_hook() -> None:
+    """Removes the yield hook, checkpoints become no-ops."""
+    global _hook, _count
+    _hook, _count = None, 0
+
+
+def checkpoint() -> None:
+    """Marks a unit of search work and yields if it is time to."""
+    global _count
+    if _hook is None:
+        return
+    _count += 1
+    if _count >= _every:
+        _count = 0
+        _hook()
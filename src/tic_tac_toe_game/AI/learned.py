@@ -0,0 +1,162 @@
+"""Strategy playing action values learned offline by Q-learning.
+
+The values are learned by the `qlearning` module through self-play and stored
+in a binary file with one row of 9 signed bytes per position code of
+`oracle`, memory-mapped on the first move: the value of playing each cell, from -127
+(the move loses) to 127 (the move wins), seen from the player to move. A move
+is a lookup in the table, so the strategy costs no search at play time.
+
+The temperature of `learned_move` sets its strength: the best move is played
+at temperature 0, and moves are drawn with softmax probabilities of their
+values above it, getting closer to random play as the temperature rises.
+"""
+import math
+import mmap
+import random
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game.AI.cache import uncached
+from tic_tac_toe_game.AI.oracle import POSITIONS
+from tic_tac_toe_game.AI.oracle import encode_position
+from tic_tac_toe_game.typing import Grid
+
+
+basedir = Path(__file__).resolve().parent
+
+TABLE_PATH = basedir.joinpath("learned.bin")
+CELLS = bb.SIZE * bb.SIZE
+# Stored value of a move worth 1.
+SCALE = 127
+
+Table = Union[bytes, mmap.mmap]
+
+
+def build_table(**options: Any) -> bytes:
+    """Learns the action values and returns the packed table.
+
+    Args:
+        **options: training options, see `qlearning.train`.
+
+    Returns:
+        The table, see the module docstring.
+    """
+    import numpy as np
+
+    from tic_tac_toe_game import qlearning
+
+    values = np.clip(qlearning.train(**options), -1, 1)
+    return np.rint(values * SCALE).astype(np.int8).tobytes()
+
+
+def write_table(path: Path = TABLE_PATH, **options: Any) -> None:
+    """Learns the action values and writes their table to `path`.
+
+    Args:
+        path: Path, where to write the table.
+        **options: training options, see `qlearning.train`.
+    """
+    with open(path, "wb") as table_file:
+        table_file.write(build_table(**options))
+
+
+def load_table(path: Path = TABLE_PATH) -> Table:
+    """Memory-maps the table stored at `path`.
+
+    Training takes a while, so a missing table is never learned on the fly.
+
+    Args:
+        path: Path, the table file.
+
+    Returns:
+        The table, see the module docstring.
+
+    Raises:
+        FileNotFoundError: if there is no table at `path`.
+        ValueError: if the table has the wrong size.
+    """
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Learned table {path} is missing, learn it with"
+            " `tic-tac-toe-game train`"
+        )
+    with open(path, "rb") as table_file:
+        table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != CELLS * POSITIONS:
+        raise ValueError(f"Corrupted learned table: {path}")
+    return table
+
+
+_table: Optional[Table] = None
+
+
+def raw_table() -> Table:
+    """Returns the table of `TABLE_PATH`, loading it on the first call."""
+    global _table
+    if _table is None:
+        _table = load_table()
+    return _table
+
+
+def move_values(grid: Grid, mark: int) -> List[Tuple[int, float]]:
+    """Returns the learned value, from -1 to 1, of every empty cell of `grid`.
+
+    Args:
+        grid: list of lists, the position.
+        mark: int, mark of the player to move.
+
+    Returns:
+        The cell indices, in reading order, and their values.
+    """
+    start = CELLS * encode_position(grid, mark)
+    row = raw_table()[start : start + CELLS]
+    x_bits, o_bits = bb.from_grid(grid)
+    return [
+        (index, ((row[index] ^ 0x80) - 0x80) / SCALE)  # signed byte
+        for index in bb.iter_cells(bb.free_cells(x_bits, o_bits))
+    ]
+
+
+@uncached
+def learned_move(
+    grid: Grid,
+    mark: int,
+    rng: Optional[random.Random] = None,
+    temperature: float = 0.0,
+) -> Tuple[int, int]:
+    """Returns a cell picked from the learned values of the moves.
+
+    Args:
+        grid: list of lists, the position.
+        mark: int, mark of the player to move.
+        rng: random.Random, source of the random choices, or the `random`
+            module if None.
+        temperature: float, 0 to play a best move, higher for weaker play.
+
+    Returns:
+        The coordinates of the cell.
+
+    Raises:
+        IndexError: if the grid is full.
+    """
+    choice = random.choice
+    if rng is not None:
+        choice = rng.choice
+    choices = random.choices
+    if rng is not None:
+        choices = rng.choices
+    values = move_values(grid, mark)
+    if not values:
+        raise IndexError("Grid is full, cannot choose an available cell")
+    best = max(value for _, value in values)
+    if temperature <= 0:
+        cells = [index for index, value in values if value == best]
+        return bb.cell_coordinates(choice(cells))
+    weights = [math.exp((value - best) / temperature) for _, value in values]
+    index = choices([index for index, _ in values], weights)[0]
+    return bb.cell_coordinates(index)
@@ -1,173 +1,736 @@
-"""Implementation of the MCTS algorithm for Tic Tac Toe Game."""
-from typing import List
+"""Implementation of the MCTS algorithm for Tic Tac Toe Game.
+
+The search tree lives in flat lists indexed by node id, preallocated for the
+requested budget and grown by doubling, rather than in one Python object per
+node. Positions are bitboards and random playouts only use integer operations.
+"""
+import math
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Tuple
 
 import numpy as np
 import numpy.typing as npt
-from mctspy.games.common import TwoPlayersAbstractGameState
-from mctspy.tree.nodes import TwoPlayersGameMonteCarloTreeSearchNode
-from mctspy.tree.search import MonteCarloTreeSearch
 
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game.AI.cache import cached_move
+from tic_tac_toe_game.AI.cooperative import checkpoint
+from tic_tac_toe_game.AI.tactics import fast_path
 from tic_tac_toe_game.typing import Grid
 
 
-class Move:
-    """Move class."""
-
-    def __init__(self, x_coordinate: int, y_coordinate: int, value: float) -> None:
-        """Inits."""
-        self.x_coordinate = x_coordinate
-        self.y_coordinate = y_coordinate
-        self.value = value
-
-    def __repr__(self) -> str:
-        """Repr."""
-        return f"x:{self.x_coordinate} y:{self.y_coordinate} v:{self.value}"
-
-
-class TicTacToeGameState(TwoPlayersAbstractGameState):  # type: ignore[misc]
-    """TicTacToeGameState class."""
-
-    x = 1
-    o = -1
-
-    def __init__(self, state: npt.NDArray[np.float64], next_to_move: float = 1) -> None:
-        """Inits."""
-        if len(state.shape) != 2 or state.shape[0] != state.shape[1]:
-            raise ValueError("Only 2D square boards allowed")
-        self.board = state
-        self.board_size: int = state.shape[0]
-        self.next_to_move = next_to_move
-
-    @property
-    def game_result(self) -> Optional[float]:
-        """Returns game result.
-
-        This property should return:
-         1 if player #1 wins
-        -1 if player #2 wins
-         0 if there is a draw
-         None if result is unknown
-        Returns
-        -------
-        int
-        """
-        # check if game is over
-        rowsum = np.sum(self.board, 0)
-        colsum = np.sum(self.board, 1)
-        diag_sum_tl = self.board.trace()
-        diag_sum_tr = self.board[::-1].trace()
-
-        player_one_wins = any(rowsum == self.board_size)
-        # uses fact that python booleans are considered numeric type
-        player_one_wins += any(colsum == self.board_size)  # type: ignore[assignment]
-        player_one_wins += diag_sum_tl == self.board_size
-        player_one_wins += diag_sum_tr == self.board_size
-
-        if player_one_wins:
-            return self.x
-
-        player_two_wins = any(rowsum == -self.board_size)
-        # uses fact that python booleans are considered numeric type
-        player_two_wins += any(colsum == -self.board_size)  # type: ignore[assignment]
-        player_two_wins += diag_sum_tl == -self.board_size
-        player_two_wins += diag_sum_tr == -self.board_size
-
-        if player_two_wins:
-            return self.o
-
-        if np.all(self.board != 0):
-            return 0.0
-
-        # if not over - no result
-        return None
-
-    def is_game_over(self) -> bool:
-        """Returns boolean indicating if the game is over.
-
-        Simplest implementation may just be
-        `return self.game_result() is not None`
-        Returns
-        -------
-        boolean
-        """
-        return self.game_result is not None
-
-    def is_move_legal(self, move: Move) -> bool:
-        """Checks if move is legal."""
-        # check if correct player moves
-        if move.value != self.next_to_move:
-            return False
-
-        # check if inside the board on x-axis
-        x_in_range = 0 <= move.x_coordinate < self.board_size
-        if not x_in_range:
-            return False
-
-        # check if inside the board on y-axis
-        y_in_range = 0 <= move.y_coordinate < self.board_size
-        if not y_in_range:
-            return False
-
-        # finally check if board field not occupied yet
-        return bool(self.board[move.x_coordinate, move.y_coordinate] == 0)
-
-    def move(self, move: Move) -> "TicTacToeGameState":
-        """Consumes action and returns resulting TwoPlayersAbstractGameState.
-
-        Returns
-        -------
-        TwoPlayersAbstractGameState
+DEFAULT_ITERATIONS = 10000
+EXPLORATION = math.sqrt(2)
+
+# `result` of a node whose game is not over yet.
+ONGOING = 2
+# Number of iterations between two clock checks when searching under a time budget.
+CLOCK_CHECK_INTERVAL = 64
+INITIAL_CAPACITY = 4096
+MAX_PREALLOCATED = 1 << 16
+TREE_STORE_MAX_NODES = 1 << 18
+
+# Empty cell indices for every mask of empty cells.
+_FREE_CELLS = [tuple(bb.iter_cells(mask)) for mask in range(bb.FULL_MASK + 1)]
+
+# Membership of every cell in the 8 win lines, one column per line.
+WIN_LINES: npt.NDArray[np.int8] = np.array(
+    [[mask >> index & 1 for mask in bb.WIN_MASKS] for index in range(bb.SIZE**2)],
+    dtype=np.int8,
+)
+
+# Per-node arrays, copied when the tree is compacted.
+_NODE_ARRAYS = (
+    "parent",
+    "move",
+    "player",
+    "x_bits",
+    "o_bits",
+    "result",
+    "first_child",
+    "child_count",
+    "visits",
+    "wins",
+)
+
+_settings: Dict[str, Any] = {
+    "iterations": DEFAULT_ITERATIONS,
+    "time_budget": None,
+    "workers": 1,
+    "rollouts_per_leaf": 1,
+}
+
+
+def configure(
+    iterations: Optional[int] = DEFAULT_ITERATIONS,
+    time_budget: Optional[float] = None,
+    workers: int = 1,
+    rollouts_per_leaf: int = 1,
+) -> None:
+    """Sets the default search budget and parallelism of `mcts_move`.
+
+    Args:
+        iterations: int, number of iterations, None for no limit.
+        time_budget: float, wall-clock budget in seconds, None for no limit.
+        workers: int, number of processes searching in parallel.
+        rollouts_per_leaf: int, number of playouts run per iteration.
+
+    Raises:
+        ValueError: if both budgets are None or `workers` is not positive.
+    """
+    if iterations is None and time_budget is None:
+        raise ValueError("MCTS needs an iteration or a time budget")
+    if workers < 1:
+        raise ValueError("MCTS needs at least one worker")
+    _settings["iterations"] = iterations
+    _settings["time_budget"] = time_budget
+    _settings["workers"] = workers
+    _settings["rollouts_per_leaf"] = rollouts_per_leaf
+
+
+def batch_rollouts(
+    x_bits: int, o_bits: int, mark: int, playouts: int, rng: np.random.Generator
+) -> Tuple[int, int, int]:
+    """Plays `playouts` random games from a position in lockstep.
+
+    The boards are the rows of a (`playouts`, 9) array. Each row gets a random
+    order of its empty cells, every ply fills the next cell of all unfinished
+    games, and wins are found with one product against `WIN_LINES`.
+
+    Args:
+        x_bits: int, cells occupied by "X".
+        o_bits: int, cells occupied by "O".
+        mark: int, mark of the player to move.
+        playouts: int, number of games to play.
+        rng: numpy.random.Generator, source of randomness.
+
+    Returns:
+        The number of games won by "X", won by "O" and drawn.
+    """
+    cells = np.arange(bb.SIZE**2)
+    occupied = (x_bits | o_bits) >> cells & 1 == 1
+    start = (x_bits >> cells & 1) - (o_bits >> cells & 1)
+    boards = np.tile(start.astype(np.int8), (playouts, 1))
+
+    # Sorting random keys gives each row a random order, occupied cells last.
+    keys = rng.random((playouts, bb.SIZE**2))
+    keys[:, occupied] = 2.0
+    orders = np.argsort(keys, axis=1)
+
+    results = np.zeros(playouts, dtype=np.int8)
+    alive = np.arange(playouts)
+    for ply in range(bb.SIZE**2 - int(occupied.sum())):
+        boards[alive, orders[alive, ply]] = mark
+        won = (boards[alive] @ WIN_LINES == 3 * mark).any(axis=1)
+        results[alive[won]] = mark
+        alive = alive[~won]
+        if not alive.size:
+            break
+        mark = -mark
+    x_wins = int((results == 1).sum())
+    o_wins = int((results == -1).sum())
+    return x_wins, o_wins, playouts - x_wins - o_wins
+
+
+class MonteCarloTreeSearch:
+    """Monte Carlo tree search over a flat, array-backed tree.
+
+    Node 0 is the root. For every node id, `player` is the mark of the player
+    who moved into the node, `move` the cell index played, and `wins` counts
+    playouts won by `player` (draws count for half). The children of a node are
+    stored contiguously from `first_child`, which is -1 until expansion.
+
+    Attributes:
+        size: int, number of nodes in the tree.
+        iterations: int, number of playouts run so far.
+    """
+
+    def __init__(
+        self,
+        x_bits: int,
+        o_bits: int,
+        mark: int,
+        exploration: float = EXPLORATION,
+        rng: Optional[random.Random] = None,
+        capacity: int = INITIAL_CAPACITY,
+        rollouts_per_leaf: int = 1,
+    ) -> None:
+        """Inits the tree with the root position.
+
+        Args:
+            x_bits: int, cells occupied by "X".
+            o_bits: int, cells occupied by "O".
+            mark: int, mark of the player to move.
+            exploration: float, UCT exploration constant.
+            rng: random.Random, source of randomness for playouts.
+            capacity: int, number of nodes to preallocate.
+            rollouts_per_leaf: int, number of playouts per iteration. Beyond one,
+                they run as a batch with `batch_rollouts`.
+
+        Raises:
+            ValueError: if the game is already over.
         """
-        if not self.is_move_legal(move):
-            raise ValueError(f"move {move} on board {self.board} is not legal")
-        new_board = np.copy(self.board)
-        new_board[move.x_coordinate, move.y_coordinate] = move.value
-        if self.next_to_move == TicTacToeGameState.x:
-            next_to_move = TicTacToeGameState.o
+        self.exploration = exploration
+        self.seed(rng if rng is not None else random.Random())  # noqa: S311
+        self.rollouts_per_leaf = rollouts_per_leaf
+        self.size = 0
+        self.iterations = 0
+
+        capacity = max(capacity, 1)
+        self.parent = [-1] * capacity
+        self.move = [-1] * capacity
+        self.player = [0] * capacity
+        self.x_bits = [0] * capacity
+        self.o_bits = [0] * capacity
+        self.result = [ONGOING] * capacity
+        self.first_child = [-1] * capacity
+        self.child_count = [0] * capacity
+        self.visits = [0] * capacity
+        self.wins = [0.0] * capacity
+
+        is_over = bb.has_line(x_bits) or bb.has_line(o_bits)
+        if is_over or not bb.free_cells(x_bits, o_bits):
+            raise ValueError("Game is over, there is nothing to search")
+        self._add_node(-1, -1, -mark, x_bits, o_bits, ONGOING)
+
+    def seed(self, rng: random.Random) -> None:
+        """Draws the next playouts from `rng`, batched ones included."""
+        self.rng = rng
+        self.np_rng = np.random.default_rng(rng.randrange(2**32))
+
+    def _grow(self) -> None:
+        """Doubles the capacity of every node array."""
+        extra = len(self.parent)
+        self.parent.extend([-1] * extra)
+        self.move.extend([-1] * extra)
+        self.player.extend([0] * extra)
+        self.x_bits.extend([0] * extra)
+        self.o_bits.extend([0] * extra)
+        self.result.extend([ONGOING] * extra)
+        self.first_child.extend([-1] * extra)
+        self.child_count.extend([0] * extra)
+        self.visits.extend([0] * extra)
+        self.wins.extend([0.0] * extra)
+
+    def _add_node(
+        self, parent: int, move: int, player: int, x_bits: int, o_bits: int, result: int
+    ) -> int:
+        """Appends a node and returns its id."""
+        node = self.size
+        if node == len(self.parent):
+            self._grow()
+        self.parent[node] = parent
+        self.move[node] = move
+        self.player[node] = player
+        self.x_bits[node] = x_bits
+        self.o_bits[node] = o_bits
+        self.result[node] = result
+        self.first_child[node] = -1
+        self.child_count[node] = 0
+        self.visits[node] = 0
+        self.wins[node] = 0.0
+        self.size += 1
+        return node
+
+    def _expand(self, node: int) -> None:
+        """Creates all the children of `node`."""
+        x_bits, o_bits = self.x_bits[node], self.o_bits[node]
+        mark = -self.player[node]
+        free_cells = _FREE_CELLS[bb.free_cells(x_bits, o_bits)]
+        self.first_child[node] = self.size
+        self.child_count[node] = len(free_cells)
+        for index in free_cells:
+            bit = 1 << index
+            if mark == 1:
+                child_x, child_o, bits = x_bits | bit, o_bits, x_bits | bit
+            else:
+                child_x, child_o, bits = x_bits, o_bits | bit, o_bits | bit
+            if bb.has_line_through(bits, index):
+                result = mark
+            elif child_x | child_o == bb.FULL_MASK:
+                result = 0
+            else:
+                result = ONGOING
+            self._add_node(node, index, mark, child_x, child_o, result)
+
+    def _select_child(self, node: int) -> int:
+        """Returns the child of `node` with the best UCT score."""
+        visits, wins = self.visits, self.wins
+        first = self.first_child[node]
+        log_visits = math.log(visits[node])
+        best_child, best_score = first, -1.0
+        for child in range(first, first + self.child_count[node]):
+            child_visits = visits[child]
+            if not child_visits:
+                return child
+            score = wins[child] / child_visits + self.exploration * math.sqrt(
+                log_visits / child_visits
+            )
+            if score > best_score:
+                best_child, best_score = child, score
+        return best_child
+
+    def _rollout(self, x_bits: int, o_bits: int, mark: int) -> int:
+        """Plays random moves from a position and returns the game result."""
+        choice = self.rng.choice
+        while True:
+            free = bb.FULL_MASK & ~(x_bits | o_bits)
+            if not free:
+                return 0
+            index = choice(_FREE_CELLS[free])
+            if mark == 1:
+                x_bits |= 1 << index
+                if bb.has_line_through(x_bits, index):
+                    return mark
+            else:
+                o_bits |= 1 << index
+                if bb.has_line_through(o_bits, index):
+                    return mark
+            mark = -mark
+
+    def _backpropagate(self, node: int, outcome: int) -> None:
+        """Records the outcome of a playout from `node` up to the root."""
+        visits, wins, player, parent = self.visits, self.wins, self.player, self.parent
+        while node >= 0:
+            visits[node] += 1
+            if outcome == player[node]:
+                wins[node] += 1.0
+            elif outcome == 0:
+                wins[node] += 0.5
+            node = parent[node]
+
+    def _backpropagate_batch(
+        self, node: int, x_wins: int, o_wins: int, draws: int
+    ) -> None:
+        """Records the outcomes of a batch of playouts from `node` up to the root."""
+        playouts = x_wins + o_wins + draws
+        visits, wins, player, parent = self.visits, self.wins, self.player, self.parent
+        while node >= 0:
+            visits[node] += playouts
+            wins[node] += (x_wins if player[node] == 1 else o_wins) + 0.5 * draws
+            node = parent[node]
+
+    def iterate(self) -> None:
+        """Runs one selection, expansion, playout and backpropagation step."""
+        node = 0
+        while self.first_child[node] >= 0:
+            node = self._select_child(node)
+
+        outcome = self.result[node]
+        if outcome == ONGOING:
+            self._expand(node)
+            node = self.first_child[node] + self.rng.randrange(self.child_count[node])
+            outcome = self.result[node]
+
+        playouts = self.rollouts_per_leaf
+        if playouts == 1:
+            if outcome == ONGOING:
+                outcome = self._rollout(
+                    self.x_bits[node], self.o_bits[node], -self.player[node]
+                )
+            self._backpropagate(node, outcome)
+        elif outcome == ONGOING:
+            self._backpropagate_batch(
+                node,
+                *batch_rollouts(
+                    self.x_bits[node],
+                    self.o_bits[node],
+                    -self.player[node],
+                    playouts,
+                    self.np_rng,
+                ),
+            )
         else:
-            next_to_move = TicTacToeGameState.x
-
-        return TicTacToeGameState(new_board, next_to_move)
-
-    def get_legal_actions(self) -> List[Move]:
-        """Returns list of legal action at current game state.
-
-        Returns
-        -------
-        list of AbstractGameAction
+            self._backpropagate_batch(
+                node,
+                playouts * (outcome == 1),
+                playouts * (outcome == -1),
+                playouts * (outcome == 0),
+            )
+        self.iterations += 1
+
+    def search(
+        self, iterations: Optional[int] = None, time_budget: Optional[float] = None
+    ) -> int:
+        """Runs iterations until one of the budgets is spent.
+
+        Args:
+            iterations: int, maximum number of iterations, None for no limit.
+            time_budget: float, maximum duration in seconds, None for no limit.
+
+        Returns:
+            The number of iterations run.
+
+        Raises:
+            ValueError: if both budgets are None.
         """
-        indices = np.where(self.board == 0)
-        return [
-            Move(coords[0], coords[1], self.next_to_move)
-            for coords in list(zip(indices[0], indices[1], strict=True))
-        ]
+        if iterations is None and time_budget is None:
+            raise ValueError("MCTS needs an iteration or a time budget")
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        done = 0
+        while iterations is None or done < iterations:
+            if (
+                deadline is not None
+                and done % CLOCK_CHECK_INTERVAL == 0
+                and time.perf_counter() >= deadline
+            ):
+                break
+            self.iterate()
+            checkpoint()
+            done += 1
+        return done
+
+    def root_visits(self) -> Dict[int, int]:
+        """Returns the visit count of every move from the root."""
+        first = self.first_child[0]
+        return {
+            self.move[child]: self.visits[child]
+            for child in range(first, first + self.child_count[0])
+        }
+
+    def best_move(self) -> int:
+        """Returns the cell index of the most visited move from the root."""
+        if self.first_child[0] < 0:
+            self.iterate()
+        visits = self.root_visits()
+        return max(visits, key=visits.__getitem__)
 
+    @property
+    def mark(self) -> int:
+        """Returns the mark of the player to move at the root."""
+        return -self.player[0]
 
-def from_mcts_grid_format(grid: List[List[float]]) -> Grid:
-    """Loads grid from a list of int."""
-    return [[int(elem) for elem in row] for row in grid]
+    @property
+    def is_over(self) -> bool:
+        """Checks if the game is over at the root."""
+        return self.result[0] != ONGOING
 
+    def position_key(self) -> Tuple[int, int, int]:
+        """Returns the root position and the mark of the player to move."""
+        return self.x_bits[0], self.o_bits[0], self.mark
 
-def to_mcts_grid_format(grid: Grid) -> List[List[float]]:
-    """Dumps grid to list of int."""
-    return [[float(elem) for elem in row] for row in grid]
+    def advance(self, move: int) -> None:
+        """Makes the child reached by playing cell `move` the new root.
 
+        The statistics of its subtree are kept, the rest of the tree is dropped
+        and the arrays are compacted.
 
-def mcts_move(grid: Grid, mark: int) -> Tuple[int, int]:
-    """Computes best move."""
-    board = to_mcts_grid_format(grid)
-    current_player = float(mark)
+        Args:
+            move: int, index of the cell played from the root.
 
-    state = np.array(board)
-    initial_board_state = TicTacToeGameState(state=state, next_to_move=current_player)
-    root = TwoPlayersGameMonteCarloTreeSearchNode(state=initial_board_state)
-    mcts = MonteCarloTreeSearch(root)
-    best_node = mcts.best_action(10000)
+        Raises:
+            ValueError: if cell `move` is not empty at the root.
+        """
+        if self.first_child[0] < 0 and not self.is_over:
+            self._expand(0)
+        first = self.first_child[0]
+        children = range(first, first + self.child_count[0])
+        child = next((node for node in children if self.move[node] == move), -1)
+        if child < 0:
+            raise ValueError(f"Cell {move} cannot be played from the root")
+
+        # Breadth-first copy keeps the children of every node contiguous.
+        order = [child]
+        new_ids = {child: 0}
+        position = 0
+        while position < len(order):
+            first = self.first_child[order[position]]
+            if first >= 0:
+                for old in range(first, first + self.child_count[order[position]]):
+                    new_ids[old] = len(order)
+                    order.append(old)
+            position += 1
+
+        for name in _NODE_ARRAYS:
+            values = getattr(self, name)
+            setattr(self, name, [values[node] for node in order])
+        self.parent = [new_ids.get(node, -1) for node in self.parent]
+        self.first_child = [new_ids.get(node, -1) for node in self.first_child]
+        self.size = len(order)
+
+
+# Root position, mark to move and playouts per leaf of a stored tree.
+StoreKey = Tuple[int, int, int, int]
+
+
+class TreeStore:
+    """Keeps search trees between turns, within a bound on their total size.
+
+    After the bot moves, its tree is advanced to the resulting position and
+    stored under it. When the bot is asked to move again, the tree is taken back
+    by removing, one at a time, the opponent's marks from the new position, and
+    advanced through the opponent's reply. Games reaching the same position
+    share their statistics, which are valid for that position regardless of the
+    game. Trees are also keyed by their number of playouts per leaf, so that a
+    search only reuses trees grown with its own settings. Least recently stored
+    trees are dropped first.
+
+    Attributes:
+        max_nodes: int, maximum number of nodes allocated by all stored trees.
+    """
+
+    def __init__(self, max_nodes: int = TREE_STORE_MAX_NODES) -> None:
+        """Inits an empty store."""
+        self.max_nodes = max_nodes
+        self._trees: "OrderedDict[StoreKey, MonteCarloTreeSearch]" = OrderedDict()
+        self._nodes = 0
+
+    def __len__(self) -> int:
+        """Returns the number of stored trees."""
+        return len(self._trees)
 
-    board_diff = best_node.state.board - best_node.parent.state.board
+    @property
+    def nodes(self) -> int:
+        """Returns the number of nodes allocated by the stored trees."""
+        return self._nodes
+
+    def put(self, tree: MonteCarloTreeSearch) -> None:
+        """Stores `tree` under its root position, evicting older trees if needed."""
+        key = (*tree.position_key(), tree.rollouts_per_leaf)
+        self._discard(key)
+        self._trees[key] = tree
+        self._nodes += len(tree.parent)
+        while self._nodes > self.max_nodes and self._trees:
+            self._discard(next(iter(self._trees)))
+
+    def take(
+        self, x_bits: int, o_bits: int, mark: int, rollouts_per_leaf: int = 1
+    ) -> Optional[MonteCarloTreeSearch]:
+        """Removes and returns a tree advanced to the given position, if any.
+
+        Args:
+            x_bits: int, cells occupied by "X".
+            o_bits: int, cells occupied by "O".
+            mark: int, mark of the player to move.
+            rollouts_per_leaf: int, number of playouts per iteration of the tree.
+
+        Returns:
+            The tree, None if no stored tree leads to the position.
+        """
+        opponent_bits = o_bits if mark == 1 else x_bits
+        for index in bb.iter_cells(opponent_bits):
+            bit = 1 << index
+            if mark == 1:
+                key = (x_bits, o_bits ^ bit, -mark, rollouts_per_leaf)
+            else:
+                key = (x_bits ^ bit, o_bits, -mark, rollouts_per_leaf)
+            tree = self._discard(key)
+            if tree is not None:
+                tree.advance(index)
+                return tree
+        return None
 
-    x_coords, y_coords = np.where(board_diff == current_player)
-    chosen_cell = (x_coords[0], y_coords[0])
+    def clear(self) -> None:
+        """Drops every stored tree."""
+        self._trees.clear()
+        self._nodes = 0
+
+    def _discard(self, key: StoreKey) -> Optional[MonteCarloTreeSearch]:
+        """Removes and returns the tree stored under `key`, if any."""
+        tree = self._trees.pop(key, None)
+        if tree is not None:
+            self._nodes -= len(tree.parent)
+        return tree
+
+
+_trees = TreeStore()
+
+
+def clear_trees() -> None:
+    """Drops the trees kept between turns."""
+    _trees.clear()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Returns the shared process pool, recreating it if `workers` changed."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stops the processes used by root-parallel searches."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+    _pool, _pool_workers = None, 0
+
+
+def _search_root_visits(
+    x_bits: int,
+    o_bits: int,
+    mark: int,
+    iterations: Optional[int],
+    time_budget: Optional[float],
+    rollouts_per_leaf: int,
+    seed: int,
+) -> Dict[int, int]:
+    """Runs an independent search and returns its root visit counts."""
+    tree = MonteCarloTreeSearch(
+        x_bits,
+        o_bits,
+        mark,
+        rng=random.Random(seed),
+        rollouts_per_leaf=rollouts_per_leaf,
+    )
+    tree.search(iterations, time_budget)
+    if tree.first_child[0] < 0:
+        tree.iterate()
+    return tree.root_visits()
+
+
+def root_parallel_search(
+    x_bits: int,
+    o_bits: int,
+    mark: int,
+    workers: int,
+    iterations: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    rollouts_per_leaf: int = 1,
+    rng: Optional[random.Random] = None,
+) -> Dict[int, int]:
+    """Searches in `workers` processes and returns the merged root visit counts.
+
+    Each process grows its own tree from a different seed, drawn from `rng` if
+    given. The iteration budget is the total over all processes, while the time
+    budget applies to each of them, as they run side by side.
+    """
+    per_worker = None if iterations is None else -(-iterations // workers)
+    randrange = rng.randrange if rng is not None else random.randrange
+    seeds = [randrange(2**32) for _ in range(workers)]
+    futures = [
+        _get_pool(workers).submit(
+            _search_root_visits,
+            x_bits,
+            o_bits,
+            mark,
+            per_worker,
+            time_budget,
+            rollouts_per_leaf,
+            seed,
+        )
+        for seed in seeds
+    ]
+    visits: Dict[int, int] = {}
+    for future in futures:
+        for move, count in future.result().items():
+            visits[move] = visits.get(move, 0) + count
+    return visits
+
+
+def _tree_search(
+    x_bits: int,
+    o_bits: int,
+    mark: int,
+    iterations: Optional[int],
+    time_budget: Optional[float],
+    rollouts_per_leaf: int,
+    reuse_tree: bool,
+    rng: Optional[random.Random],
+) -> int:
+    """Searches in this process and returns the best move index."""
+    tree = None
+    if reuse_tree:
+        tree = _trees.take(x_bits, o_bits, mark, rollouts_per_leaf)
+    if tree is not None and rng is not None:
+        tree.seed(rng)
+    if tree is None:
+        capacity = INITIAL_CAPACITY
+        if iterations is not None:
+            capacity = min(1 + 9 * iterations, MAX_PREALLOCATED)
+        tree = MonteCarloTreeSearch(
+            x_bits,
+            o_bits,
+            mark,
+            rng=rng,
+            capacity=capacity,
+            rollouts_per_leaf=rollouts_per_leaf,
+        )
+    elif iterations is not None:
+        done = tree.visits[0] // tree.rollouts_per_leaf
+        iterations = max(iterations - done, 0)
+    tree.search(iterations, time_budget)
+
+    best_move = tree.best_move()
+    if reuse_tree:
+        tree.advance(best_move)
+        if not tree.is_over:
+            _trees.put(tree)
+    return best_move
+
+
+def _cache_settings() -> Tuple[Tuple[str, Any], ...]:
+    """Returns the settings of `mcts_move` which are part of its cache key."""
+    return tuple(sorted(_settings.items()))
+
+
+@cached_move(_cache_settings)
+@fast_path
+def mcts_move(
+    grid: Grid,
+    mark: int,
+    iterations: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    reuse_tree: bool = True,
+    workers: Optional[int] = None,
+    rollouts_per_leaf: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> Tuple[int, int]:
+    """Computes best move.
+
+    Budgets, workers and playouts per leaf default to the values set with
+    `configure`. Forced moves are played without searching, see
+    `tactics.fast_path`, and moves are cached, see `cache.cached_move`. When
+    `reuse_tree` is set, the tree kept from the previous turn is reused: the
+    iteration budget then counts the playouts already recorded at the new root,
+    so that only the missing ones are run. With more than one worker, the search
+    is root-parallel (see `root_parallel_search`) and no tree is kept. Playouts
+    are drawn from `rng` if given, making searches with an iteration budget
+    reproducible, provided no tree is reused and the move cache is disabled.
+    """
+    if iterations is None and time_budget is None:
+        iterations = _settings["iterations"]
+        time_budget = _settings["time_budget"]
+    if workers is None:
+        workers = _settings["workers"]
+    if rollouts_per_leaf is None:
+        rollouts_per_leaf = _settings["rollouts_per_leaf"]
+    x_bits, o_bits = bb.from_grid(grid)
+
+    if workers > 1:
+        visits = root_parallel_search(
+            x_bits,
+            o_bits,
+            mark,
+            workers,
+            iterations,
+            time_budget,
+            rollouts_per_leaf,
+            rng,
+        )
+        best_move = max(visits, key=visits.__getitem__)
+    else:
+        best_move = _tree_search(
+            x_bits,
+            o_bits,
+            mark,
+            iterations,
+            time_budget,
+            rollouts_per_leaf,
+            reuse_tree,
+            rng,
+        )
+    chosen_cell: Tuple[int, int] = divmod(best_move, bb.SIZE)
     return chosen_cell
@@ -1,12 +1,23 @@
 """Implementation of a random cell picking algorithm for Tic Tac Toe Game."""
 import random
+from typing import Optional
 from typing import Tuple
 
+from tic_tac_toe_game.AI.cache import uncached
 from tic_tac_toe_game.typing import Grid
 
 
-def naive_move(grid: Grid, *args: int) -> Tuple[int, int]:
-    """Returns a randomly picked cell among available cells."""
+@uncached
+def naive_move(
+    grid: Grid, *args: int, rng: Optional[random.Random] = None
+) -> Tuple[int, int]:
+    """Returns a randomly picked cell among available cells.
+
+    The cell is drawn from `rng`, or from the `random` module if None.
+    """
+    choice = random.choice
+    if rng is not None:
+        choice = rng.choice
     empty_cells = [
         (row_id, col_id)
         for row_id, row in enumerate(grid)
@@ -14,7 +25,7 @@ def naive_move(grid: Grid, *args: int) -> Tuple[int, int]:
         if cell == 0
     ]
     try:
-        random_cell = random.choice(empty_cells)
+        random_cell = choice(empty_cells)
     except IndexError:
         raise IndexError("Grid is full, cannot choose an available cell") from None
     return random_cell
@@ -1,149 +1,151 @@
-"""Implementation of the negamax algorithm for Tic Tac Toe Game."""
+"""Implementation of the negamax algorithm for Tic Tac Toe Game.
+
+The search runs on bitboards seen from the player to move, with alpha-beta
+pruning, a transposition table shared by all calls and a static move ordering
+(center, corners, edges) refined by the best move previously stored for the
+position.
+"""
+from typing import Dict
 from typing import List
-from typing import Optional
 from typing import Tuple
-from typing import Union
-
-from easyAI import AI_Player
-from easyAI import Human_Player
-from easyAI import Negamax
-from easyAI import TwoPlayerGame
 
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game.AI.cache import cached_move
+from tic_tac_toe_game.AI.cooperative import checkpoint
+from tic_tac_toe_game.AI.tactics import fast_path
 from tic_tac_toe_game.typing import Grid
 
 
-class TicTacToe(TwoPlayerGame):  # type: ignore[misc]
-    """TicTacToe class.
+FULL_DEPTH = 9
+WIN_SCORE = 100
+
+# Center first, then corners, then edges.
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# Transposition table flags: the stored score is exact, a lower or an upper bound.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Maps a position hash to (depth, flag, score, best move index).
+TranspositionTable = Dict[int, Tuple[int, int, int, int]]
+
+_transpositions: TranspositionTable = {}
+
+
+def clear_transpositions() -> None:
+    """Forgets the positions searched by previous calls."""
+    _transpositions.clear()
+
+
+def position_hash(own_bits: int, opp_bits: int) -> int:
+    """Returns a collision-free hash of a position seen from the player to move."""
+    return own_bits | opp_bits << 9
+
 
-    The board positions are numbered as follows:
-    1 2 3
-    4 5 6
-    7 8 9
+def evaluate(own_bits: int, opp_bits: int) -> int:
+    """Scores an unfinished position by the number of lines each player can win."""
+    own_lines = sum(1 for mask in bb.WIN_MASKS if not mask & opp_bits)
+    opp_lines = sum(1 for mask in bb.WIN_MASKS if not mask & own_bits)
+    return own_lines - opp_lines
+
+
+def ordered_moves(free: int, first: int = -1) -> List[int]:
+    """Returns the empty cells of `free`, `first` leading if it is empty."""
+    moves = [index for index in MOVE_ORDER if free >> index & 1]
+    if first in moves:
+        moves.remove(first)
+        moves.insert(0, first)
+    return moves
+
+
+def negamax(
+    own_bits: int,
+    opp_bits: int,
+    depth: int,
+    alpha: int = -WIN_SCORE * 10,
+    beta: int = WIN_SCORE * 10,
+    transpositions: TranspositionTable = _transpositions,
+) -> Tuple[int, int]:
+    """Searches the position and returns its score and best move index.
+
+    Wins score `WIN_SCORE` times one plus the number of empty cells left, so
+    that quicker wins and slower losses are preferred. Positions at the depth
+    horizon are scored with `evaluate`. The move index is -1 for finished games.
+    Stored positions are only reused when searched at the same depth.
     """
+    checkpoint()
+    free = bb.free_cells(own_bits, opp_bits)
+    if bb.has_line(opp_bits):
+        return -WIN_SCORE * (1 + bin(free).count("1")), -1
+    if not free:
+        return 0, -1
+    # Searching deeper than the number of empty cells changes nothing.
+    depth = min(depth, bin(free).count("1"))
+    if depth == 0:
+        return evaluate(own_bits, opp_bits), -1
+
+    key = position_hash(own_bits, opp_bits)
+    alpha_orig = alpha
+    best_index = -1
+    entry = transpositions.get(key)
+    # Entries of other depths are ignored: a deeper score or move would leak
+    # into a depth-limited search, and make its result depend on past calls.
+    if entry is not None and entry[0] == depth:
+        _, flag, score, best_index = entry
+        alpha, beta = _narrow_window(flag, score, alpha, beta)
+        if alpha >= beta:
+            return score, best_index
+
+    best = -WIN_SCORE * 10
+    for index in ordered_moves(free, best_index):
+        score = -negamax(
+            opp_bits, own_bits | 1 << index, depth - 1, -beta, -alpha, transpositions
+        )[0]
+        if score > best:
+            best, best_index = score, index
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+
+    transpositions[key] = (depth, _bound_flag(best, alpha_orig, beta), best, best_index)
+    return best, best_index
+
+
+def _bound_flag(score: int, alpha: int, beta: int) -> int:
+    """Returns how `score`, searched within (`alpha`, `beta`), should be stored."""
+    if score <= alpha:
+        return UPPER
+    elif score >= beta:
+        return LOWER
+    return EXACT
+
+
+def _narrow_window(flag: int, score: int, alpha: int, beta: int) -> Tuple[int, int]:
+    """Returns the search window narrowed by a stored score.
+
+    An exact score closes the window on itself.
+    """
+    if flag == EXACT:
+        return score, score
+    elif flag == LOWER:
+        return max(alpha, score), beta
+    return alpha, min(beta, score)
+
 
-    def __init__(
-        self,
-        players: List[Union[AI_Player, Human_Player]],
-        board: Optional[List[int]] = None,
-        current_player: int = 1,
-    ) -> None:
-        """Inits."""
-        self.players = players
-        if board is None:
-            board = [0 for _ in range(9)]
-        self.board = board
-        self.current_player = current_player  # player 1 starts.
-
-    def possible_moves(self) -> List[int]:
-        """Returns possible moves."""
-        return [i + 1 for i, e in enumerate(self.board) if e == 0]
-
-    def make_move(self, move: Union[int, str]) -> None:
-        """Make move."""
-        self.board[int(move) - 1] = self.current_player
-
-    def unmake_move(self, move: Union[int, str]) -> None:
-        """Unmake move.
-
-        Optional method (speeds up the AI)
-        """
-        self.board[int(move) - 1] = 0
-
-    WIN_LINES = [
-        [1, 2, 3],
-        [4, 5, 6],
-        [7, 8, 9],  # horiz.
-        [1, 4, 7],
-        [2, 5, 8],
-        [3, 6, 9],  # vertical
-        [1, 5, 9],
-        [3, 5, 7],  # diagonal
-    ]
-
-    def lose(self, who: Optional[int] = None) -> bool:
-        """Has the opponent "three in line?"."""
-        if who is None:
-            who = self.opponent_index
-        wins = [
-            all([(self.board[c - 1] == who) for c in line]) for line in self.WIN_LINES
-        ]
-        return any(wins)
-
-    def is_over(self) -> bool:
-        """Returns boolean indicating if the game is over."""
-        return (
-            (self.possible_moves() == [])
-            or self.lose()
-            or self.lose(who=self.current_player)
-        )
-
-    def show(self) -> None:
-        """Prints the board."""
-        print(
-            "\n"
-            + "\n".join(
-                [
-                    " ".join([[".", "O", "X"][self.board[3 * j + i]] for i in range(3)])
-                    for j in range(3)
-                ]
-            )
-        )
-
-    def spot_string(self, i: int, j: int) -> str:
-        """Returns sign associated to the cell state."""
-        return ["_", "O", "X"][self.board[3 * j + i]]
-
-    def scoring(self) -> int:
-        """Returns scoring."""
-        opp_won = self.lose()
-        i_won = self.lose(who=self.current_player)
-        if opp_won and not i_won:
-            return -100
-        if i_won and not opp_won:
-            return 100
-        return 0
-
-    def winner(self) -> str:
-        """Returns winner or tie status."""
-        if self.lose(who=2):
-            return "AI Wins"
-        return "Tie"
-
-
-GRID_CORRESPONDENCE = {
-    1: (0, 0),
-    2: (0, 1),
-    3: (0, 2),
-    4: (1, 0),
-    5: (1, 1),
-    6: (1, 2),
-    7: (2, 0),
-    8: (2, 1),
-    9: (2, 2),
-}
-
-
-def from_negamax_grid_format(grid: List[int]) -> Grid:
-    """Loads grid from a list of int."""
-    # return [[elem if elem != 2 else -1 for elem in row] for row in grid]
-    return [
-        [elem if elem != 2 else -1 for elem in grid[i : i + 3]]
-        for i in range(0, len(grid), 3)
-    ]
-
-
-def to_negamax_grid_format(grid: Grid) -> List[int]:
-    """Dumps grid to list of int."""
-    return [elem if elem != -1 else 2 for row in grid for elem in row]
-
-
-def negamax_move(grid: Grid, mark: int) -> Tuple[int, int]:
-    """Computes best move."""
-    board = to_negamax_grid_format(grid)
-    current_player = mark if mark != -1 else 2
-
-    ttt = TicTacToe([Human_Player(), AI_Player(Negamax(6))], board, current_player)
-
-    ai_move = ttt.get_move()
-    chosen_cell = GRID_CORRESPONDENCE[ai_move]
+@cached_move()
+@fast_path
+def negamax_move(grid: Grid, mark: int, depth: int = FULL_DEPTH) -> Tuple[int, int]:
+    """Computes best move.
+
+    Forced moves are played without searching, see `tactics.fast_path`, and
+    moves are cached, see `cache.cached_move`.
+    """
+    x_bits, o_bits = bb.from_grid(grid)
+    own_bits, opp_bits = (x_bits, o_bits) if mark == 1 else (o_bits, x_bits)
+    if not bb.free_cells(own_bits, opp_bits):
+        raise IndexError("Grid is full, cannot choose an available cell")
+
+    _, best_index = negamax(own_bits, opp_bits, depth)
+    if best_index == -1:  # the game is already won, any empty cell will do
+        best_index = ordered_moves(bb.free_cells(own_bits, opp_bits))[0]
+    chosen_cell: Tuple[int, int] = divmod(best_index, bb.SIZE)
     return chosen_cell
@@ -0,0 +1,196 @@
+"""Perfect play for Tic Tac Toe Game backed by a precomputed position table.
+
+Every position is encoded from the point of view of the player about to move,
+as a base 3 number with one digit per cell in reading order:
+0 for an empty cell, 1 for the player to move and 2 for its opponent. All the
+3^9 = 19683 codes are solved once and stored in a binary file of 16-bit little
+endian entries, shipped with the package and memory-mapped at import:
+
+- bits 0 to 8: mask of the optimal moves, empty for finished games;
+- bits 9 and 10: game-theoretic value plus one (0 loss, 1 draw, 2 win).
+
+Among moves keeping the game-theoretic value, only the quickest wins and the
+slowest losses are flagged as optimal.
+"""
+import mmap
+import os
+import random
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game.AI.cache import uncached
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+basedir = Path(__file__).resolve().parent
+
+TABLE_PATH = basedir.joinpath("oracle.bin")
+POSITIONS = 3**9
+_ENTRY = struct.Struct("<H")
+_VALUE_SHIFT = 9
+
+# Base 3 code of the cells set in a 9-bit mask, for every mask.
+_MASK_CODES: List[int] = [
+    sum(3**index for index in bb.iter_cells(mask)) for mask in range(bb.FULL_MASK + 1)
+]
+
+Table = Union[bytes, mmap.mmap]
+
+
+def encode_bits(own_bits: int, opp_bits: int) -> int:
+    """Returns the code of a position given as the mover's and opponent's bits."""
+    return _MASK_CODES[own_bits] + 2 * _MASK_CODES[opp_bits]
+
+
+def decode_bits(code: int) -> Tuple[int, int]:
+    """Returns the mover's and opponent's bits of the position `code`."""
+    own_bits = opp_bits = 0
+    for index in range(9):
+        code, digit = divmod(code, 3)
+        if digit == 1:
+            own_bits |= 1 << index
+        elif digit == 2:
+            opp_bits |= 1 << index
+    return own_bits, opp_bits
+
+
+def encode_position(grid: Grid, mark: int) -> int:
+    """Returns the code of `grid` seen by the player using `mark`."""
+    x_bits, o_bits = bb.from_grid(grid)
+    if mark == 1:
+        return encode_bits(x_bits, o_bits)
+    return encode_bits(o_bits, x_bits)
+
+
+def _solve(code: int, scores: Dict[int, int], moves: Dict[int, int]) -> int:
+    """Scores position `code` for the player to move and records optimal moves.
+
+    Scores are positive for wins, negative for losses and zero for draws. Their
+    magnitude is one plus the number of empty cells left when the game ends, so
+    that quicker wins and slower losses score higher.
+    """
+    if code in scores:
+        return scores[code]
+    own_bits, opp_bits = decode_bits(code)
+    free = bb.free_cells(own_bits, opp_bits)
+    empty_count = bin(free).count("1")
+
+    best_moves = 0
+    if bb.has_line(opp_bits):
+        best = -(empty_count + 1)
+    elif bb.has_line(own_bits):  # unreachable in a legal game
+        best = empty_count + 1
+    elif not free:
+        best = 0
+    else:
+        best = -POSITIONS
+        for index in bb.iter_cells(free):
+            child = encode_bits(opp_bits, own_bits | 1 << index)
+            score = -_solve(child, scores, moves)
+            if score > best:
+                best, best_moves = score, 1 << index
+            elif score == best:
+                best_moves |= 1 << index
+
+    scores[code] = best
+    moves[code] = best_moves
+    return best
+
+
+def build_table() -> bytes:
+    """Solves every position and returns the packed table."""
+    scores: Dict[int, int] = {}
+    moves: Dict[int, int] = {}
+    table = bytearray(_ENTRY.size * POSITIONS)
+    for code in range(POSITIONS):
+        score = _solve(code, scores, moves)
+        value = (score > 0) - (score < 0)
+        _ENTRY.pack_into(
+            table, _ENTRY.size * code, (value + 1) << _VALUE_SHIFT | moves[code]
+        )
+    return bytes(table)
+
+
+def write_table(path: Path = TABLE_PATH) -> None:
+    """Builds the table and writes it to `path`.
+
+    The table is written to a temporary file first, then moved to `path`, so
+    that readers never map a partly written table.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as table_file:
+        table_file.write(build_table())
+    try:
+        os.replace(table_file.name, path)
+    except OSError:
+        os.unlink(table_file.name)
+        raise
+
+
+def load_table(path: Path = TABLE_PATH) -> Table:
+    """Memory-maps the table stored at `path`, solving it in memory if missing.
+
+    A missing table is never written at import, as the package directory may be
+    read-only or shared by several processes, see `write_table`.
+    """
+    if not path.exists():
+        return build_table()
+    with open(path, "rb") as table_file:
+        table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != _ENTRY.size * POSITIONS:
+        raise ValueError(f"Corrupted oracle table: {path}")
+    return table
+
+
+_table = load_table()
+
+
+def raw_table() -> Table:
+    """Returns the packed table of every position, see the module docstring."""
+    return _table
+
+
+def _entry(code: int) -> int:
+    """Returns the raw table entry of position `code`."""
+    entry: int = _ENTRY.unpack_from(_table, _ENTRY.size * code)[0]
+    return entry
+
+
+def position_value(grid: Grid, mark: int) -> int:
+    """Returns the game-theoretic value of `grid` for the player using `mark`.
+
+    1 if the player wins with perfect play, 0 for a draw, -1 for a loss.
+    """
+    return (_entry(encode_position(grid, mark)) >> _VALUE_SHIFT) - 1
+
+
+def optimal_moves(grid: Grid, mark: int) -> List[Coordinates]:
+    """Returns the optimal moves on `grid` for the player using `mark`."""
+    mask = _entry(encode_position(grid, mark)) & bb.FULL_MASK
+    return [bb.cell_coordinates(index) for index in bb.iter_cells(mask)]
+
+
+@uncached
+def oracle_move(
+    grid: Grid, mark: int, rng: Optional[random.Random] = None
+) -> Tuple[int, int]:
+    """Returns a randomly picked cell among optimal moves.
+
+    The cell is drawn from `rng`, or from the `random` module if None.
+    """
+    choice = random.choice
+    if rng is not None:
+        choice = rng.choice
+    try:
+        return choice(optimal_moves(grid, mark))
+    except IndexError:
+        raise IndexError("Game is over, cannot choose an optimal cell") from None
@@ -0,0 +1,167 @@
+"""Move cache stored in Redis, shared by every worker and node.
+
+Imported by `cache.configure` only when a Redis URL is set, so that processes
+using the in-process cache do not pay for importing the Redis client.
+"""
+import time
+from typing import Optional
+
+import redis
+import structlog
+
+from tic_tac_toe_game.AI.cache import CacheKey
+from tic_tac_toe_game.AI.cache import DEFAULT_MAXSIZE
+
+
+logger = structlog.get_logger()
+
+DEFAULT_PREFIX = "ttt:moves"
+# Seconds to wait for Redis before playing without the cache.
+SOCKET_TIMEOUT = 0.5
+
+
+class RedisMoveCache:
+    """Move cache stored in Redis, with the interface of `cache.MoveCache`.
+
+    Every move is a string key, expiring after `ttl` seconds if set. A sorted
+    set indexes the keys by time of last use, the oldest ones being deleted
+    once there are more than `maxsize` of them, and another one by time of
+    expiry, so that expired keys leave the index before it is counted.
+    Eviction reads and trims the index in one transaction, so that workers
+    evicting at the same time never evict more moves than needed. Redis errors
+    are logged and handled as cache misses, so that bots keep playing when
+    Redis is down.
+    """
+
+    def __init__(
+        self,
+        client: "redis.Redis[bytes]",
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: Optional[int] = None,
+        prefix: str = DEFAULT_PREFIX,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            client: Redis, client, sharing a connection pool between threads.
+            maxsize: int, maximal number of cached moves, 0 to disable the cache.
+            ttl: int, lifetime of a move in seconds, None for no expiry.
+            prefix: str, namespace of the Redis keys.
+        """
+        self.client = client
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._index = f"{prefix}:index"
+        self._expiries = f"{prefix}:expiries"
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: Optional[int] = None,
+        max_connections: Optional[int] = None,
+    ) -> "RedisMoveCache":
+        """Returns a cache connected to `url` through a connection pool."""
+        pool = redis.ConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            socket_timeout=SOCKET_TIMEOUT,
+            socket_connect_timeout=SOCKET_TIMEOUT,
+        )
+        return cls(redis.Redis(connection_pool=pool), maxsize, ttl)
+
+    def _name(self, key: CacheKey) -> str:
+        """Returns the Redis key of `key`."""
+        return f"{self.prefix}:{key!r}"
+
+    def __len__(self) -> int:
+        """Returns the number of cached moves, 0 if Redis is unavailable."""
+        try:
+            self._prune()
+            return int(self.client.zcard(self._index))
+        except redis.RedisError as error:
+            logger.warning("Move cache unavailable", error=str(error))
+            return 0
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        """Returns the move cached for `key`, None if there is none."""
+        name = self._name(key)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(name)
+            pipe.zadd(self._index, {name: time.time()}, xx=True)
+            value = pipe.execute()[0]
+        except redis.RedisError as error:
+            logger.warning("Move cache unavailable", error=str(error))
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return int(value)
+
+    def put(self, key: CacheKey, index: int) -> None:
+        """Caches move `index` for `key`, evicting the least recently used moves."""
+        if self.maxsize <= 0:
+            return
+        name = self._name(key)
+        now = time.time()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(name, index, ex=self.ttl)
+            pipe.zadd(self._index, {name: now})
+            if self.ttl is None:
+                pipe.zrem(self._expiries, name)
+            else:
+                pipe.zadd(self._expiries, {name: now + self.ttl})
+            pipe.execute()
+            self._prune()
+            self._evict()
+        except redis.RedisError as error:
+            logger.warning("Move cache unavailable", error=str(error))
+
+    def resize(self, maxsize: int) -> None:
+        """Sets the maximal number of moves, evicting moves in excess."""
+        self.maxsize = maxsize
+        try:
+            self._prune()
+            self._evict()
+        except redis.RedisError as error:
+            logger.warning("Move cache unavailable", error=str(error))
+
+    def _prune(self) -> None:
+        """Removes the moves past their time to live from the index."""
+        now = time.time()
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zrangebyscore(self._expiries, "-inf", now)
+        pipe.zremrangebyscore(self._expiries, "-inf", now)
+        names = pipe.execute()[0]
+        if names:
+            self.client.zrem(self._index, *names)
+
+    def _evict(self) -> None:
+        """Deletes the least recently used moves in excess of `maxsize`."""
+        # Ranks from the oldest up to the newest `maxsize` moves excluded.
+        last = -max(self.maxsize, 0) - 1
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zrange(self._index, 0, last)
+        pipe.zremrangebyrank(self._index, 0, last)
+        names = pipe.execute()[0]
+        if names:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(*names)
+            pipe.zrem(self._expiries, *names)
+            pipe.execute()
+
+    def clear(self) -> None:
+        """Forgets every move and resets the statistics."""
+        try:
+            names = self.client.zrange(self._index, 0, -1)
+            self.client.delete(self._index, self._expiries, *names)
+        except redis.RedisError as error:
+            logger.warning("Move cache unavailable", error=str(error))
+        self.hits = self.misses = 0
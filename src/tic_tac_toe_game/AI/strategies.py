@@ -0,0 +1,235 @@
+"""Registry of the AI strategies and of their parameterized configurations.
+
+A strategy function plays `function(grid, mark, **params)`. Registered under
+its name, it can be configured with `Strategy`, which binds parameters to it
+(MCTS iterations, negamax depth, time budgets...) and serializes them along its
+name. Difficulty presets map to such configurations, from cheap to expensive
+in compute.
+
+Strategies are registered as "module:function" paths and only imported when
+first used, so that importing the engine does not pull in NumPy or load the
+oracle table. Installed packages can provide more strategies through the
+`tic_tac_toe_game.strategies` entry point group.
+"""
+import importlib
+import inspect
+import random
+import sys
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+ENTRY_POINT_GROUP = "tic_tac_toe_game.strategies"
+
+StrategyFunction = Callable[..., Coordinates]
+
+# Strategy functions by name, or their "module:function" path until first use.
+STRATEGIES: Dict[str, Union[str, StrategyFunction]] = {
+    "naive_move": "tic_tac_toe_game.AI.naive:naive_move",
+    "mcts_move": "tic_tac_toe_game.AI.mcts:mcts_move",
+    "negamax_move": "tic_tac_toe_game.AI.negamax:negamax_move",
+    "oracle_move": "tic_tac_toe_game.AI.oracle:oracle_move",
+    "learned_move": "tic_tac_toe_game.AI.learned:learned_move",
+    "threat_move": "tic_tac_toe_game.AI.threats:threat_move",
+}
+
+
+def register(function: StrategyFunction) -> StrategyFunction:
+    """Registers a strategy function under its name.
+
+    Args:
+        function: callable, plays `function(grid, mark, **params)`.
+
+    Returns:
+        The function, so that `register` can be used as a decorator.
+    """
+    STRATEGIES[function.__name__] = function
+    return function
+
+
+def _entry_point_path(name: str) -> Optional[str]:
+    """Returns the path of the strategy `name` declared by an entry point."""
+    from importlib.metadata import entry_points
+
+    if sys.version_info >= (3, 10):
+        group = entry_points(group=ENTRY_POINT_GROUP)
+    else:
+        group = entry_points().get(ENTRY_POINT_GROUP, [])
+    for entry_point in group:
+        if entry_point.name == name:
+            path: str = entry_point.value
+            return path
+    return None
+
+
+def get(name: str) -> StrategyFunction:
+    """Returns the strategy function registered as `name`, importing it if needed.
+
+    Args:
+        name: str, name of the strategy.
+
+    Returns:
+        The strategy function.
+
+    Raises:
+        ValueError: if no strategy is registered or declared as `name`.
+    """
+    entry = STRATEGIES.get(name) or _entry_point_path(name)
+    if entry is None:
+        raise ValueError(f"Unknown strategy: {name!r}")
+    if not isinstance(entry, str):
+        return entry
+    module_name, _, attribute = entry.partition(":")
+    function: StrategyFunction = getattr(
+        importlib.import_module(module_name), attribute
+    )
+    STRATEGIES[name] = function
+    return function
+
+
+def names() -> List[str]:
+    """Returns the names of the registered strategies, without importing them."""
+    return list(STRATEGIES)
+
+
+def _is_registered_as(name: str, function: object) -> bool:
+    """Checks if `function` is the strategy registered as `name`."""
+    entry = STRATEGIES.get(name)
+    if isinstance(entry, str):
+        qualname = getattr(function, "__qualname__", None)
+        return entry == f"{getattr(function, '__module__', None)}:{qualname}"
+    return entry is function
+
+
+class Strategy:
+    """Registered strategy function bound to parameters.
+
+    Attributes:
+        name: str, name of the strategy function.
+        params: dict, keyword arguments of the function, JSON-serializable.
+    """
+
+    def __init__(self, name: str, **params: Any) -> None:
+        """Binds `params` to the strategy function registered as `name`.
+
+        Args:
+            name: str, name of a registered strategy function.
+            **params: keyword arguments of the function.
+
+        Raises:
+            ValueError: if the function is unknown or does not take `params`.
+        """
+        try:
+            inspect.signature(get(name)).bind_partial(None, None, **params)
+        except TypeError as error:
+            raise ValueError(f"Invalid parameters for {name!r}: {error}") from None
+        self.name = name
+        self.params = params
+
+    @property
+    def function(self) -> StrategyFunction:
+        """Returns the strategy function."""
+        return get(self.name)
+
+    def __call__(
+        self, grid: Grid, mark: int, rng: Optional[random.Random] = None
+    ) -> Coordinates:
+        """Plays the strategy with its parameters, through the move cache."""
+        return cache.ask(self.function, grid, mark, rng, **self.params)
+
+    def __repr__(self) -> str:
+        """Returns instance representation."""
+        params = "".join(f", {key}={value!r}" for key, value in self.params.items())
+        return f"{self.__class__.__name__}({self.name!r}{params})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the Strategy instance to a dictionary."""
+        return dict(name=self.name, params=dict(self.params))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Strategy":
+        """Constructs Strategy instance from dictionary."""
+        return cls(data["name"], **data.get("params", {}))
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether other equals self elementwise."""
+        if not isinstance(other, Strategy):
+            return False
+        return self.name == other.name and self.params == other.params
+
+
+# Difficulty levels, from the cheapest to the most expensive in compute, as
+# `Strategy` dictionaries.
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "beginner": {"name": "naive_move"},
+    "easy": {"name": "mcts_move", "params": {"iterations": 50, "reuse_tree": False}},
+    "medium": {"name": "mcts_move", "params": {"iterations": 500}},
+    "hard": {"name": "mcts_move", "params": {"iterations": 5000}},
+    "perfect": {"name": "negamax_move"},
+}
+
+
+def preset(difficulty: str) -> Strategy:
+    """Returns the strategy of a difficulty level, see `PRESETS`.
+
+    Args:
+        difficulty: str, name of the difficulty level.
+
+    Returns:
+        The strategy of the level.
+
+    Raises:
+        ValueError: if the difficulty level is unknown.
+    """
+    if difficulty not in PRESETS:
+        raise ValueError(f"Unknown difficulty: {difficulty!r}")
+    return Strategy.from_dict(PRESETS[difficulty])
+
+
+def resolve(name: str) -> Strategy:
+    """Returns the strategy of a difficulty level or of a registered strategy.
+
+    Args:
+        name: str, name of a difficulty level or of a registered strategy.
+
+    Returns:
+        The strategy, with the parameters of the level if any.
+    """
+    if name in PRESETS:
+        return preset(name)
+    return Strategy(name)
+
+
+def dump(
+    moves: Union[Strategy, StrategyFunction, None]
+) -> Union[str, Dict[str, Any], None]:
+    """Serializes the moves of a player.
+
+    Registered functions serialize to their name and strategies to their
+    dictionary, anything else to None.
+    """
+    if isinstance(moves, Strategy):
+        return moves.to_dict()
+    name: Optional[str] = getattr(moves, "__name__", None)
+    if name is not None and _is_registered_as(name, moves):
+        return name
+    return None
+
+
+def load(
+    data: Union[str, Dict[str, Any], None]
+) -> Optional[Callable[..., Coordinates]]:
+    """Deserializes the moves of a player, see `dump`."""
+    if isinstance(data, dict):
+        return Strategy.from_dict(data)
+    if data is None or data not in STRATEGIES:
+        return None
+    return get(data)
@@ -0,0 +1,398 @@
+"""Heuristic search for m,n,k games on large boards.
+
+Positions are searched on the windows of `mnk.layout`: every window counts
+the marks of each player, and a window holding marks of a single player
+scores for that player, `WEIGHT_BASE` times more with every mark. Counters,
+scores and threats (windows one mark short of a line, with no opponent mark)
+are updated incrementally when a move is played or taken back, at a cost of
+O(k).
+
+Only empty cells within `radius` of a mark are candidate moves, ordered by
+how much they add to the mover's windows and take from the opponent's ones,
+and only the best `max_candidates` of them are searched. Threats prune them
+further: a player with a threat wins at once, and a player facing threats
+must block them.
+
+A move is chosen in three steps:
+
+1. the win or the only block forced by threats, if any;
+2. a threat-space search for a victory by continuous threats, where every
+   move of the attacker creates a threat and every reply blocks it;
+3. an alpha-beta search with iterative deepening, until the time budget or
+   the maximum depth runs out, keeping the best move of the deepest search
+   completed. Facing several threats, only their blocks are searched.
+
+The search depends on the number of candidates and on k, not on the size of
+the board. Only building the position depends on it, and it counts against
+the time budget, so that move latency stays bounded by the budget.
+"""
+import functools
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from tic_tac_toe_game import mnk
+from tic_tac_toe_game.AI.cache import uncached
+from tic_tac_toe_game.AI.cooperative import checkpoint
+from tic_tac_toe_game.typing import Grid
+
+
+DEFAULT_K = 5
+DEFAULT_TIME_BUDGET = 0.25
+DEFAULT_MAX_DEPTH = 8
+DEFAULT_RADIUS = 2
+DEFAULT_MAX_CANDIDATES = 10
+# Maximal number of threats in a row played by the threat-space search.
+THREAT_DEPTH = 10
+WIN_SCORE = 1 << 40
+# Growth of the score of a window with each mark it holds.
+WEIGHT_BASE = 8
+
+
+class _Timeout(Exception):
+    """Raised when the time budget of a search runs out."""
+
+
+@functools.lru_cache(maxsize=None)
+def _neighborhoods(rows: int, cols: int, radius: int) -> List[Tuple[int, ...]]:
+    """Returns the cells within `radius` rows and columns of every cell."""
+    return [
+        tuple(
+            x * cols + y
+            for x in range(max(0, row - radius), min(rows, row + radius + 1))
+            for y in range(max(0, col - radius), min(cols, col + radius + 1))
+            if (x, y) != (row, col)
+        )
+        for row in range(rows)
+        for col in range(cols)
+    ]
+
+
+class Position:
+    """Board of an m,n,k game with incremental scores, searched in place.
+
+    Attributes:
+        cells: list of int, the mark of every cell in reading order.
+        counts: dict, number of marks of each mark in every window.
+        scores: dict, sum of the weights of the windows of each mark.
+        threats: dict, windows of each mark one mark short of a line.
+        candidates: set of int, empty cells within `radius` of a mark.
+        lines: dict, number of lines completed by each mark.
+    """
+
+    def __init__(self, grid: Grid, k: int, radius: int = DEFAULT_RADIUS) -> None:
+        """Inits the counters of the marks of `grid`."""
+        self.layout = mnk.layout(len(grid), len(grid[0]), k)
+        self.k = k
+        self.weights = [0] + [WEIGHT_BASE**count for count in range(k)]
+        self.neighborhoods = _neighborhoods(self.layout.rows, self.layout.cols, radius)
+        windows = len(self.layout.windows)
+        self.cells = [0] * (self.layout.rows * self.layout.cols)
+        self.counts: Dict[int, List[int]] = {1: [0] * windows, -1: [0] * windows}
+        self.scores = {1: 0, -1: 0}
+        self.threats: Dict[int, Set[int]] = {1: set(), -1: set()}
+        self.candidates: Set[int] = set()
+        self._near = [0] * len(self.cells)
+        self.empty = len(self.cells)
+        self.lines = {1: 0, -1: 0}
+        for row_id, row in enumerate(grid):
+            for col_id, mark in enumerate(row):
+                if mark:
+                    self.play(row_id * self.layout.cols + col_id, mark)
+
+    def play(self, cell: int, mark: int) -> None:
+        """Plays `mark` on the empty `cell`."""
+        own_counts, opp_counts = self.counts[mark], self.counts[-mark]
+        weights, k = self.weights, self.k
+        for window in self.layout.cell_windows[cell]:
+            own, opp = own_counts[window], opp_counts[window]
+            own_counts[window] = own + 1
+            if opp == 0:
+                self.scores[mark] += weights[own + 1] - weights[own]
+                if own + 1 == k - 1:
+                    self.threats[mark].add(window)
+                elif own + 1 == k:
+                    self.threats[mark].discard(window)
+                    self.lines[mark] += 1
+            elif own == 0:
+                self.scores[-mark] -= weights[opp]
+                if opp == k - 1:
+                    self.threats[-mark].discard(window)
+        self.cells[cell] = mark
+        self.empty -= 1
+        self.candidates.discard(cell)
+        for neighbor in self.neighborhoods[cell]:
+            self._near[neighbor] += 1
+            if not self.cells[neighbor]:
+                self.candidates.add(neighbor)
+
+    def undo(self, cell: int) -> None:
+        """Takes back the last move, played on `cell`."""
+        mark = self.cells[cell]
+        own_counts, opp_counts = self.counts[mark], self.counts[-mark]
+        weights, k = self.weights, self.k
+        for window in self.layout.cell_windows[cell]:
+            own, opp = own_counts[window] - 1, opp_counts[window]
+            own_counts[window] = own
+            if opp == 0:
+                self.scores[mark] -= weights[own + 1] - weights[own]
+                if own + 1 == k - 1:
+                    self.threats[mark].discard(window)
+                elif own == k - 1:
+                    self.threats[mark].add(window)
+                    self.lines[mark] -= 1
+            elif own == 0:
+                self.scores[-mark] += weights[opp]
+                if opp == k - 1:
+                    self.threats[-mark].add(window)
+        self.cells[cell] = 0
+        self.empty += 1
+        for neighbor in self.neighborhoods[cell]:
+            self._near[neighbor] -= 1
+            if not self._near[neighbor]:
+                self.candidates.discard(neighbor)
+        if self._near[cell]:
+            self.candidates.add(cell)
+
+    @property
+    def winner(self) -> int:
+        """Returns the mark having completed a line, 0 if none."""
+        if self.lines[1]:
+            return 1
+        return -1 if self.lines[-1] else 0
+
+    def threat_cells(self, mark: int) -> Set[int]:
+        """Returns the empty cells completing a line of `mark`."""
+        windows = self.layout.windows
+        return {
+            cell
+            for window in self.threats[mark]
+            for cell in windows[window]
+            if not self.cells[cell]
+        }
+
+    def gain(self, cell: int, mark: int) -> int:
+        """Returns the score `mark` gains and takes from its opponent on `cell`."""
+        own_counts, opp_counts = self.counts[mark], self.counts[-mark]
+        weights = self.weights
+        total = 0
+        for window in self.layout.cell_windows[cell]:
+            own, opp = own_counts[window], opp_counts[window]
+            if opp == 0:
+                total += weights[own + 1] - weights[own]
+            elif own == 0:
+                total += weights[opp]
+        return total
+
+    def moves(self, mark: int, max_candidates: int) -> List[int]:
+        """Returns the moves to search for `mark`, best first.
+
+        A win is the only move searched, then the blocks of the opponent's
+        threats, then the best candidates, blocks and candidates being ranked
+        by `gain`.
+        """
+        wins = self.threat_cells(mark)
+        if wins:
+            return [min(wins)]
+        blocks = self.threat_cells(-mark)
+        if blocks:
+            return self._ranked(blocks, mark)
+        if not self.candidates:  # no mark yet, the center is the best start
+            return [self.layout.rows // 2 * self.layout.cols + self.layout.cols // 2]
+        return self._ranked(self.candidates, mark)[:max_candidates]
+
+    def _ranked(self, cells: Set[int], mark: int) -> List[int]:
+        """Returns `cells` by decreasing gain for `mark`, then index."""
+        return sorted(cells, key=lambda cell: (-self.gain(cell, mark), cell))
+
+    def evaluate(self, mark: int) -> int:
+        """Scores the position for `mark`, to move."""
+        return self.scores[mark] - self.scores[-mark]
+
+
+class Search:
+    """Alpha-beta and threat-space searches of a position under a deadline."""
+
+    def __init__(
+        self, position: Position, deadline: float, max_candidates: int
+    ) -> None:
+        """Inits a search of `position` ending at `deadline`, a perf_counter time."""
+        self.position = position
+        self.deadline = deadline
+        self.max_candidates = max_candidates
+        self.nodes = 0
+
+    def _tick(self) -> None:
+        """Counts a node, raising `_Timeout` once past the deadline."""
+        checkpoint()
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise _Timeout
+
+    def negamax(self, mark: int, depth: int, alpha: int, beta: int) -> int:
+        """Returns the score of the position for `mark`, to move."""
+        self._tick()
+        position = self.position
+        if position.winner:
+            return -WIN_SCORE * (1 + depth)  # quicker wins score higher
+        if not position.empty:
+            return 0
+        if depth == 0:
+            return position.evaluate(mark)
+        best = -WIN_SCORE * (2 + depth)
+        for cell in position.moves(mark, self.max_candidates):
+            position.play(cell, mark)
+            try:
+                score = -self.negamax(-mark, depth - 1, -beta, -alpha)
+            finally:
+                position.undo(cell)
+            if score > best:
+                best = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best
+
+    def root(self, mark: int, depth: int, moves: List[int]) -> List[Tuple[int, int]]:
+        """Returns the scores of `moves` searched at `depth`, best first."""
+        scored = []
+        alpha = -WIN_SCORE * (2 + depth)
+        for cell in moves:
+            self.position.play(cell, mark)
+            try:
+                score = -self.negamax(
+                    -mark, depth - 1, -WIN_SCORE * (2 + depth), -alpha
+                )
+            finally:
+                self.position.undo(cell)
+            alpha = max(alpha, score)
+            scored.append((score, cell))
+        # Moves cut off by alpha only have upper bounds: stable sort keeps the
+        # best move of this depth first.
+        scored.sort(key=lambda item: -item[0])
+        return scored
+
+    def threat_space(self, mark: int, depth: int = THREAT_DEPTH) -> Optional[int]:
+        """Returns the first move of a victory of `mark` by continuous threats.
+
+        Every move of `mark` creates a threat, answered by its only block; a
+        move creating two threats wins. Sequences where the defender threatens
+        back are given up.
+        """
+        self._tick()
+        position = self.position
+        if depth == 0 or position.threats[-mark]:
+            return None
+        k = self.position.k
+        counts, opp_counts = position.counts[mark], position.counts[-mark]
+        cell_windows = position.layout.cell_windows
+        for cell in sorted(position.candidates):
+            if not any(
+                counts[window] == k - 2 and not opp_counts[window]
+                for window in cell_windows[cell]
+            ):
+                continue
+            position.play(cell, mark)
+            try:
+                blocks = position.threat_cells(mark)
+                if len(blocks) > 1:
+                    return cell
+                (block,) = blocks
+                position.play(block, -mark)
+                try:
+                    if (
+                        not position.winner
+                        and self.threat_space(mark, depth - 1) is not None
+                    ):
+                        return cell
+                finally:
+                    position.undo(block)
+            finally:
+                position.undo(cell)
+        return None
+
+
+def choose_move(
+    position: Position,
+    mark: int,
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_candidates: int = DEFAULT_MAX_CANDIDATES,
+    start: Optional[float] = None,
+) -> int:
+    """Returns the cell index played by `mark` on `position`.
+
+    Args:
+        position: Position, the position to play, left unchanged.
+        mark: int, mark of the player to move.
+        time_budget: float, seconds to search, None for no limit.
+        max_depth: int, depth of the deepest alpha-beta search.
+        max_candidates: int, number of candidate moves searched per node.
+        start: float, perf_counter time the budget counts from, defaults to
+            now.
+
+    Returns:
+        The cell index of the move.
+
+    Raises:
+        IndexError: if the board is full.
+    """
+    if not position.empty:
+        raise IndexError("Grid is full, cannot choose an available cell")
+    moves = position.moves(mark, max_candidates)
+    if len(moves) == 1 or position.threats[mark]:
+        return moves[0]  # forced
+    deadline = float("inf")
+    if time_budget is not None:
+        deadline = (time.perf_counter() if start is None else start) + time_budget
+    search = Search(position, deadline, max_candidates)
+    try:
+        winning = search.threat_space(mark)
+        if winning is not None:
+            return winning
+        for depth in range(1, min(max_depth, position.empty) + 1):
+            scored = search.root(mark, depth, moves)
+            moves = [cell for _, cell in scored]
+            if scored[0][0] >= WIN_SCORE:
+                break
+    except _Timeout:
+        pass
+    return moves[0]
+
+
+@uncached
+def threat_move(
+    grid: Grid,
+    mark: int,
+    k: Optional[int] = None,
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    radius: int = DEFAULT_RADIUS,
+    max_candidates: int = DEFAULT_MAX_CANDIDATES,
+) -> Tuple[int, int]:
+    """Computes best move on a board of any size, see the module docstring.
+
+    Args:
+        grid: list of lists, the position, of any number of rows and columns.
+        mark: int, mark of the player to move.
+        k: int, number of marks in a row needed to win, defaults to
+            `DEFAULT_K` or the largest side of smaller boards.
+        time_budget: float, seconds to answer, None to only stop at
+            `max_depth`. Building the position counts against it, and so
+            does the layout of the board size on its first use.
+        max_depth: int, depth of the deepest alpha-beta search.
+        radius: int, distance to the marks of the candidate moves.
+        max_candidates: int, number of candidate moves searched per node.
+
+    Returns:
+        The coordinates of the move.
+    """
+    if k is None:
+        k = min(DEFAULT_K, max(len(grid), len(grid[0])))
+    start = time.perf_counter()
+    position = Position(grid, k, radius)
+    cell = choose_move(position, mark, time_budget, max_depth, max_candidates, start)
+    return divmod(cell, position.layout.cols)
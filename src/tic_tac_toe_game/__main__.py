@@ -1,13 +1,29 @@
 """Command-line interface."""
+from pathlib import Path
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Tuple
+
 import click
 
 from tic_tac_toe_game import engine
 
 
-@click.command()
+if TYPE_CHECKING:  # pragma: no cover
+    from tic_tac_toe_game.dataset import FORMAT
+
+
+@click.group(invoke_without_command=True)
 @click.version_option()
-def main() -> None:
+@click.pass_context
+def main(context: click.Context) -> None:
     """Tic Tac Toe Game."""
+    if context.invoked_subcommand is None:
+        play()
+
+
+def play() -> None:
+    """Plays a game in the terminal."""
     click.secho("hello", fg="green")
     if click.confirm("Do you want to play a game?", abort=True):
         click.echo("Let's play a game...")
@@ -60,5 +76,217 @@ def main() -> None:
             game.players_match.switch()
 
 
+@main.command()
+@click.option(
+    "--entrant",
+    "entrants",
+    multiple=True,
+    help="Strategy name or difficulty level, repeatable. Defaults to every "
+    "registered strategy made for 3*3 boards.",
+)
+@click.option("--games", default=10, show_default=True, help="Games per pairing.")
+@click.option("--workers", default=1, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "--cache-size",
+    default=0,
+    show_default=True,
+    help="Move cache size of each worker, 0 to time uncached moves.",
+)
+@click.option("--json", "json_path", type=click.Path(path_type=Path))
+@click.option("--csv", "csv_directory", type=click.Path(path_type=Path))
+def arena(
+    entrants: Tuple[str, ...],
+    games: int,
+    workers: int,
+    seed: int,
+    cache_size: int,
+    json_path: Optional[Path],
+    csv_directory: Optional[Path],
+) -> None:
+    """Plays AI strategies against each other and rates them."""
+    from tic_tac_toe_game import arena as arena_
+
+    try:
+        records = arena_.run(
+            entrants or arena_.default_entrants(), games, workers, seed, cache_size
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--entrant") from None
+    summary = arena_.report(records)
+    click.echo(arena_.format_table(summary))
+    if json_path is not None:
+        arena_.write_json(summary, json_path)
+    if csv_directory is not None:
+        arena_.write_csv(summary, csv_directory)
+
+
+@main.command()
+@click.option("--games", default=1_000_000, show_default=True)
+@click.option(
+    "--x",
+    "policy_x",
+    default="random",
+    show_default=True,
+    help="Policy of X: random or oracle.",
+)
+@click.option(
+    "--o",
+    "policy_o",
+    default="random",
+    show_default=True,
+    help="Policy of O: random or oracle.",
+)
+@click.option("--x-epsilon", default=0.0, show_default=True)
+@click.option("--o-epsilon", default=0.0, show_default=True)
+@click.option("--chunk-size", default=1 << 18, show_default=True)
+@click.option("--workers", default=1, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory of the game shards.",
+)
+@click.option("--json", "json_path", type=click.Path(path_type=Path))
+def simulate(
+    games: int,
+    policy_x: str,
+    policy_o: str,
+    x_epsilon: float,
+    o_epsilon: float,
+    chunk_size: int,
+    workers: int,
+    seed: int,
+    output: Optional[Path],
+    json_path: Optional[Path],
+) -> None:
+    """Plays batched self-play games and prints their statistics."""
+    import json
+
+    from tic_tac_toe_game import selfplay
+
+    try:
+        summary = selfplay.simulate(
+            games,
+            selfplay.PolicySpec(policy_x, x_epsilon),
+            selfplay.PolicySpec(policy_o, o_epsilon),
+            chunk_size,
+            seed,
+            workers,
+            output,
+        ).to_dict()
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--x/--o") from None
+    click.echo(
+        f"{summary['games']} games: X won {summary['x_wins']}, "
+        f"{summary['draws']} ties, O won {summary['o_wins']}, "
+        f"{summary['mean_length']:.2f} moves on average"
+    )
+    if json_path is not None:
+        json_path.write_text(json.dumps(summary, indent=2))
+
+
+@main.command()
+@click.option("--games", default=10_000, show_default=True)
+@click.option(
+    "--x",
+    "player_x",
+    default="easy",
+    show_default=True,
+    help="Strategy name or difficulty level of X.",
+)
+@click.option(
+    "--o",
+    "player_o",
+    default="easy",
+    show_default=True,
+    help="Strategy name or difficulty level of O.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["memmap", "npz"]),
+    default="memmap",
+    show_default=True,
+)
+@click.option("--block-size", default=256, show_default=True, help="Games per task.")
+@click.option(
+    "--shard-size", default=1 << 20, show_default=True, help="Records per npz shard."
+)
+@click.option("--workers", default=1, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory of the dataset.",
+)
+def dataset(
+    games: int,
+    player_x: str,
+    player_o: str,
+    output_format: "FORMAT",
+    block_size: int,
+    shard_size: int,
+    workers: int,
+    seed: int,
+    output: Path,
+) -> None:
+    """Writes (position, mark, move, outcome) records of self-play games."""
+    from tic_tac_toe_game import dataset as dataset_
+
+    try:
+        count = dataset_.generate(
+            output,
+            player_x,
+            player_o,
+            games,
+            output_format,
+            workers,
+            block_size,
+            shard_size,
+            seed,
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--x/--o") from None
+    click.echo(f"{count} records of {games} games written to {output}")
+
+
+@main.command()
+@click.option("--games", default=1_000_000, show_default=True)
+@click.option("--chunk-size", default=4096, show_default=True)
+@click.option("--alpha", default=0.5, show_default=True, help="Learning rate.")
+@click.option(
+    "--epsilon", default=0.3, show_default=True, help="Exploration while training."
+)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Table file, defaults to the one played by learned_move.",
+)
+def train(
+    games: int,
+    chunk_size: int,
+    alpha: float,
+    epsilon: float,
+    seed: int,
+    output: Optional[Path],
+) -> None:
+    """Trains the action values of the learned_move strategy by self-play."""
+    from tic_tac_toe_game.AI import learned
+
+    path = output if output is not None else learned.TABLE_PATH
+    learned.write_table(
+        path,
+        games=games,
+        chunk_size=chunk_size,
+        alpha=alpha,
+        epsilon=epsilon,
+        seed=seed,
+    )
+    click.echo(f"Action values of {games} games written to {path}")
+
+
 if __name__ == "__main__":
     main(prog_name="tic-tac-toe-game")  # pragma: no cover
@@ -0,0 +1,271 @@
+"""Tournaments between AI strategies.
+
+Every entrant plays `games` games against every other entrant with each mark,
+as `engine.AIPlayer` instances of a `engine.TicTacToeGame`. Games are spread
+over a process pool. The move cache is sized per worker process, disabled by
+default so that move latencies measure the strategies and not cache lookups.
+For the same reason, searches start cold: the negamax transposition table is
+cleared before every move, and the MCTS trees kept between turns before every
+game, so that no entrant is timed on work done for another one.
+
+Entrants are registered strategy names (see `strategies.STRATEGIES`) or
+difficulty levels (see `strategies.PRESETS`). The default field leaves out
+`LARGE_BOARD_STRATEGIES`, built for m,n,k games and slower than the others on
+the 3*3 boards of the arena. The report holds the
+win/draw/loss table of every pairing, Elo ratings fitted on all games and
+percentiles of the time spent per move by each entrant.
+"""
+import csv
+import itertools
+import json
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import mcts
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import strategies
+
+
+BASE_RATING = 1500.0
+# Strategies searching large boards, see `default_entrants`.
+LARGE_BOARD_STRATEGIES = ("threat_move",)
+LATENCY_PERCENTILES = (50, 90, 99)
+# Fixed-point iterations of the rating fit, see `elo_ratings`.
+_RATING_ITERATIONS = 500
+
+
+class GameTask(NamedTuple):
+    """Game to play between two entrants, seeding the players from `seed`."""
+
+    player_x: str
+    player_o: str
+    seed: int
+
+
+class GameRecord(NamedTuple):
+    """Outcome of a game and time spent on each move, in seconds, by mark."""
+
+    player_x: str
+    player_o: str
+    winner: int  # mark of the winner, 0 for a tie
+    latencies: Dict[int, List[float]]
+
+
+def play_game(task: GameTask) -> GameRecord:
+    """Plays the game `task` to the end and times every move, starting cold."""
+    players = engine.PlayersMatch(
+        engine.AIPlayer(
+            1, task.player_x, strategies.resolve(task.player_x), seed=task.seed
+        ),
+        engine.AIPlayer(
+            -1, task.player_o, strategies.resolve(task.player_o), seed=task.seed + 1
+        ),
+    )
+    game = engine.TicTacToeGame(players, engine.BitBoard())
+    latencies: Dict[int, List[float]] = {1: [], -1: []}
+    mcts.clear_trees()
+    while not game.board.is_over():
+        mark = players.current().get_mark()
+        negamax.clear_transpositions()
+        start = time.perf_counter()
+        move = game.get_move()
+        latencies[mark].append(time.perf_counter() - start)
+        if move is None:
+            raise RuntimeError(f"{players.current().name} did not play")
+        game.board.make_move(engine.Move(*move, mark))
+        players.switch()
+    return GameRecord(task.player_x, task.player_o, game.board.winner() or 0, latencies)
+
+
+def default_entrants() -> List[str]:
+    """Returns the registered strategies but `LARGE_BOARD_STRATEGIES`."""
+    return [name for name in strategies.names() if name not in LARGE_BOARD_STRATEGIES]
+
+
+def schedule(entrants: Sequence[str], games: int, seed: int) -> List[GameTask]:
+    """Returns `games` games for every ordered pair of distinct entrants."""
+    rng = random.Random(seed)  # noqa: S311
+    return [
+        GameTask(player_x, player_o, rng.randrange(2**32))
+        for player_x, player_o in itertools.permutations(entrants, 2)
+        for _ in range(games)
+    ]
+
+
+def run(
+    entrants: Sequence[str],
+    games: int,
+    workers: int = 1,
+    seed: int = 0,
+    cache_size: int = 0,
+) -> List[GameRecord]:
+    """Plays the tournament between `entrants` in `workers` processes.
+
+    Args:
+        entrants: list of str, difficulty levels or registered strategy names.
+        games: int, number of games per pair of entrants and per mark.
+        workers: int, number of worker processes.
+        seed: int, seed of the players of every game.
+        cache_size: int, size of the move cache of each worker, 0 to disable it.
+
+    Returns:
+        The records of the games, in schedule order.
+
+    Raises:
+        ValueError: if an entrant is unknown or less than 2 entrants are given.
+    """
+    if len(set(entrants)) < 2:
+        raise ValueError("An arena needs at least 2 distinct entrants")
+    for entrant in entrants:
+        strategies.resolve(entrant)
+    tasks = schedule(list(dict.fromkeys(entrants)), games, seed)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=cache.configure, initargs=(cache_size,)
+    ) as pool:
+        return list(pool.map(play_game, tasks, chunksize=max(1, games // 4)))
+
+
+def _scores(records: Iterable[GameRecord]) -> Dict[Tuple[str, str], List[float]]:
+    """Returns the points scored and games played by each entrant against each other."""
+    scores: Dict[Tuple[str, str], List[float]] = {}
+    for record in records:
+        x_points = (1 + record.winner) / 2
+        for player, opponent, points in (
+            (record.player_x, record.player_o, x_points),
+            (record.player_o, record.player_x, 1 - x_points),
+        ):
+            entry = scores.setdefault((player, opponent), [0.0, 0])
+            entry[0] += points
+            entry[1] += 1
+    return scores
+
+
+def elo_ratings(records: Iterable[GameRecord]) -> Dict[str, float]:
+    """Returns the Elo ratings best explaining the outcomes of `records`.
+
+    The ratings are the maximum likelihood estimate of the Bradley-Terry model,
+    ties counting as half a win, computed by minorization-maximization. Each
+    entrant is credited with a virtual tie against a player rated
+    `BASE_RATING`, which keeps the ratings of unbeaten and winless entrants
+    finite.
+    """
+    scores = _scores(records)
+    entrants = sorted({player for player, _ in scores})
+    strengths = {entrant: 1.0 for entrant in entrants}
+    for _ in range(_RATING_ITERATIONS):
+        for entrant in entrants:
+            points = 0.5
+            weight = 1 / (strengths[entrant] + 1)
+            for (player, opponent), (won, played) in scores.items():
+                if player == entrant:
+                    points += won
+                    weight += played / (strengths[entrant] + strengths[opponent])
+            strengths[entrant] = points / weight
+    return {
+        entrant: BASE_RATING + 400 * math.log10(strength)
+        for entrant, strength in strengths.items()
+    }
+
+
+def percentile(values: Sequence[float], rank: float) -> float:
+    """Returns the `rank`-th percentile of `values`, interpolating linearly."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * rank / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def report(records: Sequence[GameRecord]) -> Dict[str, Any]:
+    """Summarizes the records of a tournament.
+
+    Args:
+        records: list of GameRecord, the games of the tournament.
+
+    Returns:
+        A JSON-serializable dictionary with the rating, record and move
+        latencies in milliseconds of every entrant under "players", best rated
+        first, and the outcomes of every pairing under "pairings".
+    """
+    ratings = elo_ratings(records)
+    pairings: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    totals = {entrant: {"wins": 0, "draws": 0, "losses": 0} for entrant in ratings}
+    latencies: Dict[str, List[float]] = {entrant: [] for entrant in ratings}
+    for record in records:
+        pairing = pairings.setdefault(
+            (record.player_x, record.player_o),
+            dict(
+                player_x=record.player_x,
+                player_o=record.player_o,
+                games=0,
+                x_wins=0,
+                draws=0,
+                o_wins=0,
+            ),
+        )
+        pairing["games"] += 1
+        outcome = {1: "x_wins", 0: "draws", -1: "o_wins"}[record.winner]
+        pairing[outcome] += 1
+        for mark, player in ((1, record.player_x), (-1, record.player_o)):
+            latencies[player].extend(record.latencies[mark])
+            result = {0: "draws", mark: "wins", -mark: "losses"}[record.winner]
+            totals[player][result] += 1
+    players = [
+        dict(
+            name=entrant,
+            elo=round(ratings[entrant], 1),
+            games=sum(totals[entrant].values()),
+            **totals[entrant],
+            moves=len(latencies[entrant]),
+            **{
+                f"p{rank}_ms": round(percentile(latencies[entrant], rank) * 1000, 3)
+                for rank in LATENCY_PERCENTILES
+            },
+            max_ms=round(max(latencies[entrant]) * 1000, 3),
+        )
+        for entrant in sorted(ratings, key=ratings.__getitem__, reverse=True)
+    ]
+    return dict(players=players, pairings=list(pairings.values()))
+
+
+def write_json(summary: Dict[str, Any], path: Path) -> None:
+    """Writes the summary of a tournament to `path`, see `report`."""
+    path.write_text(json.dumps(summary, indent=2))
+
+
+def write_csv(summary: Dict[str, Any], directory: Path) -> None:
+    """Writes players.csv and pairings.csv in `directory`, see `report`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for table in ("players", "pairings"):
+        rows = summary[table]
+        with directory.joinpath(f"{table}.csv").open("w", newline="") as stream:
+            writer = csv.DictWriter(stream, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def format_table(summary: Dict[str, Any], columns: Optional[List[str]] = None) -> str:
+    """Returns the players of a tournament summary as an aligned text table."""
+    columns = columns or ["name", "elo", "wins", "draws", "losses", "p50_ms", "p99_ms"]
+    rows = [columns]
+    rows += [
+        [str(player[column]) for column in columns] for player in summary["players"]
+    ]
+    widths = [max(len(row[index]) for row in rows) for index in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.ljust(widths[index]) for index, cell in enumerate(row))
+        for row in rows
+    )
@@ -0,0 +1,191 @@
+"""Vectorized operations on many 3*3 boards at once.
+
+`BoardBatch` holds N boards as the rows of an (N, 9) int8 array, cells in the
+reading order of the `bitboard` module and marks as in `engine.Board`: 1 for
+"X", -1 for "O" and 0 for an empty cell. Winners, terminal flags and legal
+moves of every board are computed with a few NumPy operations: each row is
+packed into the two 9-bit masks of its marks, which index tables precomputed
+for the 512 possible masks.
+"""
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Type
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game import engine
+
+
+CELLS = bb.SIZE * bb.SIZE
+
+# Value of each cell in a 9-bit mask.
+CELL_BITS: npt.NDArray[np.uint16] = (1 << np.arange(CELLS)).astype(np.uint16)
+
+# HAS_LINE[mask] tells whether the cells of `mask` complete a win line.
+HAS_LINE: npt.NDArray[np.bool_] = np.array(
+    [bb.has_line(mask) for mask in range(bb.FULL_MASK + 1)]
+)
+
+# MASK_CELLS[mask] is the (9,) boolean row of the cells set in `mask`.
+MASK_CELLS: npt.NDArray[np.bool_] = (
+    np.arange(bb.FULL_MASK + 1)[:, None] >> np.arange(CELLS) & 1
+).astype(bool)
+
+Moves = Union[int, Sequence[int], npt.NDArray[np.integer]]
+
+
+class BoardBatch:
+    """Batch of boards backed by an (N, 9) int8 array.
+
+    Attributes:
+        cells: numpy.ndarray, one board per row, see the module docstring.
+    """
+
+    def __init__(self, cells: npt.ArrayLike) -> None:
+        """Wraps `cells`, an (N, 9) array of marks, without copying int8 arrays.
+
+        Args:
+            cells: array-like of shape (N, 9), one board per row.
+
+        Raises:
+            ValueError: if `cells` does not hold rows of 9 cells.
+        """
+        self.cells: npt.NDArray[np.int8] = np.asarray(cells, dtype=np.int8)
+        if self.cells.ndim != 2 or self.cells.shape[1] != CELLS:
+            raise ValueError(f"Expected an (N, {CELLS}) array, got {self.cells.shape}")
+
+    @classmethod
+    def empty(cls, size: int) -> "BoardBatch":
+        """Returns a batch of `size` empty boards."""
+        return cls(np.zeros((size, CELLS), dtype=np.int8))
+
+    @classmethod
+    def from_bits(cls, x_bits: npt.ArrayLike, o_bits: npt.ArrayLike) -> "BoardBatch":
+        """Returns the boards of the X and O bitboards of `x_bits` and `o_bits`."""
+        x_cells = MASK_CELLS[np.asarray(x_bits, dtype=np.intp)]
+        o_cells = MASK_CELLS[np.asarray(o_bits, dtype=np.intp)]
+        return cls(x_cells.astype(np.int8) - o_cells.astype(np.int8))
+
+    @classmethod
+    def from_boards(cls, boards: Sequence[engine.Board]) -> "BoardBatch":
+        """Returns a batch holding the positions of `boards`."""
+        return cls(np.array([board.grid for board in boards]).reshape(-1, CELLS))
+
+    def to_boards(
+        self, board_class: Type[engine.Board] = engine.BitBoard
+    ) -> List[engine.Board]:
+        """Returns a board of `board_class` for every position of the batch.
+
+        Boards need a move history to find their winner: it is rebuilt with
+        the marks alternating from "X", the last move completing a win line
+        of the winner if any. It is a legal history of the position, not
+        necessarily the one played.
+        """
+        return [
+            board_class(bb.to_grid(x_mask, o_mask), _history(x_mask, o_mask))
+            for x_mask, o_mask in np.stack([self.x_bits(), self.o_bits()], 1).tolist()
+        ]
+
+    def __len__(self) -> int:
+        """Returns the number of boards."""
+        return len(self.cells)
+
+    def __getitem__(self, index: Union[int, slice, npt.ArrayLike]) -> "BoardBatch":
+        """Returns the boards selected by `index`, as a batch."""
+        cells = self.cells[index]
+        return BoardBatch(cells[None] if cells.ndim == 1 else cells)
+
+    def copy(self) -> "BoardBatch":
+        """Returns a batch holding a copy of the boards."""
+        return BoardBatch(self.cells.copy())
+
+    def bits(self, mark: int) -> npt.NDArray[np.uint16]:
+        """Returns the 9-bit masks of the cells holding `mark`, one per board."""
+        packed: npt.NDArray[np.uint16] = (self.cells == mark) @ CELL_BITS
+        return packed
+
+    def x_bits(self) -> npt.NDArray[np.uint16]:
+        """Returns the X bitboards."""
+        return self.bits(engine.Board.x)
+
+    def o_bits(self) -> npt.NDArray[np.uint16]:
+        """Returns the O bitboards."""
+        return self.bits(engine.Board.o)
+
+    def winners(self) -> npt.NDArray[np.int8]:
+        """Returns the mark completing a win line on each board, 0 if none."""
+        x_won = HAS_LINE[self.x_bits()]
+        o_won = HAS_LINE[self.o_bits()]
+        return x_won.astype(np.int8) - o_won.astype(np.int8)
+
+    def is_full(self) -> npt.NDArray[np.bool_]:
+        """Returns which boards have no empty cell left."""
+        full: npt.NDArray[np.bool_] = (self.cells != 0).all(axis=1)
+        return full
+
+    def is_terminal(self) -> npt.NDArray[np.bool_]:
+        """Returns which games are over, won or tied."""
+        terminal: npt.NDArray[np.bool_] = (self.winners() != 0) | self.is_full()
+        return terminal
+
+    def to_move(self) -> npt.NDArray[np.int8]:
+        """Returns the mark of the player to move on each board, "X" first."""
+        balance = self.cells.sum(axis=1, dtype=np.int8)
+        return np.where(balance > 0, engine.Board.o, engine.Board.x).astype(np.int8)
+
+    def legal_moves(self) -> npt.NDArray[np.bool_]:
+        """Returns the (N, 9) mask of legal moves, empty for finished games."""
+        legal: npt.NDArray[np.bool_] = (self.cells == 0) & ~self.is_terminal()[:, None]
+        return legal
+
+    def play(self, moves: Moves, marks: Optional[npt.ArrayLike] = None) -> None:
+        """Plays a move on every board, in place.
+
+        Args:
+            moves: int or array of N ints, cell index played on each board, -1
+                to leave a board unchanged.
+            marks: int or array of N ints, mark played on each board, defaults
+                to the player to move.
+
+        Raises:
+            ValueError: if a move is out of the board or on an occupied cell.
+        """
+        moves = np.broadcast_to(np.asarray(moves, dtype=np.intp), (len(self),))
+        marks = self.to_move() if marks is None else marks
+        marks = np.broadcast_to(np.asarray(marks, dtype=np.int8), (len(self),))
+        playing = np.flatnonzero(moves != -1)
+        cells = moves[playing]
+        if ((cells < 0) | (cells >= CELLS)).any():
+            raise ValueError("Moves must be cell indices between 0 and 8, or -1")
+        if (self.cells[playing, cells] != 0).any():
+            raise ValueError("Moves must be played on empty cells")
+        self.cells[playing, cells] = marks[playing]
+
+
+def _history(x_mask: int, o_mask: int) -> List[engine.Move]:
+    """Returns a move history leading to the position of `x_mask` and `o_mask`."""
+    x_cells, o_cells = (_move_order(mask) for mask in (x_mask, o_mask))
+    history = []
+    for turn in range(len(x_cells)):
+        history.append(engine.Move(*bb.cell_coordinates(x_cells[turn]), engine.Board.x))
+        if turn < len(o_cells):
+            history.append(
+                engine.Move(*bb.cell_coordinates(o_cells[turn]), engine.Board.o)
+            )
+    return history
+
+
+def _move_order(mask: int) -> List[int]:
+    """Returns the cells of `mask`, a cell of its first win line last if any."""
+    cells = list(bb.iter_cells(mask))
+    for line in bb.WIN_MASKS:
+        if mask & line == line:
+            last = next(bb.iter_cells(line))
+            cells.remove(last)
+            cells.append(last)
+            break
+    return cells
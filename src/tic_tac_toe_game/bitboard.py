@@ -0,0 +1,94 @@
+"""Bitboard primitives for the 3*3 grid.
+
+A position is held as two 9-bit integers, one per mark. Cell `(x, y)` maps to
+bit `3 * x + y`, so the first row uses the three lowest bits:
+
+    0 1 2
+    3 4 5
+    6 7 8
+"""
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+SIZE = 3
+FULL_MASK = 0b111_111_111
+
+ROW_MASKS = tuple(0b111 << (SIZE * row) for row in range(SIZE))
+COL_MASKS = tuple(0b001_001_001 << col for col in range(SIZE))
+DIAG_MASKS = (0b100_010_001, 0b001_010_100)
+WIN_MASKS: Tuple[int, ...] = ROW_MASKS + COL_MASKS + DIAG_MASKS
+
+# Win masks going through each cell, indexed by cell index.
+CELL_WIN_MASKS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(mask for mask in WIN_MASKS if mask & (1 << index))
+    for index in range(SIZE * SIZE)
+)
+
+
+def cell_index(coord: Coordinates) -> int:
+    """Returns the bit index of the cell located at `coord`."""
+    return SIZE * coord[0] + coord[1]
+
+
+def cell_coordinates(index: int) -> Coordinates:
+    """Returns the coordinates of the cell stored at bit `index`."""
+    row, col = divmod(index, SIZE)
+    return row, col
+
+
+def has_line(bits: int) -> bool:
+    """Checks if `bits` contains at least one complete win line."""
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def has_line_through(bits: int, index: int) -> bool:
+    """Checks if `bits` completes a win line going through cell `index`."""
+    for mask in CELL_WIN_MASKS[index]:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def free_cells(x_bits: int, o_bits: int) -> int:
+    """Returns the mask of empty cells."""
+    return ~(x_bits | o_bits) & FULL_MASK
+
+
+def iter_cells(mask: int) -> Iterator[int]:
+    """Yields the index of every set bit of `mask`, lowest first."""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def from_grid(grid: Grid) -> Tuple[int, int]:
+    """Loads the X and O bitboards from a grid."""
+    x_bits = o_bits = 0
+    for row_id, row in enumerate(grid):
+        for col_id, cell in enumerate(row):
+            if cell == 1:
+                x_bits |= 1 << (SIZE * row_id + col_id)
+            elif cell == -1:
+                o_bits |= 1 << (SIZE * row_id + col_id)
+    return x_bits, o_bits
+
+
+def to_grid(x_bits: int, o_bits: int) -> Grid:
+    """Dumps the X and O bitboards to a grid."""
+    grid: List[List[int]] = []
+    for row_id in range(SIZE):
+        row = []
+        for col_id in range(SIZE):
+            bit = 1 << (SIZE * row_id + col_id)
+            row.append(1 if x_bits & bit else -1 if o_bits & bit else 0)
+        grid.append(row)
+    return grid
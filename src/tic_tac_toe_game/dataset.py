@@ -0,0 +1,262 @@
+"""Self-play datasets of (position, side to move, move, outcome) records.
+
+Games between two strategies (see `strategies.resolve`) are played by a pool
+of producer processes, each returning the records of a block of games. The
+calling process is the single writer: it appends the blocks to the output as
+they come, keeping a bounded number of blocks in flight, so memory does not
+grow with the size of the dataset.
+
+Two output formats are supported:
+
+- "memmap": a single `records.bin` file of `RECORD` rows, preallocated for the
+  longest possible games, memory-mapped while writing and truncated to the
+  records written, with the dtype and count in `records.json`;
+- "npz": `records-<shard>.npz` shards of `shard_size` records, buffered in a
+  preallocated array.
+
+`load` reads both formats back block by block, memory-mapping the records
+file and reading one shard at a time, so that reading a dataset does not need
+more memory than writing it either.
+"""
+import json
+import random
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterator
+from typing import Literal
+from typing import NamedTuple
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import strategies
+
+
+# Cells before the move, mark of the player to move, cell index played and
+# mark of the winner of the game, 0 for a tie.
+RECORD = np.dtype(
+    [("cells", "i1", (bb.SIZE**2,)), ("mark", "i1"), ("move", "i1"), ("winner", "i1")]
+)
+MAX_MOVES = bb.SIZE**2
+DEFAULT_SHARD_SIZE = 1 << 20
+FORMAT = Literal["memmap", "npz"]
+
+
+class BlockTask(NamedTuple):
+    """Block of games to play in a producer process."""
+
+    player_x: str
+    player_o: str
+    games: int
+    seed: int
+
+
+def play_block(task: BlockTask) -> npt.NDArray[Any]:
+    """Plays the games of `task` and returns their records, game after game."""
+    rng = random.Random(task.seed)  # noqa: S311
+    records = np.zeros(task.games * MAX_MOVES, dtype=RECORD)
+    count = 0
+    for _ in range(task.games):
+        players = engine.PlayersMatch(
+            engine.AIPlayer(
+                1,
+                task.player_x,
+                strategies.resolve(task.player_x),
+                seed=rng.randrange(2**32),
+            ),
+            engine.AIPlayer(
+                -1,
+                task.player_o,
+                strategies.resolve(task.player_o),
+                seed=rng.randrange(2**32),
+            ),
+        )
+        game = engine.TicTacToeGame(players, engine.BitBoard())
+        start = count
+        while not game.board.is_over():
+            mark = players.current().get_mark()
+            move = game.get_move()
+            if move is None:
+                raise RuntimeError(f"{players.current().name} did not play")
+            record = records[count]
+            record["cells"] = np.ravel(game.board.grid)
+            record["mark"] = mark
+            record["move"] = bb.cell_index(move)
+            count += 1
+            game.board.make_move(engine.Move(*move, mark))
+            players.switch()
+        records["winner"][start:count] = game.board.winner() or 0
+    return records[:count]
+
+
+class MemmapWriter:
+    """Appends records to a preallocated, memory-mapped `records.bin` file."""
+
+    def __init__(self, directory: Path, capacity: int) -> None:
+        """Preallocates room for `capacity` records in `directory`."""
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.count = 0
+        self._records = np.memmap(
+            directory.joinpath("records.bin"),
+            dtype=RECORD,
+            mode="w+",
+            shape=(max(capacity, 1),),
+        )
+
+    def write(self, records: npt.NDArray[Any]) -> None:
+        """Appends `records`."""
+        self._records[self.count : self.count + len(records)] = records
+        self.count += len(records)
+
+    def close(self) -> None:
+        """Flushes the records, drops the unused room and writes the metadata."""
+        self._records.flush()
+        del self._records
+        path = self.directory.joinpath("records.bin")
+        with path.open("r+b") as records_file:
+            records_file.truncate(self.count * RECORD.itemsize)
+        metadata = {"dtype": RECORD.descr, "count": self.count}
+        self.directory.joinpath("records.json").write_text(json.dumps(metadata))
+
+
+class ShardWriter:
+    """Buffers records into `records-<shard>.npz` shards of a fixed size."""
+
+    def __init__(self, directory: Path, shard_size: int = DEFAULT_SHARD_SIZE) -> None:
+        """Inits an empty buffer of `shard_size` records, writing to `directory`."""
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.count = 0
+        self.shards = 0
+        self._buffer = np.zeros(shard_size, dtype=RECORD)
+        self._buffered = 0
+
+    def write(self, records: npt.NDArray[Any]) -> None:
+        """Appends `records`, writing every shard filled."""
+        while len(records):
+            room = len(self._buffer) - self._buffered
+            taken, records = records[:room], records[room:]
+            self._buffer[self._buffered : self._buffered + len(taken)] = taken
+            self._buffered += len(taken)
+            self.count += len(taken)
+            if self._buffered == len(self._buffer):
+                self._flush()
+
+    def _flush(self) -> None:
+        """Writes the buffered records as the next shard."""
+        path = self.directory.joinpath(f"records-{self.shards:06d}.npz")
+        buffered = self._buffer[: self._buffered]
+        fields: Dict[str, Any] = {name: buffered[name] for name in RECORD.names or ()}
+        np.savez(path, **fields)
+        self.shards += 1
+        self._buffered = 0
+
+    def close(self) -> None:
+        """Writes the last, partial shard."""
+        if self._buffered:
+            self._flush()
+
+
+def _blocks(
+    player_x: str, player_o: str, games: int, block_size: int, seed: int
+) -> Iterator[BlockTask]:
+    """Splits `games` games into blocks of `block_size` games."""
+    rng = random.Random(seed)  # noqa: S311
+    for start in range(0, games, block_size):
+        size = min(block_size, games - start)
+        yield BlockTask(player_x, player_o, size, rng.randrange(2**32))
+
+
+def generate(
+    directory: Path,
+    player_x: str,
+    player_o: str,
+    games: int,
+    output_format: FORMAT = "memmap",
+    workers: int = 1,
+    block_size: int = 256,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    seed: int = 0,
+) -> int:
+    """Plays `games` games and writes their records to `directory`.
+
+    Args:
+        directory: Path, output directory.
+        player_x: str, difficulty level or registered strategy of "X".
+        player_o: str, difficulty level or registered strategy of "O".
+        games: int, number of games.
+        output_format: str, "memmap" or "npz", see the module docstring.
+        workers: int, number of producer processes.
+        block_size: int, number of games per block of records.
+        shard_size: int, number of records per shard in the "npz" format.
+        seed: int, seed of the players of every game, reproducing the records
+            of strategies keeping no state from a game to the next.
+
+    Returns:
+        The number of records written.
+
+    Raises:
+        ValueError: if a player or the output format is unknown.
+    """
+    if output_format not in ("memmap", "npz"):
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    for name in (player_x, player_o):
+        strategies.resolve(name)  # fail early on unknown strategies
+    writer: Union[MemmapWriter, ShardWriter] = (
+        MemmapWriter(directory, games * MAX_MOVES)
+        if output_format == "memmap"
+        else ShardWriter(directory, shard_size)
+    )
+    blocks = _blocks(player_x, player_o, games, block_size, seed)
+    # The move cache would replay the same moves from the same positions.
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=cache.configure, initargs=(0,)
+    ) as pool:
+        pending: Deque["Future[npt.NDArray[Any]]"] = deque()
+        for block in blocks:
+            pending.append(pool.submit(play_block, block))
+            if len(pending) >= 2 * workers:
+                writer.write(pending.popleft().result())
+        while pending:
+            writer.write(pending.popleft().result())
+    writer.close()
+    return writer.count
+
+
+def load(directory: Path) -> Iterator[npt.NDArray[Any]]:
+    """Yields the records of a dataset, in the order they were written.
+
+    Args:
+        directory: Path, directory of the dataset.
+
+    Yields:
+        The memory-mapped records in the "memmap" format, the records of each
+        shard in turn in the "npz" format.
+    """
+    metadata_path = directory.joinpath("records.json")
+    if metadata_path.exists():
+        count = json.loads(metadata_path.read_text())["count"]
+        if count:
+            yield np.memmap(
+                directory.joinpath("records.bin"),
+                dtype=RECORD,
+                mode="r",
+                shape=(count,),
+            )
+        return
+    for path in sorted(directory.glob("records-*.npz")):
+        with np.load(path) as shard:
+            records = np.zeros(len(shard["mark"]), dtype=RECORD)
+            for name in RECORD.names or ():
+                records[name] = shard[name]
+        yield records
@@ -1,5 +1,6 @@
 """Tic Tac Toe Game."""
 import json
+import random
 from abc import ABC
 from abc import abstractmethod
 from typing import Any
@@ -9,11 +10,14 @@ from typing import List
 from typing import Literal
 from typing import Optional
 from typing import Tuple
+from typing import Type
 from typing import Union
 
-from tic_tac_toe_game.AI.mcts import mcts_move
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game import symmetry
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import strategies
 from tic_tac_toe_game.AI.naive import naive_move
-from tic_tac_toe_game.AI.negamax import negamax_move
 from tic_tac_toe_game.errors import OverwriteCellError
 from tic_tac_toe_game.typing import Coordinates
 from tic_tac_toe_game.typing import Grid
@@ -80,8 +84,13 @@ class Move:
 class Board:
     """Board class.
 
+    The game result is memoized: `winner` (and therefore `is_over`, `is_tie` and
+    `is_won`) only evaluates the grid again after `make_move` changed it. Code
+    writing to `grid` directly must call `_invalidate_winner` afterwards.
+
     Attributes:
         grid: A 3*3 matrix of string values.
+        winner_cache_hits: int, number of evaluations saved by the memoized result.
     """
 
     x = 1
@@ -104,6 +113,8 @@ class Board:
         if history is None:
             history = []
         self.history: List[Move] = history
+        self.winner_cache_hits = 0
+        self._invalidate_winner()
 
     def get_cell(self, coord: Coordinates) -> int:
         """Returns value for cell located at `coord`."""
@@ -118,6 +129,7 @@ class Board:
             raise OverwriteCellError(move.coordinates)
         self.grid[move.x][move.y] = move.player
         self.history.append(move)
+        self._invalidate_winner()
 
     def is_empty_cell(self, coord: Coordinates) -> bool:
         """Checks if cell located at `coord` is empty."""
@@ -146,9 +158,10 @@ class Board:
                 self.grid[row_id][row_id] == move.player
                 for row_id, row in enumerate(self.grid)
             )
-        if move.x + move.y == 2:
+        last = len(self.grid) - 1
+        if move.x + move.y == last:
             has_winning_diag = has_winning_diag or all(
-                self.grid[2 - row_id][row_id] == move.player
+                self.grid[last - row_id][row_id] == move.player
                 for row_id, row in enumerate(self.grid)
             )
         return bool(has_winning_row or has_winning_col or has_winning_diag)
@@ -163,9 +176,33 @@ class Board:
         for idx, row in enumerate(self.display()):
             framed.append(Board._vertical_separator.join(row))
             if idx != len(self.grid) - 1:
-                framed.append(Board._intersection.join(Board._horizontal_separator * 3))
+                framed.append(
+                    Board._intersection.join(Board._horizontal_separator * len(row))
+                )
         return "\n".join(framed)
 
+    def canonical_key(self) -> Tuple[int, int]:
+        """Returns the key of the position up to symmetry, see `symmetry`.
+
+        The transform leading to the canonical position is returned along.
+        """
+        return symmetry.canonical_grid(self.grid)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restores a pickled board, e.g. from a saved session.
+
+        Boards pickled before the game result was memoized get an empty memo.
+        """
+        self.__dict__.update(state)
+        if "_winner_known" not in state:
+            self.winner_cache_hits = 0
+            self._invalidate_winner()
+
+    def _invalidate_winner(self) -> None:
+        """Forgets the memoized game result. Must follow any change of the grid."""
+        self._winner_known = False
+        self._winner: Optional[int] = None
+
     def winner(self) -> Optional[int]:
         """Returns game result.
 
@@ -178,6 +215,15 @@ class Board:
         -------
         int
         """
+        if self._winner_known:
+            self.winner_cache_hits += 1
+            return self._winner
+        self._winner = self._evaluate_winner()
+        self._winner_known = True
+        return self._winner
+
+    def _evaluate_winner(self) -> Optional[int]:
+        """Computes game result, see `winner`."""
         try:
             last_move = self.history[-1]
         except IndexError:  # no history means there is no winner
@@ -196,9 +242,10 @@ class Board:
                 self.grid[row_id][row_id] == last_move.player
                 for row_id, row in enumerate(self.grid)
             )
-        if last_move.x + last_move.y == 2:
+        last = len(self.grid) - 1
+        if last_move.x + last_move.y == last:
             has_winning_diag = has_winning_diag or all(
-                self.grid[2 - row_id][row_id] == last_move.player
+                self.grid[last - row_id][row_id] == last_move.player
                 for row_id, row in enumerate(self.grid)
             )
         if has_winning_row or has_winning_col or has_winning_diag:
@@ -243,7 +290,11 @@ class Board:
 
     def to_json(self) -> str:
         """Creates a JSON representation of an instance of Board."""
-        d = {"__class": self.__class__.__name__, **self.__dict__}
+        d = {
+            "__class": self.__class__.__name__,
+            "grid": self.grid,
+            "history": self.history,
+        }
         return json.dumps(d, sort_keys=True, indent=4)
 
     @classmethod
@@ -296,7 +347,138 @@ class Board:
         """Check whether other equals self elementwise."""
         if not isinstance(other, Board):
             return False
-        return self.__dict__ == other.__dict__
+        return (
+            type(self) is type(other)
+            and self.grid == other.grid
+            and self.history == other.history
+        )
+
+
+class BitBoard(Board):
+    """Board backed by two 9-bit integers, one per mark.
+
+    Drop-in replacement for `Board`: it keeps the same public methods and the
+    same dictionary layout, but win and emptiness checks are done with a few
+    mask operations instead of walking the rows of the grid.
+
+    Attributes:
+        x_bits: int, cells occupied by "X".
+        o_bits: int, cells occupied by "O".
+    """
+
+    _serialized_names = ("Board", "BitBoard")
+
+    def __init__(
+        self,
+        grid: Optional[Grid] = None,
+        history: Optional[List[Move]] = None,
+    ) -> None:
+        """Inits bitboards from `grid`, or with an empty grid."""
+        self.x_bits, self.o_bits = (0, 0) if grid is None else bb.from_grid(grid)
+        if history is None:
+            history = []
+        self.history: List[Move] = history
+        self.winner_cache_hits = 0
+        self._invalidate_winner()
+
+    @property
+    def grid(self) -> Grid:  # type: ignore[override]
+        """Returns a fresh 3*3 matrix view of the bitboards.
+
+        The returned grid is a copy: moves must go through `make_move`.
+        """
+        return bb.to_grid(self.x_bits, self.o_bits)
+
+    def get_cell(self, coord: Coordinates) -> int:
+        """Returns value for cell located at `coord`."""
+        bit = 1 << bb.cell_index(coord)
+        if self.x_bits & bit:
+            return Board.x
+        if self.o_bits & bit:
+            return Board.o
+        return Board._empty_cell
+
+    def make_move(self, move: Move) -> None:
+        """Sets `value` for cell located at `coord` if cell is empty.
+
+        Consumes action.
+        """
+        bit = 1 << bb.cell_index(move.coordinates)
+        if (self.x_bits | self.o_bits) & bit:
+            raise OverwriteCellError(move.coordinates)
+        if move.player == Board.x:
+            self.x_bits |= bit
+        elif move.player == Board.o:
+            self.o_bits |= bit
+        self.history.append(move)
+        self._invalidate_winner()
+
+    def is_empty_cell(self, coord: Coordinates) -> bool:
+        """Checks if cell located at `coord` is empty."""
+        return not (self.x_bits | self.o_bits) & (1 << bb.cell_index(coord))
+
+    def is_full(self) -> bool:
+        """Checks if grid is full. Gris is full if there is no empty cell left."""
+        return self.x_bits | self.o_bits == bb.FULL_MASK
+
+    def empty_cells(self) -> List[Coordinates]:
+        """Returns the coordinates of the empty cells, in reading order."""
+        free = bb.free_cells(self.x_bits, self.o_bits)
+        return [bb.cell_coordinates(index) for index in bb.iter_cells(free)]
+
+    def canonical_key(self) -> Tuple[int, int]:
+        """Returns the key of the position up to symmetry, see `symmetry`."""
+        return symmetry.canonical_bits(self.x_bits, self.o_bits)
+
+    def _bits(self, mark: int) -> int:
+        """Returns the bitboard of `mark`."""
+        return self.x_bits if mark == Board.x else self.o_bits
+
+    def is_winning_move(self, move: Move) -> bool:
+        """Checks if playing `value` at `coord` leads to a win.
+
+        Only checks the win masks containing the cell with the given coordinates.
+        """
+        return bb.has_line_through(
+            self._bits(move.player), bb.cell_index(move.coordinates)
+        )
+
+    def _evaluate_winner(self) -> Optional[int]:
+        """Computes game result, see `Board.winner`."""
+        try:
+            last_move = self.history[-1]
+        except IndexError:  # no history means there is no winner
+            return None
+
+        if bb.has_line(self._bits(last_move.player)):
+            return last_move.player
+        elif self.is_full():
+            return 0
+        else:
+            return None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BitBoard":
+        """Constructs BitBoard instance from a Board or BitBoard dictionary."""
+        data = dict(data)  # local copy
+        if not isinstance(data, dict) or data.pop("__class") not in (
+            cls._serialized_names
+        ):
+            raise ValueError
+        return cls(
+            data.get("grid"),
+            [Move.from_dict(move) for move in data["history"]],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether other equals self elementwise."""
+        if not isinstance(other, BitBoard):
+            return False
+        return (
+            self.x_bits == other.x_bits
+            and self.o_bits == other.o_bits
+            and self.history == other.history
+        )
 
 
 class Player(ABC):
@@ -307,8 +489,6 @@ class Player(ABC):
         mark: The value of the mark currently used. Must be "X" or "O".
     """
 
-    _available_moves = [naive_move, mcts_move, negamax_move]
-
     def __init__(
         self,
         mark: int,
@@ -373,7 +553,9 @@ class Player(ABC):
     def __repr__(self) -> str:
         """Returns instance representation."""
         repr_moves = (
-            self.moves.__name__ if self.moves in self._available_moves else None
+            self.moves
+            if isinstance(self.moves, strategies.Strategy)
+            else strategies.dump(self.moves)
         )
         return (
             f"{self.__class__.__name__}("
@@ -381,14 +563,15 @@ class Player(ABC):
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Converts the Player instance to a dictionary."""
-        repr_moves = (
-            self.moves.__name__ if self.moves in self._available_moves else None
-        )
+        """Converts the Player instance to a dictionary.
+
+        Registered strategy functions are stored by name, parameterized
+        strategies with their parameters, see `strategies.dump`.
+        """
         return dict(
             name=self.name,
             mark=self._mark,
-            moves=repr_moves,
+            moves=strategies.dump(self.moves),
             score=self._score,
             __class=self.__class__.__name__,
         )
@@ -400,10 +583,7 @@ class Player(ABC):
             raise ValueError
         data = dict(data)  # local copy
         class_name = data.pop("__class")
-        available_moves = {move.__name__: move for move in cls._available_moves}
-        data["moves"] = (
-            available_moves[data["moves"]] if data["moves"] in available_moves else None
-        )
+        data["moves"] = strategies.load(data["moves"])
         if class_name == "HumanPlayer":
             return HumanPlayer(**data)
         elif class_name == "AIPlayer":
@@ -426,6 +606,7 @@ class AIPlayer(Player):
         name: str,
         moves: Optional[Callable[[Grid, int], Coordinates]] = naive_move,
         score: int = 0,
+        seed: Optional[int] = None,
     ) -> None:
         """Constructor.
 
@@ -434,15 +615,44 @@ class AIPlayer(Player):
             mark: str, player's mark.
             moves: callable, handles choice of moves.
             score: int, player's score.
+            seed: int, seed of the player's own random generator, None to seed
+                it from the operating system.
         """
         super().__init__(mark=mark, name=name, moves=moves, score=score)
+        self.seed = seed
+        self._rng = random.Random(seed)  # noqa: S311
+
+    @property
+    def rng(self) -> random.Random:
+        """Returns the player's own random generator."""
+        return self._rng
 
     def ask_move(self, grid: Grid) -> Optional[Coordinates]:
-        """Asks the player what move he wants to play."""
-        if self.moves is not None:
-            return self.moves(grid, self.get_mark())
+        """Asks the player what move he wants to play, through the move cache.
+
+        Randomized strategies draw from the player's own random generator.
+        """
+        if isinstance(self.moves, strategies.Strategy):
+            return self.moves(grid, self.get_mark(), self._rng)
+        elif self.moves is not None:
+            return cache.ask(self.moves, grid, self.get_mark(), self._rng)
         return None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the AIPlayer instance to a dictionary, seed included.
+
+        The random generator restarts from the seed when loaded back.
+        """
+        data = super().to_dict()
+        data["seed"] = self.seed
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether other equals self elementwise, random generators aside."""
+        if not isinstance(other, AIPlayer):
+            return False
+        return {**self.__dict__, "_rng": None} == {**other.__dict__, "_rng": None}
+
 
 class HumanPlayer(Player):
     """Player class for a Human-managed player."""
@@ -600,9 +810,17 @@ class TicTacToeGame:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TicTacToeGame":
         """Constructs TicTacToeGame instance from dictionary."""
+        board_data: Dict[str, Any] = data["board"]
+        board_class: Type[Board] = Board
+        if board_data["__class"] == "BitBoard":
+            board_class = BitBoard
+        elif board_data["__class"] == "MNKBoard":
+            from tic_tac_toe_game.mnk import MNKBoard
+
+            board_class = MNKBoard
         return cls(
-            PlayersMatch.from_dict(data.get("players_match")),
-            Board.from_dict(data.get("board")),
+            PlayersMatch.from_dict(data["players_match"]),
+            board_class.from_dict(board_data),
         )
 
     def __eq__(self, other: object) -> bool:
@@ -620,15 +838,23 @@ def build_game(
     player_2_name: Optional[str] = None,
     player_1_starts: bool = True,
     mode: MODE = "single",
+    seed: Optional[int] = None,
+    difficulty: Optional[str] = None,
 ) -> TicTacToeGame:
-    """Returns a game object."""
+    """Returns a game object.
+
+    The bot of single player games is seeded with `seed` and plays the preset
+    strategy of `difficulty` if given, see `strategies.PRESETS`.
+    """
     player_1_mark = 1 if player_1_starts is True else -1
     player_1: Player = HumanPlayer(player_1_mark, player_1_name or "Player 1")
 
     player_2_mark = 0 - player_1_mark
     player_2: Player
     if mode == "single":
-        player_2 = AIPlayer(player_2_mark, player_2_name or "Bot")
+        player_2 = AIPlayer(player_2_mark, player_2_name or "Bot", seed=seed)
+        if difficulty is not None:
+            player_2.moves = strategies.preset(difficulty)
     else:
         player_2 = HumanPlayer(player_2_mark, player_2_name or "Player 2")
 
@@ -0,0 +1,302 @@
+"""m,n,k games: k marks in a row win on a board of m rows and n columns.
+
+Every k consecutive cells of a row, a column or a diagonal form a window, and
+a mark wins by filling a window. `MNKBoard` keeps, for each mark, the number
+of its marks in every window: a move only updates the counters of the (at
+most 4k) windows through its cell, so playing a move and checking it for a
+win cost O(k) whatever the size of the board. Tic Tac Toe is the 3,3,3 game,
+the default board.
+"""
+import functools
+import itertools
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.errors import OverwriteCellError
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+# Steps along a row, a column, the diagonal and the anti-diagonal.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Image of cell (row, col) of a board whose last row and column are `last_row`
+# and `last_col`, numbered as the transforms of `symmetry`, and whether the
+# transform needs a square board.
+_COORDINATE_MAPS: Tuple[Tuple[Callable[..., Tuple[int, int]], bool], ...] = (
+    (lambda row, col, last_row, last_col: (row, col), False),
+    (lambda row, col, last_row, last_col: (col, last_row - row), True),
+    (lambda row, col, last_row, last_col: (last_row - row, last_col - col), False),
+    (lambda row, col, last_row, last_col: (last_col - col, row), True),
+    (lambda row, col, last_row, last_col: (row, last_col - col), False),
+    (lambda row, col, last_row, last_col: (last_row - row, col), False),
+    (lambda row, col, last_row, last_col: (col, row), True),
+    (lambda row, col, last_row, last_col: (last_col - col, last_row - row), True),
+)
+
+
+class Layout(NamedTuple):
+    """Windows of an m,n,k board, cells being numbered in reading order.
+
+    Attributes:
+        rows: int, number of rows.
+        cols: int, number of columns.
+        k: int, number of marks in a row needed to win.
+        windows: list of tuples, the cells of every window.
+        cell_windows: list of tuples, the windows through every cell.
+    """
+
+    rows: int
+    cols: int
+    k: int
+    windows: List[Tuple[int, ...]]
+    cell_windows: List[Tuple[int, ...]]
+
+
+@functools.lru_cache(maxsize=None)
+def layout(rows: int, cols: int, k: int) -> Layout:
+    """Returns the windows of the `rows` by `cols` board with `k` in a row.
+
+    Args:
+        rows: int, number of rows.
+        cols: int, number of columns.
+        k: int, number of marks in a row needed to win.
+
+    Returns:
+        The layout of the board, shared by all boards of the same game.
+
+    Raises:
+        ValueError: if no window of `k` cells fits in the board.
+    """
+    if rows < 1 or cols < 1 or not 1 <= k <= max(rows, cols):
+        raise ValueError(f"No {k} in a row on a {rows}x{cols} board")
+    windows = []
+    for d_row, d_col in DIRECTIONS:
+        for row in range(rows):
+            for col in range(cols):
+                end_row, end_col = row + (k - 1) * d_row, col + (k - 1) * d_col
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append(
+                        tuple(
+                            (row + step * d_row) * cols + col + step * d_col
+                            for step in range(k)
+                        )
+                    )
+    cell_windows: List[List[int]] = [[] for _ in range(rows * cols)]
+    for window_id, window in enumerate(windows):
+        for cell in window:
+            cell_windows[cell].append(window_id)
+    return Layout(rows, cols, k, windows, [tuple(ids) for ids in cell_windows])
+
+
+@functools.lru_cache(maxsize=None)
+def symmetries(rows: int, cols: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+    """Returns the symmetries of the `rows` by `cols` board.
+
+    A square board has the 8 symmetries of `symmetry`, a rectangular one only
+    the identity, the rotation by 180 degrees and the reflections across its
+    middle column and middle row.
+
+    Args:
+        rows: int, number of rows.
+        cols: int, number of columns.
+
+    Returns:
+        Pairs of a transform, numbered as in `symmetry`, and the image of
+        every cell under it, cells being numbered in reading order.
+    """
+    return tuple(
+        (
+            transform,
+            tuple(
+                image[0] * cols + image[1]
+                for image in (
+                    mapping(row, col, rows - 1, cols - 1)
+                    for row in range(rows)
+                    for col in range(cols)
+                )
+            ),
+        )
+        for transform, (mapping, square_only) in enumerate(_COORDINATE_MAPS)
+        if rows == cols or not square_only
+    )
+
+
+class MNKBoard(engine.Board):
+    """Board of an m,n,k game with incremental window counters.
+
+    Drop-in replacement for `Board`, which it matches on 3*3 boards. The grid
+    must only be changed through `make_move`.
+
+    Attributes:
+        grid: A rows*cols matrix of marks.
+        k: int, number of marks in a row needed to win.
+        counts: dict, number of marks of each mark in every window of the
+            layout.
+    """
+
+    _serialized_names = ("Board", "MNKBoard")
+
+    def __init__(
+        self,
+        grid: Optional[Grid] = None,
+        history: Optional[List[engine.Move]] = None,
+        rows: int = 3,
+        cols: int = 3,
+        k: int = 3,
+    ) -> None:
+        """Inits the board from `grid`, or empty with `rows` and `cols`.
+
+        Args:
+            grid: list of lists, the marks of the board, None for an empty
+                board.
+            history: list of Move, the moves played so far.
+            rows: int, number of rows of an empty board.
+            cols: int, number of columns of an empty board.
+            k: int, number of marks in a row needed to win.
+        """
+        if grid is None:
+            grid = [[engine.Board._empty_cell] * cols for _ in range(rows)]
+        self.layout = layout(len(grid), len(grid[0]), k)
+        self.k = k
+        self.counts: Dict[int, List[int]] = {
+            engine.Board.x: [0] * len(self.layout.windows),
+            engine.Board.o: [0] * len(self.layout.windows),
+        }
+        self._filled = 0
+        self._line_owner: Optional[int] = None
+        super().__init__(grid, history)
+        for row_id, row in enumerate(grid):
+            for col_id, cell in enumerate(row):
+                if cell != engine.Board._empty_cell:
+                    self._count(row_id * self.layout.cols + col_id, cell)
+
+    @property
+    def rows(self) -> int:
+        """Returns the number of rows."""
+        return self.layout.rows
+
+    @property
+    def cols(self) -> int:
+        """Returns the number of columns."""
+        return self.layout.cols
+
+    def _count(self, cell: int, mark: int) -> None:
+        """Adds `mark` played on `cell` to the counters of its windows."""
+        counts = self.counts[mark]
+        for window_id in self.layout.cell_windows[cell]:
+            counts[window_id] += 1
+            if counts[window_id] == self.k and self._line_owner is None:
+                self._line_owner = mark
+        self._filled += 1
+
+    def make_move(self, move: engine.Move) -> None:
+        """Sets `value` for cell located at `coord` if cell is empty.
+
+        Consumes action.
+        """
+        if not self.is_empty_cell(move.coordinates):
+            raise OverwriteCellError(move.coordinates)
+        self.grid[move.x][move.y] = move.player
+        self.history.append(move)
+        self._count(move.x * self.layout.cols + move.y, move.player)
+        self._invalidate_winner()
+
+    def is_full(self) -> bool:
+        """Checks if grid is full. Gris is full if there is no empty cell left."""
+        return self._filled == self.layout.rows * self.layout.cols
+
+    def empty_cells(self) -> List[Coordinates]:
+        """Returns the coordinates of the empty cells, in reading order."""
+        return [
+            (row_id, col_id)
+            for row_id, row in enumerate(self.grid)
+            for col_id, cell in enumerate(row)
+            if cell == engine.Board._empty_cell
+        ]
+
+    def is_winning_move(self, move: engine.Move) -> bool:
+        """Checks if playing `value` at `coord` leads to a win.
+
+        Only checks the counters of the windows through the cell of `move`.
+        """
+        counts = self.counts[move.player]
+        return any(
+            counts[window_id] == self.k
+            for window_id in self.layout.cell_windows[
+                move.x * self.layout.cols + move.y
+            ]
+        )
+
+    def canonical_key(self) -> Tuple[int, int]:
+        """Returns the key of the position up to symmetry, see `symmetry`.
+
+        The key of a board of m*n cells is `x_bits | o_bits << m*n`, cells
+        being numbered in reading order as in `symmetries`, which is the key
+        of `Board` on 3*3 boards.
+
+        Returns:
+            The canonical key and the first transform leading to it.
+        """
+        if (self.layout.rows, self.layout.cols) == (3, 3):
+            return super().canonical_key()
+        size = self.layout.rows * self.layout.cols
+        marks = [
+            (cell, mark)
+            for cell, mark in enumerate(itertools.chain.from_iterable(self.grid))
+            if mark != engine.Board._empty_cell
+        ]
+        keys = []
+        for transform, permutation in symmetries(self.layout.rows, self.layout.cols):
+            key = 0
+            for cell, mark in marks:
+                shift = size if mark == engine.Board.o else 0
+                key |= 1 << (permutation[cell] + shift)
+            keys.append((key, transform))
+        return min(keys)
+
+    def _evaluate_winner(self) -> Optional[int]:
+        """Computes game result, see `Board.winner`."""
+        if not self.history:  # no history means there is no winner
+            return None
+        if self._line_owner is not None:
+            return self._line_owner
+        elif self.is_full():
+            return 0
+        else:
+            return None
+
+    def __repr__(self) -> str:
+        """Returns instance representation."""
+        return (
+            f"{self.__class__.__name__}({self.grid!r}, {self.history!r}, "
+            f"k={self.k!r})"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the MNKBoard instance to a dictionary."""
+        return dict(super().to_dict(), k=self.k)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MNKBoard":
+        """Constructs MNKBoard instance from a Board or MNKBoard dictionary."""
+        data = dict(data)  # local copy
+        if not isinstance(data, dict) or data.pop("__class") not in (
+            cls._serialized_names
+        ):
+            raise ValueError
+        return cls(
+            data.get("grid"),
+            [engine.Move.from_dict(move) for move in data.get("history", [])],
+            k=data.get("k", 3),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether other equals self elementwise."""
+        return super().__eq__(other) and self.k == getattr(other, "k", None)
@@ -0,0 +1,110 @@
+"""Tabular Q-learning of Tic Tac Toe through batched self-play.
+
+Action values are learned for every position code of `AI.oracle`, seen from
+the player to move, so a single table plays both marks. A move is worth 1 if
+it wins, 0 if it fills the board and otherwise minus the value of the best
+reply, as in negamax. Games are played in lockstep by chunks of boards held
+in a `batch.BoardBatch`, both players following the same epsilon-greedy
+policy over the table; after every ply the values of the moves played are
+moved towards their targets, averaged over the boards of the chunk playing
+the same move from the same position.
+
+The values are stored by `AI.learned`, which plays them.
+"""
+import numpy as np
+import numpy.typing as npt
+
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.batch import CELLS
+from tic_tac_toe_game.batch import BoardBatch
+
+
+DEFAULT_GAMES = 1_000_000
+DEFAULT_CHUNK_SIZE = 4096
+
+# Weight of each cell in the base 3 codes of the oracle table.
+_POWERS_OF_3 = 3 ** np.arange(CELLS)
+
+
+def encode(boards: BoardBatch, mark: int) -> npt.NDArray[np.intp]:
+    """Returns the position codes of `boards` seen by the player using `mark`."""
+    codes: npt.NDArray[np.intp] = (boards.cells == mark) @ _POWERS_OF_3
+    codes += 2 * ((boards.cells == -mark) @ _POWERS_OF_3)
+    return codes
+
+
+def _best_values(
+    values: npt.NDArray[np.float32], legal: npt.NDArray[np.bool_]
+) -> npt.NDArray[np.float32]:
+    """Returns the highest value among the legal moves of every row."""
+    best: npt.NDArray[np.float32] = np.where(legal, values, -np.inf).max(axis=1)
+    return best
+
+
+def _choose(
+    values: npt.NDArray[np.float32],
+    legal: npt.NDArray[np.bool_],
+    epsilon: float,
+    rng: np.random.Generator,
+) -> npt.NDArray[np.intp]:
+    """Returns an epsilon-greedy legal move of every row, ties broken at random."""
+    keys = rng.random(values.shape, dtype=np.float32)
+    best = _best_values(values, legal)
+    exploring = rng.random(len(values)) < epsilon
+    candidates = legal & ((values == best[:, None]) | exploring[:, None])
+    keys[~candidates] = -1
+    moves: npt.NDArray[np.intp] = keys.argmax(axis=1)
+    return moves
+
+
+def train(
+    games: int = DEFAULT_GAMES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    alpha: float = 0.5,
+    epsilon: float = 0.3,
+    seed: int = 0,
+) -> npt.NDArray[np.float32]:
+    """Learns the action values of every position through self-play.
+
+    Args:
+        games: int, number of training games.
+        chunk_size: int, number of games played in lockstep.
+        alpha: float, learning rate.
+        epsilon: float, probability of playing a random move while training.
+        seed: int, seed of the training games.
+
+    Returns:
+        The action values, of shape (`oracle.POSITIONS`, 9), 0 for illegal
+        moves and unvisited positions.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.zeros((oracle.POSITIONS, CELLS), dtype=np.float32)
+    flat_values = values.reshape(-1)
+    for start in range(0, games, chunk_size):
+        boards = BoardBatch.empty(min(chunk_size, games - start))
+        for ply in range(CELLS):
+            mark = 1 if ply % 2 == 0 else -1
+            legal = boards.legal_moves()
+            playing = np.flatnonzero(legal.any(axis=1))
+            if not len(playing):
+                break
+            boards = boards[playing]
+            codes = encode(boards, mark)
+            moves = _choose(values[codes], legal[playing], epsilon, rng)
+            boards.play(moves, mark)
+            best_replies = _best_values(
+                values[encode(boards, -mark)], boards.legal_moves()
+            )
+            targets = np.where(
+                boards.winners() != 0,
+                1.0,
+                np.where(boards.is_full(), 0.0, -best_replies),
+            )
+            keys = codes * CELLS + moves
+            counts = np.bincount(keys, minlength=flat_values.size)
+            sums = np.bincount(keys, targets, minlength=flat_values.size)
+            updated = np.flatnonzero(counts)
+            flat_values[updated] += alpha * (
+                sums[updated] / counts[updated] - flat_values[updated]
+            )
+    return values
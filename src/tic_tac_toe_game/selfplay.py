@@ -0,0 +1,258 @@
+"""Self-play of many games in lockstep.
+
+Games are played by chunks of boards held in a `batch.BoardBatch`: at every
+ply, the policy of the player to move picks a cell on all the boards of the
+chunk at once. A batched policy is a callable `policy(boards, mark, rng)`
+returning one cell index per board, -1 for finished games.
+
+Each chunk is summarized into a `Summary` and, if an output directory is
+given, written to it as a `games-<chunk>.npz` shard holding for every game
+its winner, its length and its moves in order (-1 padded). Chunks can be
+played by a process pool, the calling process being the single writer.
+"""
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.batch import CELLS
+from tic_tac_toe_game.batch import MASK_CELLS
+from tic_tac_toe_game.batch import BoardBatch
+
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+Policy = Callable[[BoardBatch, int, np.random.Generator], npt.NDArray[np.intp]]
+
+# Weight of each cell in the base 3 codes of the oracle table.
+_POWERS_OF_3 = 3 ** np.arange(CELLS)
+
+
+def _pick(candidates: npt.NDArray[np.bool_], rng: np.random.Generator) -> Any:
+    """Returns a random candidate cell of every board, -1 for boards without any."""
+    keys = rng.random(candidates.shape, dtype=np.float32)
+    keys[~candidates] = -1
+    moves = keys.argmax(axis=1)
+    moves[~candidates.any(axis=1)] = -1
+    return moves
+
+
+def random_policy(
+    boards: BoardBatch, mark: int, rng: np.random.Generator
+) -> npt.NDArray[np.intp]:
+    """Plays a legal move at random."""
+    moves: npt.NDArray[np.intp] = _pick(boards.legal_moves(), rng)
+    return moves
+
+
+@functools.lru_cache(maxsize=None)
+def _oracle_entries() -> npt.NDArray[np.uint16]:
+    """Returns the entries of the oracle table, see `AI.oracle`."""
+    return np.frombuffer(oracle.raw_table(), dtype="<u2")
+
+
+def oracle_policy(
+    boards: BoardBatch, mark: int, rng: np.random.Generator
+) -> npt.NDArray[np.intp]:
+    """Plays an optimal move at random, looked up in the oracle table."""
+    codes = (boards.cells == mark) @ _POWERS_OF_3
+    codes += 2 * ((boards.cells == -mark) @ _POWERS_OF_3)
+    optimal = MASK_CELLS[_oracle_entries()[codes] & bb.FULL_MASK]
+    moves: npt.NDArray[np.intp] = _pick(optimal & boards.legal_moves(), rng)
+    return moves
+
+
+def epsilon_greedy(policy: Policy, epsilon: float) -> Policy:
+    """Returns `policy` playing a random move with probability `epsilon`."""
+
+    def explore(
+        boards: BoardBatch, mark: int, rng: np.random.Generator
+    ) -> npt.NDArray[np.intp]:
+        moves = policy(boards, mark, rng)
+        exploring = rng.random(len(boards)) < epsilon
+        moves[exploring] = random_policy(boards[exploring], mark, rng)
+        return moves
+
+    return explore
+
+
+POLICIES: Dict[str, Policy] = {"random": random_policy, "oracle": oracle_policy}
+
+
+class PolicySpec(NamedTuple):
+    """Picklable description of a batched policy, see `POLICIES`."""
+
+    name: str
+    epsilon: float = 0.0
+
+    def build(self) -> Policy:
+        """Returns the policy.
+
+        Returns:
+            The policy, epsilon-greedy if `epsilon` is positive.
+
+        Raises:
+            ValueError: if the policy name is unknown.
+        """
+        if self.name not in POLICIES:
+            raise ValueError(f"Unknown policy: {self.name!r}")
+        policy = POLICIES[self.name]
+        return epsilon_greedy(policy, self.epsilon) if self.epsilon > 0 else policy
+
+
+class Chunk(NamedTuple):
+    """Results of a chunk of games, one row per game."""
+
+    winners: npt.NDArray[np.int8]  # mark of the winner, 0 for a tie
+    lengths: npt.NDArray[np.int8]
+    moves: npt.NDArray[np.int8]  # (N, 9) cells played in order, -1 padded
+
+
+def play_chunk(
+    size: int, policy_x: Policy, policy_o: Policy, rng: np.random.Generator
+) -> Chunk:
+    """Plays `size` games in lockstep, "X" playing `policy_x`."""
+    boards = BoardBatch.empty(size)
+    moves = np.full((size, CELLS), -1, dtype=np.int8)
+    for ply in range(CELLS):
+        mark, policy = (1, policy_x) if ply % 2 == 0 else (-1, policy_o)
+        played = policy(boards, mark, rng)
+        if (played == -1).all():
+            break
+        boards.play(played, mark)
+        moves[:, ply] = played
+    lengths = (moves != -1).sum(axis=1).astype(np.int8)
+    return Chunk(boards.winners(), lengths, moves)
+
+
+class ChunkTask(NamedTuple):
+    """Chunk of games to play in a worker process."""
+
+    size: int
+    policy_x: PolicySpec
+    policy_o: PolicySpec
+    seed: np.random.SeedSequence
+
+
+def _play_task(task: ChunkTask) -> Chunk:
+    """Plays the chunk `task`."""
+    return play_chunk(
+        task.size,
+        task.policy_x.build(),
+        task.policy_o.build(),
+        np.random.default_rng(task.seed),
+    )
+
+
+class Summary:
+    """Statistics of the games played so far.
+
+    Attributes:
+        games: int, number of games.
+        outcomes: numpy.ndarray, number of games won by "X", tied and won by
+            "O", by opening cell, shape (9, 3).
+        total_length: int, total number of moves played.
+    """
+
+    def __init__(self) -> None:
+        """Inits statistics without any game."""
+        self.games = 0
+        self.outcomes = np.zeros((CELLS, 3), dtype=np.int64)
+        self.total_length = 0
+
+    def add(self, chunk: Chunk) -> None:
+        """Adds the games of `chunk`."""
+        self.games += len(chunk.winners)
+        outcome = 1 - chunk.winners.astype(np.intp)  # X win 0, tie 1, O win 2
+        cells = chunk.moves[:, 0].astype(np.intp) * 3 + outcome
+        self.outcomes += np.bincount(cells, minlength=CELLS * 3).reshape(CELLS, 3)
+        self.total_length += int(chunk.lengths.sum(dtype=np.int64))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the statistics to a JSON-serializable dictionary."""
+        x_wins, draws, o_wins = self.outcomes.sum(axis=0).tolist()
+        openings = {}
+        for index, counts in enumerate(self.outcomes.tolist()):
+            games = sum(counts)
+            if games:
+                openings[str(bb.cell_coordinates(index))] = dict(
+                    games=games,
+                    x_win_rate=counts[0] / games,
+                    draw_rate=counts[1] / games,
+                    o_win_rate=counts[2] / games,
+                )
+        return dict(
+            games=self.games,
+            x_wins=x_wins,
+            draws=draws,
+            o_wins=o_wins,
+            mean_length=self.total_length / self.games if self.games else 0.0,
+            openings=openings,
+        )
+
+
+def _tasks(
+    games: int,
+    policy_x: PolicySpec,
+    policy_o: PolicySpec,
+    chunk_size: int,
+    seed: int,
+) -> Iterator[ChunkTask]:
+    """Splits `games` games into chunks of `chunk_size` games."""
+    chunks = -(-games // chunk_size)
+    for index, chunk_seed in enumerate(np.random.SeedSequence(seed).spawn(chunks)):
+        size = min(chunk_size, games - index * chunk_size)
+        yield ChunkTask(size, policy_x, policy_o, chunk_seed)
+
+
+def simulate(
+    games: int,
+    policy_x: PolicySpec,
+    policy_o: PolicySpec,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = 0,
+    workers: int = 1,
+    output: Optional[Path] = None,
+) -> Summary:
+    """Plays `games` games and streams them to `output` chunk by chunk.
+
+    Args:
+        games: int, number of games.
+        policy_x: PolicySpec, policy of "X".
+        policy_o: PolicySpec, policy of "O".
+        chunk_size: int, number of games played in lockstep.
+        seed: int, seed of the chunks, making the games reproducible.
+        workers: int, number of processes playing chunks, 1 to play them in
+            the calling process.
+        output: Path, directory of the .npz shards, None to only summarize.
+
+    Returns:
+        The statistics of the games.
+    """
+    for policy in (policy_x, policy_o):
+        policy.build()  # fail early on unknown policies
+    tasks = _tasks(games, policy_x, policy_o, chunk_size, seed)
+    summary = Summary()
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        chunks = map(_play_task, tasks) if pool is None else pool.map(_play_task, tasks)
+        for index, chunk in enumerate(chunks):
+            summary.add(chunk)
+            if output is not None:
+                np.savez(output.joinpath(f"games-{index:06d}.npz"), **chunk._asdict())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return summary
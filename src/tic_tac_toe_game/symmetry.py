@@ -0,0 +1,108 @@
+"""Symmetries of the 3*3 grid.
+
+The 8 rotations and reflections of the square (its dihedral group D4) map a
+position to positions with the same game-theoretic properties. Each transform
+is a permutation of the cell indices of the `bitboard` module, and the
+canonical key of a position is the smallest key among its 8 images:
+
+    key = x_bits | o_bits << 9
+
+Moves found for the canonical position are mapped back to the actual board
+with `from_canonical`.
+"""
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+from tic_tac_toe_game import bitboard as bb
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+_LAST = bb.SIZE - 1
+
+# Image of cell (row, col) under each transform, identity first.
+_COORDINATE_MAPS: Tuple[Callable[[int, int], Coordinates], ...] = (
+    lambda row, col: (row, col),
+    lambda row, col: (col, _LAST - row),  # rotation by 90 degrees clockwise
+    lambda row, col: (_LAST - row, _LAST - col),  # rotation by 180 degrees
+    lambda row, col: (_LAST - col, row),  # rotation by 270 degrees clockwise
+    lambda row, col: (row, _LAST - col),  # reflection across the middle column
+    lambda row, col: (_LAST - row, col),  # reflection across the middle row
+    lambda row, col: (col, row),  # reflection across the main diagonal
+    lambda row, col: (_LAST - col, _LAST - row),  # and across the anti-diagonal
+)
+
+IDENTITY = 0
+
+# TRANSFORMS[transform][index] is the image of cell `index` under `transform`.
+TRANSFORMS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(
+        bb.cell_index(mapping(*bb.cell_coordinates(index)))
+        for index in range(bb.SIZE * bb.SIZE)
+    )
+    for mapping in _COORDINATE_MAPS
+)
+
+# INVERSES[transform] is the transform undoing `transform`.
+INVERSES: Tuple[int, ...] = tuple(
+    next(
+        inverse
+        for inverse, candidate in enumerate(TRANSFORMS)
+        if all(candidate[image] == index for index, image in enumerate(permutation))
+    )
+    for permutation in TRANSFORMS
+)
+
+
+def _bits_table(permutation: Tuple[int, ...]) -> List[int]:
+    """Returns the image of every 9-bit mask under `permutation`."""
+    table = []
+    for mask in range(bb.FULL_MASK + 1):
+        image = 0
+        for index in bb.iter_cells(mask):
+            image |= 1 << permutation[index]
+        table.append(image)
+    return table
+
+
+_BITS_TABLES = tuple(_bits_table(permutation) for permutation in TRANSFORMS)
+
+
+def transform_bits(bits: int, transform: int) -> int:
+    """Returns the image of the cells set in `bits` under `transform`."""
+    return _BITS_TABLES[transform][bits]
+
+
+def transform_index(index: int, transform: int) -> int:
+    """Returns the image of cell `index` under `transform`."""
+    return TRANSFORMS[transform][index]
+
+
+def canonical_bits(x_bits: int, o_bits: int) -> Tuple[int, int]:
+    """Returns the canonical key of a position and the transform leading to it.
+
+    Among transforms leading to the key, the first one is returned.
+    """
+    best_key, best_transform = x_bits | o_bits << 9, IDENTITY
+    for transform in range(1, len(TRANSFORMS)):
+        table = _BITS_TABLES[transform]
+        key = table[x_bits] | table[o_bits] << 9
+        if key < best_key:
+            best_key, best_transform = key, transform
+    return best_key, best_transform
+
+
+def canonical_grid(grid: Grid) -> Tuple[int, int]:
+    """Returns the canonical key of `grid` and the transform leading to it."""
+    return canonical_bits(*bb.from_grid(grid))
+
+
+def to_canonical(coord: Coordinates, transform: int) -> Coordinates:
+    """Maps a cell of the actual board to the canonical board."""
+    return bb.cell_coordinates(TRANSFORMS[transform][bb.cell_index(coord)])
+
+
+def from_canonical(coord: Coordinates, transform: int) -> Coordinates:
+    """Maps a cell of the canonical board back to the actual board."""
+    return bb.cell_coordinates(TRANSFORMS[INVERSES[transform]][bb.cell_index(coord)])
@@ -0,0 +1,96 @@
+"""Test cases for the AI arena."""
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from tic_tac_toe_game import __main__
+from tic_tac_toe_game import arena
+from tic_tac_toe_game.AI import mcts
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import strategies
+
+
+def test_elo_ratings_rank_entrants() -> None:
+    """It rates winners above losers, and equal entrants equally."""
+    records = [arena.GameRecord("strong", "weak", 1, {1: [], -1: []})] * 3 + [
+        arena.GameRecord("weak", "strong", 0, {1: [], -1: []}),
+        arena.GameRecord("twin", "strong", 0, {1: [], -1: []}),
+        arena.GameRecord("strong", "twin", 0, {1: [], -1: []}),
+    ]
+    ratings = arena.elo_ratings(records)
+    assert ratings["strong"] > ratings["twin"] > ratings["weak"]
+    assert arena.elo_ratings(records[-2:]) == pytest.approx(
+        {"strong": arena.BASE_RATING, "twin": arena.BASE_RATING}
+    )
+
+
+def test_percentile_interpolates() -> None:
+    """It interpolates between the closest ranks."""
+    assert arena.percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert arena.percentile([1.0, 2.0], 90) == pytest.approx(1.9)
+    assert arena.percentile([5.0], 99) == 5.0
+
+
+def test_run_plays_both_colors() -> None:
+    """It plays every pairing with each mark and reports the outcomes."""
+    records = arena.run(["beginner", "oracle_move"], games=2, seed=1)
+    assert [(r.player_x, r.player_o) for r in records] == [
+        ("beginner", "oracle_move"),
+        ("beginner", "oracle_move"),
+        ("oracle_move", "beginner"),
+        ("oracle_move", "beginner"),
+    ]
+    summary = arena.report(records)
+    assert [player["name"] for player in summary["players"]] == [
+        "oracle_move",
+        "beginner",
+    ]
+    assert summary["players"][0]["losses"] == 0
+    assert sum(pairing["games"] for pairing in summary["pairings"]) == 4
+    with pytest.raises(ValueError):
+        arena.run(["beginner", "grandmaster"], games=1)
+
+
+def test_games_start_cold() -> None:
+    """It times moves without search state left by earlier moves or games."""
+    negamax.negamax(0, 1, 4)
+    mcts._trees.put(mcts.MonteCarloTreeSearch(1, 0, -1))
+    assert negamax._transpositions and len(mcts._trees)
+    arena.play_game(arena.GameTask("naive_move", "oracle_move", 0))
+    assert not negamax._transpositions and not len(mcts._trees)
+
+
+def test_default_entrants() -> None:
+    """It leaves the large board strategies out of the default field."""
+    entrants = arena.default_entrants()
+    assert "threat_move" not in entrants
+    assert set(entrants) == set(strategies.names()) - {"threat_move"}
+
+
+def test_arena_command_writes_reports(tmp_path: Path) -> None:
+    """It prints the ratings and writes the JSON and CSV reports."""
+    result = CliRunner().invoke(
+        __main__.main,
+        [
+            "arena",
+            "--entrant=naive_move",
+            "--entrant=negamax_move",
+            "--games=1",
+            f"--json={tmp_path / 'arena.json'}",
+            f"--csv={tmp_path}",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[1].startswith("negamax_move")
+    summary = json.loads((tmp_path / "arena.json").read_text())
+    assert {"players", "pairings"} <= set(summary)
+    assert (tmp_path / "pairings.csv").read_text().startswith("player_x,player_o,")
+    assert (tmp_path / "players.csv").read_text().startswith("name,elo,")
+
+
+def test_arena_command_rejects_unknown_entrants() -> None:
+    """It exits with a usage error for unknown entrants."""
+    result = CliRunner().invoke(__main__.main, ["arena", "--entrant=grandmaster"])
+    assert result.exit_code == 2
@@ -0,0 +1,66 @@
+"""Test cases for the batch module."""
+import numpy as np
+import pytest
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.batch import BoardBatch
+
+
+# X won on the first row, a tie, and a game in progress with O to move.
+GRIDS = [
+    [[1, 1, 1], [-1, -1, 0], [0, 0, 0]],
+    [[1, -1, 1], [1, -1, -1], [-1, 1, 1]],
+    [[1, 0, 0], [0, 0, 0], [0, 0, 0]],
+]
+
+
+@pytest.fixture
+def batch() -> BoardBatch:
+    """It returns a batch holding `GRIDS`."""
+    return BoardBatch(np.array(GRIDS).reshape(-1, 9))
+
+
+def test_batch_evaluates_boards(batch: BoardBatch) -> None:
+    """It computes winners, full and terminal flags of every board."""
+    assert batch.winners().tolist() == [1, 0, 0]
+    assert batch.is_full().tolist() == [False, True, False]
+    assert batch.is_terminal().tolist() == [True, True, False]
+    assert batch.to_move().tolist() == [-1, -1, -1]
+
+
+def test_legal_moves_exclude_finished_games(batch: BoardBatch) -> None:
+    """It only allows empty cells of unfinished games."""
+    legal = batch.legal_moves()
+    assert not legal[:2].any()
+    assert np.flatnonzero(legal[2]).tolist() == list(range(1, 9))
+
+
+def test_play_applies_moves_in_place(batch: BoardBatch) -> None:
+    """It plays the player to move, skipping boards given -1."""
+    batch.play([-1, -1, 4])
+    assert batch.cells[2].tolist() == [1, 0, 0, 0, -1, 0, 0, 0, 0]
+    assert batch.cells[:2].tolist() == np.array(GRIDS[:2]).reshape(2, 9).tolist()
+    with pytest.raises(ValueError):
+        batch.play([-1, -1, 0])
+    with pytest.raises(ValueError):
+        batch.play([-1, -1, 9])
+
+
+def test_round_trip_with_boards(batch: BoardBatch) -> None:
+    """It converts to boards finding the same results, and back."""
+    boards = batch.to_boards(engine.Board)
+    assert [board.grid for board in boards] == GRIDS
+    assert [board.winner() for board in boards] == [1, 0, None]
+    bitboards = batch.to_boards()
+    assert [board.winner() for board in bitboards] == [1, 0, None]
+    assert BoardBatch.from_boards(bitboards).cells.tolist() == batch.cells.tolist()
+
+
+def test_batch_from_bits(batch: BoardBatch) -> None:
+    """It builds boards from bitboards."""
+    rebuilt = BoardBatch.from_bits(batch.x_bits(), batch.o_bits())
+    assert rebuilt.cells.tolist() == batch.cells.tolist()
+    assert len(BoardBatch.empty(4)) == 4
+    assert batch[1].cells.shape == (1, 9)
+    with pytest.raises(ValueError):
+        BoardBatch(np.zeros((2, 8)))
@@ -0,0 +1,42 @@
+"""Test cases for the benchmark suite."""
+from benchmarks import suite
+
+
+def test_suite_covers_hot_paths() -> None:
+    """It registers engine, serialization, state, strategy and route benchmarks."""
+    assert {
+        "engine.Board.make_move",
+        "engine.BitBoard.winner",
+        "serialization.round_trip",
+        "state.get_state",
+        "state.set_state",
+        "strategy.negamax_move",
+        "routes./move",
+        "routes./board",
+    } <= set(suite.BENCHMARKS)
+
+
+def test_run_times_selected_benchmarks() -> None:
+    """It times the selected benchmarks only, per call."""
+    results = suite.run(rounds=2, select="BitBoard.is_full")
+    assert list(results) == ["engine.BitBoard.is_full"]
+    assert 0 < results["engine.BitBoard.is_full"]["min"] < 0.001
+
+
+def test_compare_flags_regressions() -> None:
+    """It reports benchmarks slower than the baseline beyond the threshold."""
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}}
+    results = {
+        "fast": {"median": 1.1},
+        "slow": {"median": 1.5},
+        "new": {"median": 9.0},
+    }
+    assert suite.compare(results, baseline, 0.25) == [("slow", 0.5)]
+
+
+def test_compare_scales_by_calibration() -> None:
+    """It compares timings relative to the calibration of their machine."""
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}}
+    results = {"fast": {"median": 2.2}, "slow": {"median": 3.0}}
+    assert suite.compare(results, baseline, 0.25, scale=2.0) == [("slow", 0.5)]
+    assert 0 < suite.calibrate(rounds=2)["median"] < 0.1
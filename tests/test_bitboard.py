@@ -0,0 +1,107 @@
+"""Test cases for the bitboard module and the BitBoard engine."""
+import itertools
+
+import pytest
+
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game import engine
+from tic_tac_toe_game import errors
+
+
+# Every cell filled in reading order, X and O alternating, X wins on (2, 0).
+X_WINS_MOVES = ((0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0))
+
+
+# ================ Test bitboard primitives ================
+
+
+def test_win_masks() -> None:
+    """It holds the 8 win lines of the grid."""
+    assert len(bitboard.WIN_MASKS) == 8
+    assert all(bin(mask).count("1") == 3 for mask in bitboard.WIN_MASKS)
+    assert [len(masks) for masks in bitboard.CELL_WIN_MASKS] == [
+        3, 2, 3,
+        2, 4, 2,
+        3, 2, 3,
+    ]  # fmt: skip
+
+
+def test_grid_round_trip() -> None:
+    """It converts a grid to bitboards and back."""
+    grid = [[1, -1, 0], [0, 1, 0], [-1, 0, 0]]
+    x_bits, o_bits = bitboard.from_grid(grid)
+    assert x_bits == 0b000_010_001
+    assert o_bits == 0b001_000_010
+    assert bitboard.to_grid(x_bits, o_bits) == grid
+
+
+def test_iter_free_cells() -> None:
+    """It yields the empty cells, lowest index first."""
+    free = bitboard.free_cells(0b000_010_001, 0b001_000_010)
+    assert list(bitboard.iter_cells(free)) == [2, 3, 5, 7, 8]
+    assert [bitboard.cell_coordinates(index) for index in (2, 7)] == [(0, 2), (2, 1)]
+
+
+def test_has_line() -> None:
+    """It detects complete lines only."""
+    for mask in bitboard.WIN_MASKS:
+        assert bitboard.has_line(mask) is True
+        for index in bitboard.iter_cells(mask):
+            assert bitboard.has_line_through(mask, index) is True
+            assert bitboard.has_line(mask ^ (1 << index)) is False
+
+
+# ================ Test BitBoard ================
+
+
+def test_bit_board_matches_board() -> None:
+    """It behaves like Board on every step of every game in a sample."""
+    for order in itertools.islice(itertools.permutations(range(9)), 0, 5000, 7):
+        board, bit_board = engine.Board(), engine.BitBoard()
+        for turn, index in enumerate(order):
+            move = engine.Move(*bitboard.cell_coordinates(index), 1 - 2 * (turn % 2))
+            board.make_move(move)
+            bit_board.make_move(move)
+            assert bit_board.grid == board.grid
+            assert bit_board.is_full() == board.is_full()
+            assert bit_board.is_winning_move(move) == board.is_winning_move(move)
+            assert bit_board.winner() == board.winner()
+            if board.is_over():
+                break
+
+
+def test_bit_board_empty_cells() -> None:
+    """It lists empty cells and refuses to overwrite a cell."""
+    bit_board = engine.BitBoard([[1, -1, 0], [0, 1, 0], [-1, 0, 0]])
+    assert bit_board.empty_cells() == [(0, 2), (1, 0), (1, 2), (2, 1), (2, 2)]
+    assert bit_board.get_cell((0, 1)) == -1
+    with pytest.raises(errors.OverwriteCellError):
+        bit_board.make_move(engine.Move(0, 1, 1))
+
+
+def test_bit_board_serialization() -> None:
+    """It keeps the Board dictionary layout and loads Board dictionaries."""
+    board, bit_board = engine.Board(), engine.BitBoard()
+    for turn, coord in enumerate(X_WINS_MOVES):
+        move = engine.Move(*coord, 1 - 2 * (turn % 2))
+        board.make_move(move)
+        bit_board.make_move(move)
+
+    board_dict, bit_board_dict = board.to_dict(), bit_board.to_dict()
+    assert bit_board_dict.pop("__class") == "BitBoard"
+    assert board_dict.pop("__class") == "Board"
+    assert bit_board_dict == board_dict
+
+    assert engine.BitBoard.from_dict(bit_board.to_dict()) == bit_board
+    assert engine.BitBoard.from_dict(board.to_dict()) == bit_board
+    assert bit_board.display() == board.display()
+    assert bit_board.framed_grid() == board.framed_grid()
+    assert bit_board.is_won() is True
+
+
+def test_game_loads_bit_board() -> None:
+    """It restores a game holding a BitBoard."""
+    game = engine.build_game()
+    game.board = engine.BitBoard()
+    game.board.make_move(engine.Move(1, 1, 1))
+    assert engine.TicTacToeGame.from_dict(game.to_dict()) == game
@@ -0,0 +1,180 @@
+"""Test cases for the background bot moves of the web app."""
+import functools
+import importlib.util
+import queue
+import random
+import sys
+import types
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+import pytest
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+def _load_bot() -> types.ModuleType:
+    """Loads the bot module alone, as the app package monkey patches eventlet."""
+    path = Path(__file__).parents[1] / "src" / "app" / "bot.py"
+    spec = importlib.util.spec_from_file_location("_app_bot", path)
+    assert spec is not None and spec.loader is not None  # noqa: S101
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bot = _load_bot()
+
+TOKEN = "game"
+
+
+def first_empty(
+    grid: Grid, mark: int, rng: Optional[random.Random] = None
+) -> Coordinates:
+    """Plays the first empty cell, drawing once from `rng`."""
+    if rng is not None:
+        rng.random()
+    return next(
+        (x, y) for x, row in enumerate(grid) for y, cell in enumerate(row) if not cell
+    )
+
+
+def failing(grid: Grid, mark: int, rng: Optional[random.Random] = None) -> Coordinates:
+    """Fails to pick a move."""
+    raise RuntimeError("no move")
+
+
+def build_game(moves: Any = first_empty) -> engine.TicTacToeGame:
+    """Returns a game where a seeded bot plays first."""
+    player_x = engine.AIPlayer(1, "Bot", moves=moves, seed=0)
+    player_o = engine.HumanPlayer(-1, "Player")
+    return engine.TicTacToeGame(engine.PlayersMatch(player_x, player_o), engine.Board())
+
+
+def build_queue(result_ttl: float = 60.0, max_results: int = 8) -> Any:
+    """Returns a queue with one worker, run by `work`."""
+    bot_moves = bot.BotMoveQueue()
+    bot_moves.workers = 1
+    bot_moves.result_ttl = result_ttl
+    bot_moves.max_results = max_results
+    return bot_moves
+
+
+def work(bot_moves: Any) -> None:
+    """Runs the worker until the queued jobs are done."""
+    jobs = bot_moves._jobs
+    jobs.get = functools.partial(queue.Queue.get, jobs, block=False)
+    with pytest.raises(queue.Empty):
+        bot_moves._work()
+
+
+@pytest.fixture(autouse=True)
+def uncached() -> Iterator[None]:
+    """Keeps the move cache from answering for the bot."""
+    cache.move_cache.clear()
+    yield
+    cache.move_cache.clear()
+
+
+def test_submit_and_take() -> None:
+    """It hands the computed move and the bot's generator back to the game."""
+    bot_moves = build_queue()
+    game = build_game()
+    assert bot_moves.submit(TOKEN, game)
+    assert bot_moves.is_pending(TOKEN)
+    assert not bot_moves.submit(TOKEN, game)
+    assert bot_moves.take(TOKEN, game) is None
+
+    work(bot_moves)
+    assert bot_moves.event(TOKEN) == {
+        "move": [0, 0],
+        "board": [["X", "_", "_"], ["_", "_", "_"], ["_", "_", "_"]],
+    }
+    assert game.board.is_empty_cell((0, 0))
+    bot_player = game.players_match.current()
+    assert isinstance(bot_player, engine.AIPlayer)
+    expected = random.Random(0)
+    expected.random()
+
+    assert bot_moves.take(TOKEN, game) == (0, 0)
+    assert bot_player.rng.getstate() == expected.getstate()
+    assert not bot_moves.is_pending(TOKEN)
+    assert bot_moves.take(TOKEN, game) is None
+
+
+def test_submit_without_workers() -> None:
+    """It refuses moves when no worker runs."""
+    bot_moves = build_queue()
+    bot_moves.workers = 0
+    assert not bot_moves.submit(TOKEN, build_game())
+    assert not bot_moves.is_pending(TOKEN)
+
+
+def test_cancel() -> None:
+    """It drops the cancelled move, in flight or computed."""
+    bot_moves = build_queue()
+    game = build_game()
+    bot_moves.submit(TOKEN, game)
+    bot_moves.cancel(TOKEN)
+    assert not bot_moves.is_pending(TOKEN)
+    work(bot_moves)
+    assert bot_moves.event(TOKEN) is None
+
+    bot_moves.submit(TOKEN, game)
+    work(bot_moves)
+    bot_moves.cancel(TOKEN)
+    assert bot_moves.take(TOKEN, game) is None
+    assert not bot_moves.is_pending(TOKEN)
+
+
+def test_stale_generation() -> None:
+    """It drops the result of a job replaced after a new game."""
+    bot_moves = build_queue()
+    game = build_game()
+    bot_moves.submit(TOKEN, game)
+    bot_moves.cancel(TOKEN)
+    game.board.make_move(engine.Move(0, 0, -1))
+    bot_moves.submit(TOKEN, game)
+    work(bot_moves)
+    assert bot_moves.take(TOKEN, game) == (0, 1)
+    assert bot_moves.take(TOKEN, game) is None
+
+
+def test_result_ttl() -> None:
+    """It forgets results not taken in time."""
+    bot_moves = build_queue(result_ttl=0.0)
+    game = build_game()
+    bot_moves.submit(TOKEN, game)
+    work(bot_moves)
+    assert bot_moves.take(TOKEN, game) is None
+    assert not bot_moves.is_pending(TOKEN)
+
+
+def test_max_results() -> None:
+    """It forgets the oldest results over the limit."""
+    bot_moves = build_queue(max_results=1)
+    game = build_game()
+    bot_moves.submit("first", game)
+    bot_moves.submit("second", game)
+    work(bot_moves)
+    assert bot_moves.take("first", game) is None
+    assert not bot_moves.is_pending("first")
+    assert bot_moves.take("second", game) == (0, 0)
+
+
+def test_worker_exception() -> None:
+    """It survives a failing bot and forgets its move."""
+    bot_moves = build_queue()
+    game = build_game(failing)
+    bot_moves.submit(TOKEN, game)
+    bot_moves.submit("next", build_game())
+    work(bot_moves)
+    assert not bot_moves.is_pending(TOKEN)
+    assert bot_moves.take(TOKEN, game) is None
+    assert bot_moves.take("next", game) == (0, 0)
@@ -0,0 +1,319 @@
+"""Test cases for the AI move cache."""
+import types
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import cast
+
+import pytest
+import redis
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game import symmetry
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import naive
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.AI import redis_cache
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+# X in a corner, O to move: every other position below is a symmetric image.
+CORNER_GRID = [[1, 0, 0], [0, 0, 0], [0, 0, 0]]
+ROTATED_GRID = [[0, 0, 1], [0, 0, 0], [0, 0, 0]]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> Iterator[None]:
+    """It runs every test with an empty cache of default size."""
+    cache.move_cache.clear()
+    yield
+    cache.configure()
+    cache.move_cache.clear()
+
+
+def test_lru_eviction() -> None:
+    """It evicts the least recently used move."""
+    move_cache = cache.MoveCache(maxsize=2)
+    move_cache.put((0, 1, "a", ()), 0)
+    move_cache.put((1, 1, "a", ()), 1)
+    assert move_cache.get((0, 1, "a", ())) == 0
+    move_cache.put((2, 1, "a", ()), 2)
+    assert move_cache.get((1, 1, "a", ())) is None
+    assert move_cache.get((0, 1, "a", ())) == 0
+    assert len(move_cache) == 2
+    assert (move_cache.hits, move_cache.misses) == (2, 1)
+
+
+def test_symmetric_positions_hit_the_cache() -> None:
+    """It serves a symmetric position, mapping the move back to its board."""
+    calls: List[Tuple[Grid, int]] = []
+
+    @cache.cached_move()
+    def strategy(grid: Grid, mark: int) -> Coordinates:
+        calls.append((grid, mark))
+        return (1, 0) if grid == CORNER_GRID else (0, 0)
+
+    assert strategy(CORNER_GRID, -1) == (1, 0)
+    assert symmetry.canonical_grid(ROTATED_GRID)[0] == (
+        symmetry.canonical_grid(CORNER_GRID)[0]
+    )
+    assert strategy(ROTATED_GRID, -1) == (0, 1)
+    assert len(calls) == 1
+    assert cache.move_cache.hits == 1
+
+
+def test_cache_key_holds_mark_and_parameters() -> None:
+    """It computes again when the mark or the parameters change."""
+    calls: List[Tuple[int, int]] = []
+    settings: Dict[str, int] = {"iterations": 10}
+
+    @cache.cached_move(lambda: tuple(settings.items()))
+    def strategy(grid: Grid, mark: int, depth: int = 1) -> Coordinates:
+        calls.append((mark, depth))
+        return (1, 1)
+
+    strategy(CORNER_GRID, -1)
+    strategy(CORNER_GRID, -1, depth=1)
+    strategy(CORNER_GRID, 1)
+    strategy(CORNER_GRID, -1, 2)
+    settings["iterations"] = 20
+    strategy(CORNER_GRID, -1)
+    assert calls == [(-1, 1), (1, 1), (-1, 2), (-1, 1)]
+
+
+def test_disabled_cache() -> None:
+    """It always computes the move when the cache size is 0."""
+    cache.configure(0)
+    assert negamax.negamax_move(CORNER_GRID, -1) == (1, 1)
+    assert negamax.negamax_move(CORNER_GRID, -1) == (1, 1)
+    assert len(cache.move_cache) == 0
+
+
+def test_errors_are_not_cached() -> None:
+    """It lets strategy errors through."""
+    with pytest.raises(IndexError):
+        negamax.negamax_move([[1, -1, 1], [-1, -1, 1], [1, 1, -1]], 1)
+    assert len(cache.move_cache) == 0
+
+
+def test_ai_player_asks_through_the_cache() -> None:
+    """It caches the moves of any strategy played by an AIPlayer."""
+    calls = []
+
+    def strategy(grid: Grid, mark: int) -> Coordinates:
+        calls.append(mark)
+        return (1, 1)
+
+    player = engine.AIPlayer(mark=-1, name="Bot", moves=strategy)
+    assert player.ask_move(CORNER_GRID) == (1, 1)
+    assert player.ask_move(ROTATED_GRID) == (1, 1)
+    assert calls == [-1]
+
+
+def test_ai_player_skips_uncached_strategies() -> None:
+    """It calls random and table-lookup strategies directly."""
+    player = engine.AIPlayer(mark=-1, name="Bot", moves=naive.naive_move)
+    player.ask_move(CORNER_GRID)
+    player.moves = oracle.oracle_move
+    player.ask_move(CORNER_GRID)
+    assert len(cache.move_cache) == 0
+
+
+def test_unreachable_redis_is_a_miss() -> None:
+    """It keeps playing when Redis is unavailable."""
+    cache.configure(redis_url="redis://127.0.0.1:1/0")
+    assert isinstance(cache.move_cache, redis_cache.RedisMoveCache)
+    assert negamax.negamax_move(CORNER_GRID, -1) == (1, 1)
+    assert cache.move_cache.misses == 1
+    assert len(cache.move_cache) == 0
+
+    cache.configure()
+    assert isinstance(cache.move_cache, cache.MoveCache)
+
+
+class StubRedis:
+    """In-memory Redis client with the commands of the Redis move cache."""
+
+    def __init__(self, clock: Callable[[], float]) -> None:
+        """Inits an empty database whose keys expire according to `clock`."""
+        self.clock = clock
+        self.strings: Dict[str, Tuple[bytes, float]] = {}
+        self.zsets: Dict[str, Dict[str, float]] = {}
+
+    def pipeline(self, transaction: bool = True) -> "StubPipeline":
+        """Returns a pipeline, executed at once and thus atomically."""
+        return StubPipeline(self)
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Returns the value of `name` if it has not expired."""
+        value, expires = self.strings.get(name, (None, 0.0))
+        return value if self.clock() < expires else None
+
+    def set(self, name: str, value: int, ex: Optional[int] = None) -> None:
+        """Sets `name`, expiring after `ex` seconds if set."""
+        expires = float("inf") if ex is None else self.clock() + ex
+        self.strings[name] = (str(value).encode(), expires)
+
+    def delete(self, *names: str) -> None:
+        """Deletes keys of any type."""
+        for name in names:
+            self.strings.pop(name, None)
+            self.zsets.pop(name, None)
+
+    def _ranked(self, key: str) -> List[str]:
+        zset = self.zsets.get(key, {})
+        return sorted(zset, key=lambda member: (zset[member], member))
+
+    def zadd(self, key: str, mapping: Dict[str, float], xx: bool = False) -> None:
+        """Sets the scores of members, only existing ones if `xx`."""
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if member in zset or not xx:
+                zset[member] = score
+
+    def zcard(self, key: str) -> int:
+        """Returns the number of members."""
+        return len(self.zsets.get(key, {}))
+
+    def zrange(self, key: str, start: int, end: int) -> List[str]:
+        """Returns the members from rank `start` to `end` included."""
+        ranked = self._ranked(key)
+        end = end + len(ranked) if end < 0 else end
+        return ranked[start : end + 1]
+
+    def zremrangebyrank(self, key: str, start: int, end: int) -> None:
+        """Removes the members from rank `start` to `end` included."""
+        self.zrem(key, *self.zrange(key, start, end))
+
+    def zrangebyscore(self, key: str, low: Any, high: float) -> List[str]:
+        """Returns the members scored up to `high`, `low` being -inf."""
+        return [m for m in self._ranked(key) if self.zsets[key][m] <= high]
+
+    def zremrangebyscore(self, key: str, low: Any, high: float) -> None:
+        """Removes the members scored up to `high`, `low` being -inf."""
+        self.zrem(key, *self.zrangebyscore(key, low, high))
+
+    def zrem(self, key: str, *members: str) -> None:
+        """Removes members."""
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+
+class StubPipeline:
+    """Pipeline of `StubRedis` commands."""
+
+    def __init__(self, client: StubRedis) -> None:
+        """Inits an empty pipeline."""
+        self.client = client
+        self.commands: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def __getattr__(self, command: str) -> Callable[..., None]:
+        """Returns a function queuing `command`."""
+
+        def queue(*args: Any, **kwargs: Any) -> None:
+            self.commands.append((command, args, kwargs))
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        """Runs the queued commands, returns their results."""
+        return [
+            getattr(self.client, command)(*args, **kwargs)
+            for command, args, kwargs in self.commands
+        ]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """It sets the time seen by the Redis move cache, in seconds."""
+    now = [1000.0]
+    monkeypatch.setattr(redis_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _redis_cache(clock: List[float], **options: Any) -> redis_cache.RedisMoveCache:
+    """Returns a Redis move cache backed by a `StubRedis`."""
+    client = cast("redis.Redis[bytes]", StubRedis(lambda: clock[0]))
+    return redis_cache.RedisMoveCache(client, **options)
+
+
+def test_redis_lru_eviction(clock: List[float]) -> None:
+    """It evicts the least recently used moves, as MoveCache."""
+    move_cache = _redis_cache(clock, maxsize=2)
+    move_cache.put((0, 1, "a", ()), 0)
+    clock[0] += 1
+    move_cache.put((1, 1, "a", ()), 1)
+    clock[0] += 1
+    assert move_cache.get((0, 1, "a", ())) == 0
+    clock[0] += 1
+    move_cache.put((2, 1, "a", ()), 2)
+    assert move_cache.get((1, 1, "a", ())) is None
+    assert move_cache.get((0, 1, "a", ())) == 0
+    assert move_cache.get((2, 1, "a", ())) == 2
+    assert len(move_cache) == 2
+    assert (move_cache.hits, move_cache.misses) == (3, 1)
+    assert move_cache.client.get(move_cache._name((1, 1, "a", ()))) is None
+
+
+def test_redis_resize_and_clear(clock: List[float]) -> None:
+    """It evicts the moves in excess when shrunk, and forgets all when cleared."""
+    move_cache = _redis_cache(clock, maxsize=4, ttl=60)
+    for index in range(4):
+        clock[0] += 1
+        move_cache.put((index, 1, "a", ()), index)
+    move_cache.resize(1)
+    assert len(move_cache) == 1
+    assert move_cache.get((3, 1, "a", ())) == 3
+    assert move_cache.get((2, 1, "a", ())) is None
+    move_cache.resize(0)
+    assert len(move_cache) == 0
+    move_cache.put((0, 1, "a", ()), 0)
+    assert len(move_cache) == 0
+    move_cache.resize(4)
+    move_cache.put((0, 1, "a", ()), 0)
+    move_cache.clear()
+    assert (len(move_cache), move_cache.hits, move_cache.misses) == (0, 0, 0)
+    client = cast(StubRedis, move_cache.client)
+    assert not client.strings and not client.zsets
+
+
+def test_redis_expired_moves_are_not_counted(clock: List[float]) -> None:
+    """It forgets expired moves before counting or evicting moves."""
+    move_cache = _redis_cache(clock, maxsize=2, ttl=10)
+    move_cache.put((0, 1, "a", ()), 0)
+    clock[0] += 5
+    move_cache.put((1, 1, "a", ()), 1)
+    clock[0] += 6
+    assert len(move_cache) == 1
+    assert move_cache.get((0, 1, "a", ())) is None
+    move_cache.put((2, 1, "a", ()), 2)
+    assert move_cache.get((1, 1, "a", ())) == 1
+    assert move_cache.get((2, 1, "a", ())) == 2
+    move_cache.ttl = None
+    move_cache.put((1, 1, "a", ()), 1)
+    clock[0] += 100
+    assert len(move_cache) == 1
+    assert move_cache.get((1, 1, "a", ())) == 1
+
+
+def test_redis_workers_evict_together(clock: List[float]) -> None:
+    """It never evicts more moves than needed when workers evict at once."""
+    client = StubRedis(lambda: clock[0])
+    workers = [
+        redis_cache.RedisMoveCache(cast("redis.Redis[bytes]", client), maxsize=2)
+        for _ in range(2)
+    ]
+    for index in range(4):
+        clock[0] += 1
+        workers[index % 2].put((index, 1, "a", ()), index)
+    # Both workers added a move before either evicted.
+    client.zadd(workers[0]._index, {"ttt:moves:x": clock[0], "ttt:moves:y": clock[0]})
+    for worker in workers:
+        worker._evict()
+    assert client.zrange(workers[0]._index, 0, -1) == ["ttt:moves:x", "ttt:moves:y"]
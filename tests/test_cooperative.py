@@ -0,0 +1,43 @@
+"""Test cases for the cooperative module."""
+from typing import Iterator
+from typing import List
+
+import pytest
+
+from tic_tac_toe_game.AI import cooperative
+from tic_tac_toe_game.AI import mcts
+from tic_tac_toe_game.AI import negamax
+
+
+@pytest.fixture
+def yields() -> Iterator[List[None]]:
+    """Fixture recording calls of the yield hook."""
+    calls: List[None] = []
+    cooperative.install_yield_hook(lambda: calls.append(None), every=100)
+    yield calls
+    cooperative.uninstall_yield_hook()
+
+
+def test_checkpoint_is_noop_without_hook() -> None:
+    """It does nothing when no hook is installed."""
+    cooperative.uninstall_yield_hook()
+    for _ in range(1000):
+        cooperative.checkpoint()
+
+
+def test_install_yield_hook_rejects_interval() -> None:
+    """It raises `ValueError` if the interval is not positive."""
+    with pytest.raises(ValueError):
+        cooperative.install_yield_hook(lambda: None, every=0)
+
+
+def test_mcts_search_yields(yields: List[None]) -> None:
+    """It yields every `every` MCTS iterations."""
+    mcts.MonteCarloTreeSearch(0, 0, 1).search(iterations=1000)
+    assert len(yields) == 10
+
+
+def test_negamax_search_yields(yields: List[None]) -> None:
+    """It yields while searching negamax nodes."""
+    negamax.negamax(0, 0, negamax.FULL_DEPTH, transpositions={})
+    assert len(yields) > 0
@@ -0,0 +1,98 @@
+"""Test cases for the dataset module."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from tic_tac_toe_game import __main__
+from tic_tac_toe_game import dataset
+from tic_tac_toe_game.batch import BoardBatch
+
+
+def test_records_replay_the_games() -> None:
+    """It records every move of the games, with the outcome."""
+    records = dataset.play_block(dataset.BlockTask("beginner", "easy", 20, 0))
+    boards = BoardBatch(records["cells"])
+    assert (boards.to_move() == records["mark"]).all()
+    assert (records["cells"][np.arange(len(records)), records["move"]] == 0).all()
+    # Each game starts from the empty board.
+    starts = np.flatnonzero((records["cells"] == 0).all(axis=1))
+    assert len(starts) == 20
+    ends = [*starts[1:], len(records)]
+    for index, start in enumerate(starts):
+        end = ends[index]
+        last = boards[end - 1].copy()
+        last.play(records["move"][end - 1 : end], records["mark"][end - 1 : end])
+        assert last.is_terminal().all()
+        assert (records["winner"][start:end] == last.winners()[0]).all()
+
+
+@pytest.mark.parametrize("output_format", ["memmap", "npz"])
+def test_formats_hold_the_same_records(
+    tmp_path: Path, output_format: dataset.FORMAT
+) -> None:
+    """It writes the same records whatever the format and the workers.
+
+    Strategies reusing search trees across games are not reproducible.
+    """
+    count = dataset.generate(
+        tmp_path / "serial", "beginner", "easy", 50, output_format, block_size=8
+    )
+    parallel = dataset.generate(
+        tmp_path / "parallel",
+        "beginner",
+        "easy",
+        50,
+        output_format,
+        workers=2,
+        block_size=8,
+        shard_size=100,
+    )
+    records = np.concatenate(list(dataset.load(tmp_path / "serial")))
+    assert count == parallel == len(records)
+    assert 50 * 5 <= count <= 50 * 9
+    assert (np.concatenate(list(dataset.load(tmp_path / "parallel"))) == records).all()
+
+
+def test_shards_have_a_fixed_size(tmp_path: Path) -> None:
+    """It writes full shards and a last partial one."""
+    count = dataset.generate(tmp_path, "beginner", "beginner", 30, "npz", shard_size=64)
+    shards = sorted(tmp_path.glob("records-*.npz"))
+    assert len(shards) == -(-count // 64)
+    with np.load(shards[0]) as shard:
+        assert shard["cells"].shape == (64, 9)
+    sizes = [len(records) for records in dataset.load(tmp_path)]
+    assert sizes == [64] * (len(shards) - 1) + [count - 64 * (len(shards) - 1)]
+
+
+def test_memmap_is_truncated(tmp_path: Path) -> None:
+    """It drops the room preallocated for moves never played."""
+    count = dataset.generate(tmp_path, "beginner", "beginner", 30)
+    assert (tmp_path / "records.bin").stat().st_size == count * dataset.RECORD.itemsize
+    (records,) = dataset.load(tmp_path)
+    assert isinstance(records, np.memmap) and len(records) == count
+
+
+def test_unknown_players_are_rejected(tmp_path: Path) -> None:
+    """It fails before writing anything."""
+    with pytest.raises(ValueError):
+        dataset.generate(tmp_path / "out", "beginner", "minimax", 10)
+    with pytest.raises(ValueError):
+        dataset.generate(tmp_path / "out", "beginner", "easy", 10, "csv")  # type: ignore[arg-type]
+    assert not (tmp_path / "out").exists()
+
+
+def test_dataset_command(tmp_path: Path) -> None:
+    """It writes the dataset and reports the number of records."""
+    runner = CliRunner()
+    result = runner.invoke(
+        __main__.main,
+        ["dataset", "--games=10", "--x=beginner", f"--output={tmp_path}"],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith(f"{sum(map(len, dataset.load(tmp_path)))} records")
+    result = runner.invoke(
+        __main__.main, ["dataset", "--x=minimax", f"--output={tmp_path}"]
+    )
+    assert result.exit_code == 2
@@ -1,4 +1,5 @@
 """Test cases for the game module."""
+import pickle  # noqa: S403
 import random
 
 import pytest
@@ -31,6 +32,7 @@ PLAYER_B_DICT = {
     "mark": -1,
     "moves": "naive_move",
     "score": 0,
+    "seed": None,
 }
 PLAYER_A = engine.HumanPlayer(1, PLAYER_A_NAME)
 PLAYER_B = engine.AIPlayer(-1, PLAYER_B_NAME)
@@ -252,6 +254,37 @@ def test_board_from_dict() -> None:
     assert engine.Board.from_dict(BOARD_DICT) == BOARD
 
 
+def test_board_memoizes_winner() -> None:
+    """It evaluates the result once per grid change."""
+    for board in (engine.Board(), engine.BitBoard()):
+        board.make_move(engine.Move(0, 0, 1))
+        assert board.winner() is None
+        assert board.is_over() is False
+        assert board.is_tie() is False
+        assert board.winner_cache_hits == 2
+
+        for x, y, player in ((1, 0, -1), (0, 1, 1), (1, 1, -1), (0, 2, 1)):
+            board.make_move(engine.Move(x, y, player))
+        assert board.is_won() is True
+        assert board.winner() == 1
+        assert board.winner_cache_hits == 4
+        assert board == type(board).from_dict(board.to_dict())
+
+
+def test_board_unpickles_without_memo() -> None:
+    """It evaluates the result of boards pickled before it was memoized."""
+    for board in (engine.Board(), engine.BitBoard()):
+        for x, y, player in ((0, 0, 1), (1, 0, -1), (0, 1, 1), (1, 1, -1), (0, 2, 1)):
+            board.make_move(engine.Move(x, y, player))
+        for name in ("_winner_known", "_winner", "winner_cache_hits"):
+            delattr(board, name)
+        loaded = pickle.loads(pickle.dumps(board))  # noqa: S301
+        assert loaded.winner() == 1
+        assert loaded.winner_cache_hits == 0
+        assert loaded.is_won() is True
+        assert loaded.winner_cache_hits > 0
+
+
 # ================ Test Player ================
 
 
@@ -299,6 +332,19 @@ def test_player_from_dict() -> None:
     assert engine.Player.from_dict(PLAYER_B_DICT) == PLAYER_B
 
 
+def test_ai_player_is_seedable() -> None:
+    """It keeps its seed through to_dict/from_dict and replays its moves."""
+    player = engine.AIPlayer(-1, PLAYER_B_NAME, seed=42)
+    loaded = engine.Player.from_dict(player.to_dict())
+    assert loaded.to_dict()["seed"] == 42
+    assert loaded == player
+
+    grid = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    assert [player.ask_move(grid) for _ in range(10)] == [
+        loaded.ask_move(grid) for _ in range(10)
+    ]
+
+
 # ================ Test PlayersMatch ================
 
 
@@ -0,0 +1,100 @@
+"""Test cases for the learned strategy and its training."""
+import collections
+import math
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from benchmarks import search_quality
+from tic_tac_toe_game import __main__
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game import qlearning
+from tic_tac_toe_game.AI import learned
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.AI import strategies
+
+
+# X to move can win on (0, 2), O to move can win on (1, 2).
+BOTH_THREATEN_GRID = [[1, 1, 0], [-1, -1, 0], [0, 0, 0]]
+FULL_GRID = [[1, -1, 1], [-1, -1, 1], [1, 1, -1]]
+
+
+def test_greedy_play_is_perfect() -> None:
+    """It keeps the game-theoretic value of every position at temperature 0."""
+    rng = random.Random(0)  # noqa: S311
+    for grid, mark in search_quality.positions():
+        move = learned.learned_move(grid, mark, rng)
+        assert search_quality.keeps_value(grid, mark, move)
+
+
+def test_temperature_weakens_play() -> None:
+    """It plays worse moves more often as the temperature rises."""
+    played = search_quality.positions()
+    accuracies = []
+    for temperature in (0.0, 0.3, 3.0):
+        rng = random.Random(0)  # noqa: S311
+        correct = sum(
+            search_quality.keeps_value(
+                grid, mark, learned.learned_move(grid, mark, rng, temperature)
+            )
+            for grid, mark in played
+        )
+        accuracies.append(correct / len(played))
+    assert accuracies == sorted(accuracies, reverse=True)
+    assert accuracies[-1] < 0.9
+
+
+def test_temperature_samples_softmax() -> None:
+    """It draws moves with the softmax probabilities of their values."""
+    temperature = 0.5
+    values = learned.move_values(BOTH_THREATEN_GRID, 1)
+    weights = {
+        bitboard.cell_coordinates(index): math.exp(value / temperature)
+        for index, value in values
+    }
+    strategy = strategies.Strategy("learned_move", temperature=temperature)
+    rng = random.Random(0)  # noqa: S311
+    draws = collections.Counter(
+        strategy(BOTH_THREATEN_GRID, 1, rng) for _ in range(4000)
+    )
+    for cell, weight in weights.items():
+        expected = weight / sum(weights.values())
+        assert abs(draws[cell] / 4000 - expected) < 0.02
+    assert draws.most_common(1)[0][0] == (0, 2)
+
+
+def test_learned_move_is_registered() -> None:
+    """It plays through the registry."""
+    o_to_move = [[1, 1, 0], [-1, -1, 0], [1, 0, 0]]
+    assert strategies.Strategy("learned_move")(o_to_move, -1) == (1, 2)
+    with pytest.raises(IndexError):
+        learned.learned_move(FULL_GRID, 1)
+
+
+def test_training_learns_values() -> None:
+    """It learns the value of winning moves from a few games, reproducibly."""
+    values = qlearning.train(games=20000, chunk_size=1000)
+    assert values.shape == (oracle.POSITIONS, 9)
+    assert values.min() >= -1 and values.max() <= 1
+    code = oracle.encode_position(BOTH_THREATEN_GRID, 1)
+    assert values[code].argmax() == 2 and values[code, 2] > 0.9
+    assert np.array_equal(values, qlearning.train(games=20000, chunk_size=1000))
+
+
+def test_train_command(tmp_path: Path) -> None:
+    """It writes a table loadable by the strategy."""
+    path = tmp_path / "learned.bin"
+    result = CliRunner().invoke(
+        __main__.main, ["train", "--games=5000", f"--output={path}"]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(learned.load_table(path)) == 9 * oracle.POSITIONS
+
+
+def test_missing_table_is_not_learned(tmp_path: Path) -> None:
+    """It points to the train command instead of training on the fly."""
+    with pytest.raises(FileNotFoundError, match="tic-tac-toe-game train"):
+        learned.load_table(tmp_path / "learned.bin")
@@ -0,0 +1,212 @@
+"""Test cases for the mcts module."""
+import random
+from typing import Any
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import mcts
+from tic_tac_toe_game.AI import tactics
+
+
+EMPTY_GRID = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+# X to move can win on (0, 2), O to move can win on (1, 2).
+BOTH_THREATEN_GRID = [[1, 1, 0], [-1, -1, 0], [0, 0, 0]]
+# O to move must block on (0, 2).
+MUST_BLOCK_GRID = [[1, 1, 0], [-1, 0, 0], [0, 0, 0]]
+# X to move, no move forced: (2, 2) threatens two lines at once.
+FORK_GRID = [[1, -1, 1], [0, 0, 0], [-1, 0, 0]]
+
+
+def test_search_keeps_tree_consistent() -> None:
+    """It records one visit per playout on the root and its children."""
+    tree = mcts.MonteCarloTreeSearch(0, 0, 1, rng=random.Random(0), capacity=2)
+    assert tree.search(iterations=500) == 500
+    assert tree.visits[0] == 500
+    assert sum(tree.root_visits().values()) == 500
+    assert sorted(tree.root_visits()) == list(range(9))
+    assert tree.size > 2
+
+
+def test_search_handles_time_budget() -> None:
+    """It stops when the time budget is spent."""
+    tree = mcts.MonteCarloTreeSearch(0, 0, 1)
+    assert tree.search(time_budget=0.01) > 0
+    with pytest.raises(ValueError):
+        tree.search()
+
+
+def test_search_refuses_finished_game() -> None:
+    """It raises `ValueError` if the game is already over."""
+    x_bits, o_bits = bitboard.from_grid([[1, 1, 1], [-1, -1, 0], [0, 0, 0]])
+    with pytest.raises(ValueError):
+        mcts.MonteCarloTreeSearch(x_bits, o_bits, -1)
+
+
+def test_mcts_move_plays_tactics() -> None:
+    """It wins and blocks when it has to."""
+    assert mcts.mcts_move(BOTH_THREATEN_GRID, 1, iterations=2000) == (0, 2)
+    assert mcts.mcts_move(BOTH_THREATEN_GRID, -1, iterations=2000) == (1, 2)
+    assert mcts.mcts_move(MUST_BLOCK_GRID, -1, iterations=2000) == (0, 2)
+
+
+def test_configure_sets_default_budget() -> None:
+    """It uses the configured budget by default."""
+    try:
+        mcts.configure(iterations=None, time_budget=0.01)
+        assert mcts.mcts_move(EMPTY_GRID, 1) in [
+            (x, y) for x in range(3) for y in range(3)
+        ]
+        with pytest.raises(ValueError):
+            mcts.configure(iterations=None, time_budget=None)
+    finally:
+        mcts.configure()
+
+
+def test_mcts_move_is_seedable() -> None:
+    """It replays the same search from the same seed."""
+    moves = []
+    for _ in range(2):
+        cache.move_cache.clear()
+        rng = random.Random(7)
+        moves.append(
+            [
+                mcts.mcts_move(grid, 1, iterations=200, reuse_tree=False, rng=rng)
+                for grid in (EMPTY_GRID, [[1, 0, 0], [0, -1, 0], [0, 0, 0]])
+            ]
+        )
+    assert moves[0] == moves[1]
+
+
+def test_advance_keeps_subtree() -> None:
+    """It reroots the tree on a child and keeps its statistics."""
+    tree = mcts.MonteCarloTreeSearch(0, 0, 1, rng=random.Random(0))
+    tree.search(iterations=2000)
+    visits = tree.root_visits()[4]
+    tree.advance(4)
+    assert tree.position_key() == (1 << 4, 0, -1)
+    assert tree.parent[0] == -1
+    assert tree.visits[0] == visits
+    for node in range(tree.size):
+        first = tree.first_child[node]
+        if first >= 0:
+            children = range(first, first + tree.child_count[node])
+            assert all(tree.parent[child] == node for child in children)
+            # The first playout through a node may have started from the node itself.
+            children_visits = sum(tree.visits[child] for child in children)
+            assert tree.visits[node] - children_visits in (0, 1)
+    with pytest.raises(ValueError):
+        tree.advance(4)
+
+
+def test_mcts_move_reuses_tree() -> None:
+    """It picks up the tree kept from the previous turn."""
+    cache.move_cache.clear()
+    mcts._trees.clear()
+    x, y = mcts.mcts_move(EMPTY_GRID, 1, iterations=2000)
+    assert len(mcts._trees) == 1
+
+    grid = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    grid[x][y] = 1
+    reply = next(index for index in range(9) if index != 3 * x + y)
+    grid[reply // 3][reply % 3] = -1
+    tree = mcts._trees.take(*bitboard.from_grid(grid), 1)
+    assert tree is not None
+    assert tree.position_key() == (*bitboard.from_grid(grid), 1)
+    assert tree.visits[0] > 0
+    assert len(mcts._trees) == 0
+
+
+def test_mcts_move_tops_up_reused_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It only runs the playouts missing from the reused tree, drawn from `rng`."""
+    cache.move_cache.clear()
+    mcts.clear_trees()
+    searches: List[Tuple[int, int, random.Random]] = []
+    search = mcts.MonteCarloTreeSearch.search
+
+    def recorded_search(tree: mcts.MonteCarloTreeSearch, *args: Any) -> int:
+        before = tree.visits[0]
+        done = search(tree, *args)
+        searches.append((before, tree.visits[0], tree.rng))
+        return done
+
+    monkeypatch.setattr(mcts.MonteCarloTreeSearch, "search", recorded_search)
+    first_rng, second_rng = random.Random(1), random.Random(2)
+    x, y = mcts.mcts_move(EMPTY_GRID, 1, iterations=500, rng=first_rng)
+    grid = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    grid[x][y] = 1
+    reply = next(index for index in range(9) if index != 3 * x + y)
+    grid[reply // 3][reply % 3] = -1
+    mcts.mcts_move(grid, 1, iterations=500, rng=second_rng)
+
+    assert searches[0] == (0, 500, first_rng)
+    before, after, rng = searches[1]
+    assert 0 < before < 500
+    assert after == 500
+    assert rng is second_rng
+
+
+def test_mcts_move_keeps_trees_by_playouts_per_leaf() -> None:
+    """It only reuses trees grown with the same number of playouts per leaf."""
+    cache.move_cache.clear()
+    mcts._trees.clear()
+    x, y = mcts.mcts_move(EMPTY_GRID, 1, iterations=200, rollouts_per_leaf=4)
+    grid = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    grid[x][y] = 1
+    reply = next(index for index in range(9) if index != 3 * x + y)
+    grid[reply // 3][reply % 3] = -1
+    position = bitboard.from_grid(grid)
+    assert mcts._trees.take(*position, 1, rollouts_per_leaf=1) is None
+    tree = mcts._trees.take(*position, 1, rollouts_per_leaf=4)
+    assert tree is not None and tree.rollouts_per_leaf == 4
+
+
+def test_tree_store_is_bounded() -> None:
+    """It evicts the oldest trees beyond its node budget."""
+    store = mcts.TreeStore(max_nodes=2000)
+    for index in range(9):
+        tree = mcts.MonteCarloTreeSearch(1 << index, 0, -1, capacity=1000)
+        store.put(tree)
+        assert store.nodes <= 2000
+    assert len(store) == 2
+    assert store.take(1 << 0, 1 << 8, 1) is None
+    assert store.take(1 << 8, 1 << 0, 1) is not None
+
+
+def test_root_parallel_search() -> None:
+    """It merges the root visits of searches run in several processes."""
+    try:
+        visits = mcts.root_parallel_search(0, 0, 1, workers=2, iterations=1000)
+        assert sum(visits.values()) == 1000
+        assert sorted(visits) == list(range(9))
+        assert tactics.forced_move(FORK_GRID, 1) is None
+        assert mcts.mcts_move(FORK_GRID, 1, iterations=2000, workers=2) == (2, 2)
+    finally:
+        mcts.shutdown_pool()
+
+
+def test_batch_rollouts() -> None:
+    """It plays random games in lockstep and counts their outcomes."""
+    rng = np.random.default_rng(0)
+    x_wins, o_wins, draws = mcts.batch_rollouts(0, 0, 1, 20000, rng)
+    assert x_wins + o_wins + draws == 20000
+    # Random play from the empty grid: X wins 58.5%, O 28.8%, draws 12.7%.
+    assert abs(x_wins / 20000 - 0.585) < 0.02
+    assert abs(o_wins / 20000 - 0.288) < 0.02
+
+    # O fills the last cell and completes the middle row.
+    x_bits, o_bits = bitboard.from_grid([[1, 1, -1], [-1, -1, 0], [1, -1, 1]])
+    assert mcts.batch_rollouts(x_bits, o_bits, -1, 100, rng) == (0, 100, 0)
+
+
+def test_mcts_move_with_batched_rollouts() -> None:
+    """It searches with several playouts per leaf."""
+    tree = mcts.MonteCarloTreeSearch(0, 0, 1, rollouts_per_leaf=32)
+    tree.search(iterations=50)
+    assert tree.visits[0] == 50 * 32
+    move = mcts.mcts_move(FORK_GRID, 1, iterations=200, rollouts_per_leaf=64)
+    assert move == (2, 2)
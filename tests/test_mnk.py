@@ -0,0 +1,156 @@
+"""Test cases for the mnk module."""
+import itertools
+import random
+
+import pytest
+
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game import engine
+from tic_tac_toe_game import errors
+from tic_tac_toe_game import mnk
+from tic_tac_toe_game import symmetry
+
+
+def test_layout_windows() -> None:
+    """It lists every window of k cells and the windows through every cell."""
+    tic_tac_toe = mnk.layout(3, 3, 3)
+    assert {sum(1 << cell for cell in window) for window in tic_tac_toe.windows} == (
+        set(bitboard.WIN_MASKS)
+    )
+    gomoku = mnk.layout(15, 15, 5)
+    assert len(gomoku.windows) == 2 * 15 * 11 + 2 * 11 * 11
+    assert max(len(ids) for ids in gomoku.cell_windows) == 4 * 5
+    assert len(mnk.layout(4, 6, 4).windows) == 4 * 3 + 6 * 1 + 2 * 3
+    with pytest.raises(ValueError):
+        mnk.layout(3, 3, 4)
+
+
+def test_mnk_board_matches_board() -> None:
+    """It behaves like Board on every step of every game in a sample."""
+    for order in itertools.islice(itertools.permutations(range(9)), 0, 5000, 7):
+        board, mnk_board = engine.Board(), mnk.MNKBoard()
+        for turn, index in enumerate(order):
+            move = engine.Move(*bitboard.cell_coordinates(index), 1 - 2 * (turn % 2))
+            board.make_move(move)
+            mnk_board.make_move(move)
+            assert mnk_board.grid == board.grid
+            assert mnk_board.is_full() == board.is_full()
+            assert mnk_board.is_winning_move(move) == board.is_winning_move(move)
+            assert mnk_board.winner() == board.winner()
+            if board.is_over():
+                break
+
+
+def _scan_winner(board: mnk.MNKBoard) -> int:
+    """Returns the mark with k in a row on `board`, found by scanning it."""
+    for mark in (1, -1):
+        for row in range(board.rows):
+            for col in range(board.cols):
+                for d_row, d_col in mnk.DIRECTIONS:
+                    cells = [
+                        (row + step * d_row, col + step * d_col)
+                        for step in range(board.k)
+                    ]
+                    if all(
+                        0 <= x < board.rows
+                        and 0 <= y < board.cols
+                        and board.grid[x][y] == mark
+                        for x, y in cells
+                    ):
+                        return mark
+    return 0
+
+
+@pytest.mark.parametrize("rows, cols, k", [(15, 15, 5), (6, 7, 4), (4, 9, 3)])
+def test_large_boards_find_wins(rows: int, cols: int, k: int) -> None:
+    """It ends random games on the move a full scan of the board finds a win."""
+    rng = random.Random(rows * cols + k)  # noqa: S311
+    for _ in range(20):
+        board = mnk.MNKBoard(rows=rows, cols=cols, k=k)
+        cells = [(x, y) for x in range(rows) for y in range(cols)]
+        rng.shuffle(cells)
+        for turn, cell in enumerate(cells):
+            board.make_move(engine.Move(*cell, 1 - 2 * (turn % 2)))
+            if board.is_over():
+                break
+        assert board.winner() == _scan_winner(board)
+        last = board.history[-1]
+        board.grid[last.x][last.y] = 0
+        assert _scan_winner(board) == 0
+
+
+def test_mnk_board_diagonal_wins() -> None:
+    """It finds wins on both diagonals away from the main ones."""
+    board = mnk.MNKBoard(rows=15, cols=15, k=5)
+    for step in range(4):
+        board.make_move(engine.Move(2 + step, 9 - step, -1))
+        assert board.winner() is None
+    board.make_move(engine.Move(6, 5, -1))
+    assert board.winner() == -1
+    assert board.is_winning_move(engine.Move(6, 5, -1))
+    assert not board.is_winning_move(engine.Move(6, 5, 1))
+
+
+def test_mnk_board_from_grid() -> None:
+    """It counts the marks of a given grid, and refuses to overwrite them."""
+    grid = [[0] * 5 for _ in range(4)]
+    for col in range(4):
+        grid[3][col] = 1
+    board = mnk.MNKBoard(grid, [engine.Move(3, 3, 1)], k=4)
+    assert board.winner() == 1
+    assert len(board.empty_cells()) == 16
+    with pytest.raises(errors.OverwriteCellError):
+        board.make_move(engine.Move(3, 0, -1))
+
+
+def test_symmetries() -> None:
+    """It numbers the symmetries of any board as those of the 3*3 grid."""
+    assert mnk.symmetries(3, 3) == tuple(enumerate(symmetry.TRANSFORMS))
+    assert [transform for transform, _ in mnk.symmetries(4, 4)] == list(range(8))
+    assert [transform for transform, _ in mnk.symmetries(4, 6)] == [0, 2, 4, 5]
+    for rows, cols in ((4, 4), (4, 6)):
+        for _, permutation in mnk.symmetries(rows, cols):
+            assert sorted(permutation) == list(range(rows * cols))
+
+
+@pytest.mark.parametrize("rows, cols", [(4, 4), (4, 6), (3, 5)])
+def test_mnk_board_canonical_key(rows: int, cols: int) -> None:
+    """It gives symmetric boards the same key, and other boards other keys."""
+    moves = [engine.Move(0, 1, 1), engine.Move(1, 0, -1), engine.Move(0, 0, 1)]
+    board = mnk.MNKBoard(rows=rows, cols=cols, k=3)
+    flipped = mnk.MNKBoard(rows=rows, cols=cols, k=3)
+    rotated = mnk.MNKBoard(rows=rows, cols=cols, k=3)
+    for move in moves:
+        board.make_move(move)
+        flipped.make_move(engine.Move(rows - 1 - move.x, move.y, move.player))
+        rotated.make_move(
+            engine.Move(rows - 1 - move.x, cols - 1 - move.y, move.player)
+        )
+    key, transform = board.canonical_key()
+    assert flipped.canonical_key()[0] == rotated.canonical_key()[0] == key
+    permutation = dict(mnk.symmetries(rows, cols))[transform]
+    assert key == sum(
+        1 << (permutation[move.x * cols + move.y] + rows * cols * (move.player < 0))
+        for move in moves
+    )
+    board.make_move(engine.Move(rows - 1, cols - 1, -1))
+    assert board.canonical_key()[0] != key
+    assert mnk.MNKBoard().canonical_key() == engine.Board().canonical_key()
+
+
+def test_mnk_board_serialization() -> None:
+    """It round trips through dictionaries, within games too."""
+    board = mnk.MNKBoard(rows=5, cols=5, k=4)
+    board.make_move(engine.Move(2, 2, 1))
+    assert mnk.MNKBoard.from_dict(board.to_dict()) == board
+    assert mnk.MNKBoard.from_dict(engine.Board().to_dict()) == mnk.MNKBoard()
+    assert board != mnk.MNKBoard(board.grid, list(board.history), k=3)
+    game = engine.build_game(mode="multi")
+    game.board = board
+    assert engine.TicTacToeGame.from_dict(game.to_dict()).board == board
+
+
+def test_mnk_board_frame() -> None:
+    """It frames boards of any width."""
+    board = mnk.MNKBoard(rows=2, cols=4, k=2)
+    assert board.framed_grid() == "_│_│_│_\n─┼─┼─┼─\n_│_│_│_"
@@ -0,0 +1,70 @@
+"""Test cases for the negamax module."""
+import pytest
+
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import oracle
+
+
+def test_ordered_moves() -> None:
+    """It plays center, corners then edges, the hinted move first."""
+    assert negamax.ordered_moves(bitboard.FULL_MASK) == list(negamax.MOVE_ORDER)
+    assert negamax.ordered_moves(0b000_000_110, first=2) == [2, 1]
+    assert negamax.ordered_moves(0b000_000_110, first=4) == [2, 1]
+
+
+def test_negamax_move_plays_perfectly() -> None:
+    """It picks an optimal move in every reachable position."""
+    positions = [(0, 0, 1), (0, 0, -1)]
+    seen = set()
+    while positions:
+        x_bits, o_bits, mark = position = positions.pop()
+        free = bitboard.free_cells(x_bits, o_bits)
+        if position in seen or not free:
+            continue
+        seen.add(position)
+        if bitboard.has_line(x_bits) or bitboard.has_line(o_bits):
+            continue
+
+        grid = bitboard.to_grid(x_bits, o_bits)
+        assert negamax.negamax_move(grid, mark) in oracle.optimal_moves(grid, mark)
+        for index in bitboard.iter_cells(free):
+            if mark == 1:
+                positions.append((x_bits | 1 << index, o_bits, -1))
+            else:
+                positions.append((x_bits, o_bits | 1 << index, 1))
+
+
+def test_negamax_depth_limited() -> None:
+    """It only sees the fork of a quiet position when searching deep enough."""
+    negamax.clear_transpositions()
+    cache.move_cache.clear()
+    # X to move, no move forced: (2, 2) threatens two lines at once.
+    grid = [[1, -1, 1], [0, 0, 0], [-1, 0, 0]]
+    x_bits, o_bits = bitboard.from_grid(grid)
+    transpositions: negamax.TranspositionTable = {}
+    score, index = negamax.negamax(x_bits, o_bits, 1, transpositions=transpositions)
+    assert score < negamax.WIN_SCORE and index == 4
+    assert max(entry[0] for entry in transpositions.values()) == 1
+    score, index = negamax.negamax(x_bits, o_bits, 3, transpositions={})
+    assert score >= negamax.WIN_SCORE and index == 8
+    assert negamax.negamax_move(grid, 1, depth=1) == (1, 1)
+    assert negamax.negamax_move(grid, 1, depth=3) == (2, 2)
+
+
+def test_negamax_depth_limited_after_full_search() -> None:
+    """It keeps to the depth limit after deeper searches of the position."""
+    negamax.clear_transpositions()
+    cache.move_cache.clear()
+    grid = [[1, -1, 1], [0, 0, 0], [-1, 0, 0]]
+    assert negamax.negamax_move(grid, 1) == (2, 2)
+    assert negamax.negamax_move(grid, 1, depth=1) == (1, 1)
+    cache.move_cache.clear()
+    assert negamax.negamax_move(grid, 1, depth=1) == (1, 1)
+
+
+def test_negamax_move_handles_full_grid() -> None:
+    """It raises `IndexError` if grid is full."""
+    with pytest.raises(IndexError):
+        negamax.negamax_move([[1, -1, 1], [-1, -1, 1], [1, 1, -1]], 1)
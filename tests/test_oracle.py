@@ -0,0 +1,90 @@
+"""Test cases for the oracle module."""
+from pathlib import Path
+
+import pytest
+
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.AI import oracle
+
+
+EMPTY_GRID = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+# X to move can win on (0, 2), O to move can win on (1, 2).
+BOTH_THREATEN_GRID = [[1, 1, 0], [-1, -1, 0], [0, 0, 0]]
+FULL_GRID = [[1, -1, 1], [-1, -1, 1], [1, 1, -1]]
+
+
+def test_encode_position() -> None:
+    """It encodes positions from the point of view of the player to move."""
+    assert oracle.encode_position(EMPTY_GRID, 1) == 0
+    grid = [[1, -1, 0], [0, 0, 0], [0, 0, 0]]
+    assert oracle.encode_position(grid, 1) == 1 + 2 * 3
+    assert oracle.encode_position(grid, -1) == 2 + 1 * 3
+    for code in (0, 7, 4242, oracle.POSITIONS - 1):
+        assert oracle.encode_bits(*oracle.decode_bits(code)) == code
+
+
+def test_table_file_matches_solver() -> None:
+    """It ships a table identical to a freshly solved one."""
+    assert bytes(oracle._table) == oracle.build_table()
+
+
+def test_missing_table_is_solved_in_memory(tmp_path: Path) -> None:
+    """It solves a missing table without writing it."""
+    path = tmp_path / "oracle.bin"
+    assert oracle.load_table(path) == oracle.build_table()
+    assert not path.exists()
+
+
+def test_write_table(tmp_path: Path) -> None:
+    """It writes the table in one go, leaving no temporary file behind."""
+    path = tmp_path / "oracle.bin"
+    oracle.write_table(path)
+    assert [child.name for child in tmp_path.iterdir()] == ["oracle.bin"]
+    assert bytes(oracle.load_table(path)) == bytes(oracle._table)
+
+
+def test_position_values() -> None:
+    """It returns game-theoretic values."""
+    assert oracle.position_value(EMPTY_GRID, 1) == 0
+    assert oracle.position_value(BOTH_THREATEN_GRID, 1) == 1
+    assert oracle.position_value(BOTH_THREATEN_GRID, -1) == 1
+    # The corner is the only reply to a center opening that does not lose.
+    center = [[0, 0, 0], [0, 1, 0], [0, 0, 0]]
+    assert set(oracle.optimal_moves(center, -1)) == {(0, 0), (0, 2), (2, 0), (2, 2)}
+
+
+def test_oracle_move_wins_immediately() -> None:
+    """It prefers the quickest win."""
+    assert oracle.oracle_move(BOTH_THREATEN_GRID, 1) == (0, 2)
+    assert oracle.oracle_move(BOTH_THREATEN_GRID, -1) == (1, 2)
+
+
+def test_oracle_move_handles_full_grid() -> None:
+    """It raises `IndexError` if the game is over."""
+    with pytest.raises(IndexError):
+        oracle.oracle_move(FULL_GRID, 1)
+
+
+def test_oracle_never_loses() -> None:
+    """It draws against itself."""
+    game = engine.TicTacToeGame(
+        engine.PlayersMatch(
+            engine.AIPlayer(1, "X", oracle.oracle_move),
+            engine.AIPlayer(-1, "O", oracle.oracle_move),
+        ),
+        engine.Board(),
+    )
+    while not game.board.is_over():
+        player = game.players_match.current()
+        move = game.get_move()
+        assert move is not None
+        game.board.make_move(engine.Move(*move, player.get_mark()))
+        game.players_match.switch()
+    assert game.board.is_tie() is True
+
+
+def test_oracle_player_serialization() -> None:
+    """It serializes AI players using the oracle."""
+    player = engine.AIPlayer(-1, "Oracle", oracle.oracle_move)
+    assert player.to_dict()["moves"] == "oracle_move"
+    assert engine.Player.from_dict(player.to_dict()) == player
@@ -0,0 +1,35 @@
+"""Test cases for the search quality benchmark."""
+import pytest
+
+from benchmarks import search_quality
+from tic_tac_toe_game.AI import oracle
+
+
+def test_positions_cover_the_game_tree() -> None:
+    """It enumerates every reachable non-terminal position once."""
+    assert len(search_quality.positions(deduplicate=False)) == 4520
+    assert len(search_quality.positions()) == 627
+
+
+def test_perfect_play_keeps_value() -> None:
+    """It scores optimal moves as correct and blunders as wrong."""
+    for grid, mark in search_quality.positions()[:100]:
+        for move in oracle.optimal_moves(grid, mark):
+            assert search_quality.keeps_value(grid, mark, move)
+    # X must take (0, 2) to win, O threatens the middle row.
+    grid = [[1, 1, 0], [-1, -1, 0], [0, 0, 0]]
+    assert search_quality.keeps_value(grid, 1, (0, 2))
+    assert not search_quality.keeps_value(grid, 1, (2, 2))
+
+
+def test_cheapest_budget_reaching_target() -> None:
+    """It picks the lowest budget reaching the target accuracy."""
+    curve = search_quality.parse_curve("negamax_move:depth=1,9")
+    assert curve == search_quality.Curve("negamax_move", "depth", (1, 9))
+    played = search_quality.positions()
+    points = [search_quality.measure(curve, depth, played, 0) for depth in (9, 1)]
+    assert points[0].accuracy == 1.0
+    assert search_quality.cheapest(points, 1.0) == points[0]
+    assert search_quality.cheapest(points, 1.1) is None
+    with pytest.raises(ValueError):
+        search_quality.parse_curve("negamax_move")
@@ -0,0 +1,77 @@
+"""Test cases for the selfplay module."""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from tic_tac_toe_game import __main__
+from tic_tac_toe_game import selfplay
+from tic_tac_toe_game.batch import BoardBatch
+
+
+RANDOM = selfplay.PolicySpec("random")
+ORACLE = selfplay.PolicySpec("oracle")
+
+
+def test_random_games_match_known_rates() -> None:
+    """It finds the known outcome rates of random games."""
+    summary = selfplay.simulate(20000, RANDOM, RANDOM, chunk_size=5000).to_dict()
+    assert summary["games"] == 20000
+    assert summary["x_wins"] / 20000 == pytest.approx(0.585, abs=0.02)
+    assert summary["draws"] / 20000 == pytest.approx(0.127, abs=0.02)
+    assert 5 <= summary["mean_length"] <= 9
+    assert sum(opening["games"] for opening in summary["openings"].values()) == 20000
+
+
+def test_oracle_games_are_ties() -> None:
+    """It ties every game between perfect players, and wins against random."""
+    assert selfplay.simulate(1000, ORACLE, ORACLE).to_dict()["draws"] == 1000
+    assert selfplay.simulate(1000, ORACLE, RANDOM).to_dict()["o_wins"] == 0
+
+
+def test_epsilon_greedy_explores() -> None:
+    """It plays legal moves, some of them random."""
+    boards = BoardBatch.empty(1000)
+    rng = np.random.default_rng(0)
+    moves = selfplay.PolicySpec("oracle", 0.5).build()(boards, 1, rng)
+    assert (moves >= 0).all()
+    # Perfect play never opens on an edge.
+    assert np.isin(moves, [1, 3, 5, 7]).any()
+    with pytest.raises(ValueError):
+        selfplay.PolicySpec("minimax").build()
+
+
+def test_chunks_are_streamed_to_disk(tmp_path: Path) -> None:
+    """It writes one shard per chunk, reproducibly whatever the workers."""
+    summary = selfplay.simulate(
+        2500, RANDOM, ORACLE, chunk_size=1000, seed=3, output=tmp_path
+    )
+    shards = sorted(tmp_path.glob("games-*.npz"))
+    assert [shard.name for shard in shards] == [
+        "games-000000.npz",
+        "games-000001.npz",
+        "games-000002.npz",
+    ]
+    with np.load(shards[-1]) as shard:
+        assert shard["moves"].shape == (500, 9)
+        assert (shard["lengths"] == (shard["moves"] != -1).sum(axis=1)).all()
+    parallel = selfplay.simulate(
+        2500, RANDOM, ORACLE, chunk_size=1000, seed=3, workers=2
+    )
+    assert parallel.to_dict() == summary.to_dict()
+
+
+def test_simulate_command(tmp_path: Path) -> None:
+    """It prints and writes the statistics of the games."""
+    runner = CliRunner()
+    result = runner.invoke(
+        __main__.main,
+        ["simulate", "--games=100", "--x=oracle", f"--json={tmp_path / 's.json'}"],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("100 games")
+    assert json.loads((tmp_path / "s.json").read_text())["o_wins"] == 0
+    result = runner.invoke(__main__.main, ["simulate", "--x=minimax"])
+    assert result.exit_code == 2
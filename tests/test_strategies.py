@@ -0,0 +1,110 @@
+"""Test cases for the strategies registry."""
+import json
+
+import pytest
+
+from benchmarks import import_time
+from tic_tac_toe_game import engine
+from tic_tac_toe_game.AI import cache
+from tic_tac_toe_game.AI import naive
+from tic_tac_toe_game.AI import negamax
+from tic_tac_toe_game.AI import strategies
+
+
+# X to move can win on (0, 2), O to move can win on (1, 2).
+BOTH_THREATEN_GRID = [[1, 1, 0], [-1, -1, 0], [0, 0, 0]]
+
+
+def test_registry_holds_builtin_strategies() -> None:
+    """It registers every strategy function under its name."""
+    assert strategies.get("negamax_move") is negamax.negamax_move
+    assert strategies.STRATEGIES["negamax_move"] is negamax.negamax_move
+    assert set(strategies.names()) >= {
+        "naive_move",
+        "mcts_move",
+        "negamax_move",
+        "oracle_move",
+        "learned_move",
+        "threat_move",
+    }
+
+
+def test_registry_resolves_strategies_lazily(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It imports a strategy by its path on first use only."""
+    path = "tic_tac_toe_game.AI.naive:naive_move"
+    monkeypatch.setitem(strategies.STRATEGIES, "random_move", path)
+    assert strategies.STRATEGIES["random_move"] == path
+    assert strategies.get("random_move") is naive.naive_move
+    assert strategies.STRATEGIES["random_move"] is naive.naive_move
+    with pytest.raises(ValueError):
+        strategies.get("minimax_move")
+
+
+def test_engine_import_skips_strategies() -> None:
+    """It imports the engine without the strategies and their dependencies."""
+    elapsed, loaded = import_time.measure()
+    assert loaded == []
+    assert elapsed < import_time.BUDGET * 4  # margin for loaded CI machines
+
+
+def test_strategy_validates_parameters() -> None:
+    """It rejects unknown strategies and parameters."""
+    with pytest.raises(ValueError):
+        strategies.Strategy("minimax_move")
+    with pytest.raises(ValueError):
+        strategies.Strategy("negamax_move", iterations=10)
+
+
+def test_strategy_plays_with_its_parameters() -> None:
+    """It calls the function with its parameters."""
+    cache.move_cache.clear()
+    strategy = strategies.Strategy("negamax_move", depth=1)
+    assert strategy(BOTH_THREATEN_GRID, -1) == (1, 2)
+    assert isinstance(cache.move_cache, cache.MoveCache)
+    assert any(
+        key[2:] == ("negamax_move", ((1,), ())) for key in cache.move_cache._moves
+    )
+
+
+def test_strategy_round_trip() -> None:
+    """It serializes to JSON with its parameters."""
+    strategy = strategies.Strategy("mcts_move", iterations=100, time_budget=0.5)
+    data = json.loads(json.dumps(strategy.to_dict()))
+    assert data == {
+        "name": "mcts_move",
+        "params": {"iterations": 100, "time_budget": 0.5},
+    }
+    assert strategies.Strategy.from_dict(data) == strategy
+    assert repr(strategy) == "Strategy('mcts_move', iterations=100, time_budget=0.5)"
+
+
+def test_presets() -> None:
+    """It maps difficulty levels to strategies of growing budgets."""
+    assert strategies.preset("perfect") == strategies.Strategy("negamax_move")
+    budgets = [
+        strategies.preset(level).params["iterations"]
+        for level in ("easy", "medium", "hard")
+    ]
+    assert budgets == sorted(budgets)
+    with pytest.raises(ValueError):
+        strategies.preset("impossible")
+
+
+def test_player_keeps_strategy_parameters() -> None:
+    """It keeps the strategy parameters through to_dict/from_dict."""
+    game = engine.build_game(difficulty="easy", seed=3)
+    data = json.loads(json.dumps(game.to_dict()))
+    assert data["players_match"]["players"][1]["moves"] == {
+        "name": "mcts_move",
+        "params": {"iterations": 50, "reuse_tree": False},
+    }
+    loaded = engine.TicTacToeGame.from_dict(data)
+    assert loaded.players_match.players[1] == game.players_match.players[1]
+
+
+def test_unregistered_moves_are_not_serialized() -> None:
+    """It serializes unknown callables as None, and registered ones by name."""
+    assert strategies.dump(lambda grid, mark: (0, 0)) is None
+    assert strategies.dump(negamax.negamax_move) == "negamax_move"
+    assert strategies.load("negamax_move") is negamax.negamax_move
+    assert strategies.load(None) is None
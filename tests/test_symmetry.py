@@ -0,0 +1,81 @@
+"""Test cases for the symmetry module."""
+import itertools
+
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game import engine
+from tic_tac_toe_game import symmetry
+
+
+# X in a corner and O on an adjacent edge, in each of its 8 orientations.
+CORNER_EDGE_GRIDS = [
+    [[1, -1, 0], [0, 0, 0], [0, 0, 0]],
+    [[0, 0, 1], [0, 0, -1], [0, 0, 0]],
+    [[0, 0, 0], [0, 0, 0], [0, -1, 1]],
+    [[0, 0, 0], [-1, 0, 0], [1, 0, 0]],
+    [[0, -1, 1], [0, 0, 0], [0, 0, 0]],
+    [[0, 0, 0], [0, 0, 0], [1, -1, 0]],
+    [[1, 0, 0], [-1, 0, 0], [0, 0, 0]],
+    [[0, 0, 0], [0, 0, -1], [0, 0, 1]],
+]
+
+
+def test_transforms_form_a_group() -> None:
+    """It holds 8 distinct permutations, closed under composition."""
+    assert len(set(symmetry.TRANSFORMS)) == 8
+    assert symmetry.TRANSFORMS[symmetry.IDENTITY] == tuple(range(9))
+    for first, second in itertools.product(symmetry.TRANSFORMS, repeat=2):
+        assert tuple(second[first[index]] for index in range(9)) in (
+            symmetry.TRANSFORMS
+        )
+
+
+def test_transforms_keep_win_lines() -> None:
+    """It maps win lines to win lines."""
+    for transform in range(8):
+        images = {
+            symmetry.transform_bits(mask, transform) for mask in bitboard.WIN_MASKS
+        }
+        assert images == set(bitboard.WIN_MASKS)
+
+
+def test_inverses() -> None:
+    """It undoes every transform."""
+    for transform, inverse in enumerate(symmetry.INVERSES):
+        for index in range(9):
+            image = symmetry.transform_index(index, transform)
+            assert symmetry.transform_index(image, inverse) == index
+
+
+def test_symmetric_positions_share_their_key() -> None:
+    """It gives the same key to the 8 images of a position."""
+    keys = {symmetry.canonical_grid(grid)[0] for grid in CORNER_EDGE_GRIDS}
+    assert len(keys) == 1
+
+
+def test_canonical_transform() -> None:
+    """It returns the transform mapping the position to the canonical one."""
+    for grid in CORNER_EDGE_GRIDS:
+        key, transform = symmetry.canonical_grid(grid)
+        x_bits, o_bits = bitboard.from_grid(grid)
+        canonical_x = symmetry.transform_bits(x_bits, transform)
+        canonical_o = symmetry.transform_bits(o_bits, transform)
+        assert canonical_x | canonical_o << 9 == key
+
+
+def test_move_round_trip() -> None:
+    """It maps moves to the canonical board and back."""
+    for grid in CORNER_EDGE_GRIDS:
+        _, transform = symmetry.canonical_grid(grid)
+        for row, col in itertools.product(range(3), repeat=2):
+            coord = (row, col)
+            canonical = symmetry.to_canonical(coord, transform)
+            assert symmetry.from_canonical(canonical, transform) == coord
+
+
+def test_board_canonical_key() -> None:
+    """It gives the same canonical key to Board and BitBoard."""
+    for grid in CORNER_EDGE_GRIDS:
+        board = engine.Board(grid=[row[:] for row in grid])
+        bit_board = engine.BitBoard(grid=[row[:] for row in grid])
+        assert board.canonical_key() == bit_board.canonical_key()
+        assert board.canonical_key() == symmetry.canonical_grid(grid)
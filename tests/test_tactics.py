@@ -0,0 +1,64 @@
+"""Test cases for the tactics module."""
+from tic_tac_toe_game import bitboard
+from tic_tac_toe_game.AI import oracle
+from tic_tac_toe_game.AI import tactics
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+# X to move can win on (0, 2), O to move can win on (1, 2).
+BOTH_THREATEN_GRID = [[1, 1, 0], [-1, -1, 0], [0, 0, 0]]
+# O to move must block on (0, 2).
+MUST_BLOCK_GRID = [[1, 1, 0], [-1, 0, 0], [0, 0, 0]]
+# Nothing forced.
+QUIET_GRID = [[1, 0, 0], [0, -1, 0], [0, 0, 0]]
+
+
+def test_forced_move_prefers_winning() -> None:
+    """It completes its own line rather than blocking one."""
+    assert tactics.forced_move(BOTH_THREATEN_GRID, 1) == (0, 2)
+    assert tactics.forced_move(BOTH_THREATEN_GRID, -1) == (1, 2)
+
+
+def test_forced_move_blocks() -> None:
+    """It blocks the line of the opponent."""
+    assert tactics.forced_move(MUST_BLOCK_GRID, -1) == (0, 2)
+
+
+def test_no_forced_move() -> None:
+    """It returns None when nothing is forced."""
+    assert tactics.forced_move(QUIET_GRID, 1) is None
+    assert tactics.forced_move([[0, 0, 0], [0, 0, 0], [0, 0, 0]], 1) is None
+    assert tactics.forced_move([[1, -1, 1], [-1, -1, 1], [1, 1, -1]], 1) is None
+
+
+def test_forced_moves_are_optimal() -> None:
+    """It only forces moves the oracle plays, on every reachable position."""
+    for code in range(oracle.POSITIONS):
+        own_bits, opp_bits = oracle.decode_bits(code)
+        if bitboard.has_line(own_bits) or bitboard.has_line(opp_bits):
+            continue
+        if not 0 <= bin(opp_bits).count("1") - bin(own_bits).count("1") <= 1:
+            continue
+        index = tactics.forced_index(own_bits, opp_bits)
+        if index == -1:
+            continue
+        grid = bitboard.to_grid(own_bits, opp_bits)
+        assert bitboard.cell_coordinates(index) in oracle.optimal_moves(grid, 1)
+
+
+def test_fast_path_skips_strategy() -> None:
+    """It only calls the strategy when no move is forced, and counts both."""
+    calls = []
+
+    @tactics.fast_path
+    def strategy(grid: Grid, mark: int) -> Coordinates:
+        calls.append(mark)
+        return (2, 2)
+
+    hits, misses = tactics.stats["hits"], tactics.stats["misses"]
+    assert strategy(MUST_BLOCK_GRID, -1) == (0, 2)
+    assert strategy(QUIET_GRID, 1) == (2, 2)
+    assert calls == [1]
+    assert tactics.stats["hits"] == hits + 1
+    assert tactics.stats["misses"] == misses + 1
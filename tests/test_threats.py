@@ -0,0 +1,161 @@
+"""Test cases for the threats module."""
+import random
+from typing import Dict
+
+import pytest
+
+from benchmarks import search_quality
+from tic_tac_toe_game import engine
+from tic_tac_toe_game import mnk
+from tic_tac_toe_game.AI import strategies
+from tic_tac_toe_game.AI import threats
+from tic_tac_toe_game.AI.naive import naive_move
+from tic_tac_toe_game.typing import Coordinates
+from tic_tac_toe_game.typing import Grid
+
+
+def _grid(size: int, marks: Dict[Coordinates, int]) -> Grid:
+    """Returns a `size`*`size` grid holding `marks`, by coordinates."""
+    grid = [[0] * size for _ in range(size)]
+    for (x, y), mark in marks.items():
+        grid[x][y] = mark
+    return grid
+
+
+def test_position_updates_incrementally() -> None:
+    """It keeps the same counters as a position built from scratch."""
+    rng = random.Random(0)  # noqa: S311
+    position = threats.Position(_grid(15, {}), 5)
+    cells = rng.sample(range(225), 60)
+    for turn, cell in enumerate(cells):
+        position.play(cell, 1 - 2 * (turn % 2))
+    for cell in reversed(cells[30:]):
+        position.undo(cell)
+    rebuilt = threats.Position(
+        _grid(
+            15,
+            {
+                divmod(cell, 15): 1 - 2 * (turn % 2)
+                for turn, cell in enumerate(cells[:30])
+            },
+        ),
+        5,
+    )
+    for name in ("cells", "counts", "scores", "threats", "candidates", "lines"):
+        assert getattr(position, name) == getattr(rebuilt, name)
+
+
+def test_threats_force_moves() -> None:
+    """It completes its own line first, then blocks the opponent's."""
+    four_each = {
+        **{(7, y): 1 for y in range(3, 7)},
+        **{(9, y): -1 for y in range(3, 7)},
+    }
+    assert threats.threat_move(_grid(15, four_each), 1) in {(7, 2), (7, 7)}
+    del four_each[(7, 6)]
+    assert threats.threat_move(_grid(15, four_each), 1) in {(9, 2), (9, 7)}
+
+
+def test_several_blocks_are_ranked() -> None:
+    """It searches the blocks of several threats, best block first."""
+    # O threatens on both ends of its row, X blocks on its own diagonal.
+    marks = {(7, y): -1 for y in range(3, 7)}
+    marks.update({(4, 4): 1, (5, 5): 1, (6, 6): 1})
+    position = threats.Position(_grid(15, marks), 5)
+    assert position.moves(1, threats.DEFAULT_MAX_CANDIDATES) == [7 * 15 + 7, 7 * 15 + 2]
+    assert threats.threat_move(_grid(15, marks), 1) == (7, 7)
+
+
+class Clock:
+    """Fake perf_counter of the threats module, counting the search nodes."""
+
+    def __init__(self, tick: float) -> None:
+        """Inits a clock moving `tick` seconds at every reading."""
+        self.tick = tick
+        self.now = 0.0
+        self.nodes = 0
+
+    def perf_counter(self) -> float:
+        """Returns the time, then moves the clock forward."""
+        self.now += self.tick
+        return self.now
+
+    def checkpoint(self) -> None:
+        """Counts a node of the search."""
+        self.nodes += 1
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """Replaces the clock of the threats module by a 1 ms per reading one."""
+    fake = Clock(0.001)
+    monkeypatch.setattr(threats, "time", fake)
+    monkeypatch.setattr(threats, "checkpoint", fake.checkpoint)
+    return fake
+
+
+def test_zero_time_budget(clock: Clock) -> None:
+    """It plays the best ranked candidate at once when given no time."""
+    marks = {(7, 7): 1, (7, 8): -1, (8, 8): 1, (6, 9): -1}
+    position = threats.Position(_grid(15, marks), 5)
+    best = position.moves(1, threats.DEFAULT_MAX_CANDIDATES)[0]
+    assert threats.threat_move(_grid(15, marks), 1, time_budget=0) == divmod(best, 15)
+    assert clock.nodes == 1
+
+
+def test_threat_space_search_finds_double_threats() -> None:
+    """It plays the move making two fours at once."""
+    marks = {(7, 5): 1, (7, 6): 1, (7, 7): 1, (4, 8): 1, (5, 8): 1, (6, 8): 1}
+    # O closes the row on both sides and the column on one side.
+    marks.update({(7, 3): -1, (7, 9): -1, (3, 8): -1})
+    position = threats.Position(_grid(15, marks), 5)
+    search = threats.Search(position, float("inf"), threats.DEFAULT_MAX_CANDIDATES)
+    assert search.threat_space(1) == 7 * 15 + 8
+    assert threats.threat_move(_grid(15, marks), 1) == (7, 8)
+
+
+def test_plays_tic_tac_toe_perfectly() -> None:
+    """It keeps the game-theoretic value of every 3*3 position."""
+    for grid, mark in search_quality.positions():
+        move = threats.threat_move(grid, mark, time_budget=None, max_depth=9)
+        assert search_quality.keeps_value(grid, mark, move)
+
+
+def test_beats_random_play_on_large_boards() -> None:
+    """It wins an m,n,k game against random moves, with either mark."""
+    rng = random.Random(0)  # noqa: S311
+    for mark in (1, -1):
+        board = mnk.MNKBoard(rows=9, cols=9, k=5)
+        turn = 1
+        while not board.is_over():
+            if turn == mark:
+                move = threats.threat_move(
+                    board.grid, turn, time_budget=None, max_depth=2
+                )
+            else:
+                move = naive_move(board.grid, rng=rng)
+            board.make_move(engine.Move(*move, turn))
+            turn = -turn
+        assert board.winner() == mark
+
+
+@pytest.mark.parametrize("size", [15, 40])
+def test_latency_is_bounded(clock: Clock, size: int) -> None:
+    """It stops searching once its time budget runs out whatever the board size."""
+    rng = random.Random(0)  # noqa: S311
+    cells = rng.sample([(x, y) for x in range(size) for y in range(size)], 40)
+    grid = _grid(size, {cell: 1 - 2 * (turn % 2) for turn, cell in enumerate(cells)})
+    x, y = threats.threat_move(grid, 1, time_budget=0.05)
+    # The clock is read before building the position, then once per node: the
+    # search stops at the first node past the budget.
+    assert clock.nodes == 50
+    assert grid[x][y] == 0
+
+
+def test_threat_move_is_registered() -> None:
+    """It plays through the registry, and refuses full grids."""
+    strategy = strategies.Strategy("threat_move", max_depth=2, time_budget=None)
+    assert strategy([[1, 1, 0], [-1, -1, 0], [0, 0, 0]], 1) == (0, 2)
+    assert strategy(_grid(15, {}), 1) == (7, 7)
+    with pytest.raises(IndexError):
+        threats.threat_move([[1, -1, 1], [-1, -1, 1], [1, 1, -1]], 1)